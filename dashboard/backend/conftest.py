@@ -0,0 +1,2 @@
+# The backend modules import each other by name (from scores import ...). Having a
+# conftest here makes pytest put this folder on sys.path for dashboard/backend/tests.
@@ -0,0 +1,113 @@
+import threading
+import logging
+import os
+from datetime import datetime
+
+import pandas as pd
+
+from start import get_all_data
+
+logger = logging.getLogger(__name__)
+
+# How often the background task re-scrapes everything (seconds)
+REFRESH_INTERVAL = int(os.environ.get("DATA_REFRESH_SECONDS", "900"))
+
+# How long a request waits for the very first snapshot before giving up (seconds)
+FIRST_LOAD_TIMEOUT = 60
+
+
+class SnapshotStore:
+    """
+    Holds the latest result of get_all_data() in memory.
+
+    A background thread refreshes the snapshot every `interval` seconds and
+    swaps it in with a single reference assignment, so request handlers only
+    ever read a complete snapshot and never trigger a scrape themselves.
+    Each source (current schedule, roster, every season) keeps its own
+    "last updated" timestamp; if a refresh comes back empty for a source the
+    previous data and timestamp are kept so staleness is visible.
+    """
+
+    def __init__(self, loader=get_all_data, interval: int = REFRESH_INTERVAL):
+        self._loader = loader
+        self._interval = interval
+        self._snapshot = None
+        self._lock = threading.Lock()          # serializes refreshes, not reads
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ── refresh ──────────────────────────────────────────────────────────────
+    def refresh(self):
+        """Fetch everything once and atomically replace the current snapshot"""
+        with self._lock:
+            started = datetime.now()
+            fresh = self._loader()
+            old = self._snapshot or {"data": {"seasons": {}}, "updated": {}}
+
+            data = {"seasons": dict(old["data"].get("seasons", {}))}
+            updated = dict(old["updated"])
+
+            for key in ("current_schedule", "roster"):
+                df = fresh.get(key, pd.DataFrame())
+                if not df.empty:
+                    data[key] = df
+                    updated[key] = started.isoformat()
+                else:
+                    logger.warning(f"Refresh returned no {key}, keeping previous snapshot")
+                    data[key] = old["data"].get(key, pd.DataFrame())
+
+            for season, df in fresh.get("seasons", {}).items():
+                if not df.empty:
+                    data["seasons"][season] = df
+                    updated[f"seasons/{season}"] = started.isoformat()
+
+            # Single assignment: readers see either the old or the new snapshot
+            self._snapshot = {
+                "data": data,
+                "updated": updated,
+                "refreshed_at": datetime.now().isoformat(),
+            }
+            self._ready.set()
+            logger.info(f"Snapshot refreshed in {(datetime.now() - started).total_seconds():.1f}s")
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.exception(f"Background refresh failed: {e}")
+            self._stop.wait(self._interval)
+
+    def start(self):
+        """Start the background refresh thread (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="snapshot-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    # ── reads ────────────────────────────────────────────────────────────────
+    def get_data(self, timeout: float = FIRST_LOAD_TIMEOUT) -> dict:
+        """Return the latest data dict (same shape as get_all_data())"""
+        if not self._ready.wait(timeout):
+            raise TimeoutError("Data snapshot is not ready yet")
+        return self._snapshot["data"]
+
+    def status(self) -> dict:
+        """Per-source staleness info for the health endpoint"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"ready": False, "refresh_interval": self._interval}
+        return {
+            "ready": True,
+            "refresh_interval": self._interval,
+            "refreshed_at": snapshot["refreshed_at"],
+            "sources": snapshot["updated"],
+        }
+
+
+store = SnapshotStore()
@@ -0,0 +1,63 @@
+"""
+Pluggable HTML parser backend for every scraper.
+
+BeautifulSoup's built-in "html.parser" is pure Python and by far the slowest
+tree builder. When lxml is installed we build soups with it instead; otherwise
+we fall back to the original behavior. Override with HTML_PARSER=html.parser
+(or lxml / html5lib) in the environment.
+
+tests/test_html_parser.py checks that every installed backend gives the same
+roster and schedules as "html.parser" on the saved pages. Run this file
+directly to compare parse times:
+
+    python html_parser.py [page.html ...]
+"""
+
+import os
+import logging
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+logger = logging.getLogger(__name__)
+
+PARSER_PREFERENCE = ("lxml", "html.parser")
+
+
+def available_parsers() -> list[str]:
+    """Parser backends from PARSER_PREFERENCE that are installed here"""
+    found = []
+    for feature in PARSER_PREFERENCE:
+        try:
+            BeautifulSoup("", feature)
+            found.append(feature)
+        except FeatureNotFound:
+            continue
+    return found
+
+
+HTML_PARSER = os.environ.get("HTML_PARSER") or available_parsers()[0]
+logger.debug(f"Using HTML parser backend: {HTML_PARSER}")
+
+
+def make_soup(html: str, parser: str = None) -> BeautifulSoup:
+    """Build a BeautifulSoup tree with the fastest available backend"""
+    return BeautifulSoup(html, parser or HTML_PARSER)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from scrape_all_rosters import parse_roster_html
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    pages = sys.argv[1:] or [os.path.join(script_dir, "ucla_roster_debug.html")]
+
+    for page in pages:
+        with open(page, encoding="utf-8") as f:
+            html = f.read()
+        print(f"\n{page}")
+        for parser in available_parsers():
+            start = time.perf_counter()
+            players = parse_roster_html(html, "https://uclabruins.com", parser=parser)
+            print(f"  {parser:12s} {time.perf_counter() - start:7.3f}s  {len(players)} players")
@@ -0,0 +1,207 @@
+import threading
+import logging
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Max simultaneous requests to a single host (politeness limit)
+MAX_PER_HOST = 6
+
+# Worker threads used by fetch_all()
+MAX_WORKERS = 8
+
+# On-disk response cache shared by every scraper (see cached_get)
+CACHE_DIR = os.environ.get(
+    "HTTP_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache"),
+)
+
+# One keep-alive connection pool shared by every scraper in the process
+session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=MAX_PER_HOST * 4)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+
+_host_limits: dict[str, threading.BoundedSemaphore] = {}
+_host_limits_lock = threading.Lock()
+
+
+def _host_limit(url: str) -> threading.BoundedSemaphore:
+    host = urlparse(url).netloc
+    with _host_limits_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.BoundedSemaphore(MAX_PER_HOST)
+        return _host_limits[host]
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """
+    Drop-in replacement for requests.get that reuses pooled connections and
+    never runs more than MAX_PER_HOST requests against the same host at once.
+    """
+    with _host_limit(url):
+        return session.get(url, **kwargs)
+
+
+def fetch_all(func, items, max_workers: int = MAX_WORKERS) -> dict:
+    """
+    Run func(item) for every item on a thread pool.
+
+    Returns {item: result} in the same order as `items`. An exception from one
+    item is logged and stored as None so the rest of the batch still completes.
+    """
+    items = list(items)
+    if not items:
+        return {}
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        futures = {item: pool.submit(func, item) for item in items}
+        for item, future in futures.items():
+            try:
+                results[item] = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching {item}: {e}")
+                results[item] = None
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Persistent response cache
+# Each URL (with its query params) is stored as <sha1>.body (raw bytes) +
+# <sha1>.json (metadata). Fresh entries are served from disk; stale ones are
+# revalidated with If-None-Match / If-Modified-Since so unchanged pages come
+# back as a 304.
+# ---------------------------------------------------------------------------
+
+def request_url(url: str, params=None) -> str:
+    """The URL requests would actually fetch for url + params (the cache key)"""
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+def _cache_paths(url: str) -> tuple[str, str]:
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, key + ".json"), os.path.join(CACHE_DIR, key + ".body")
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _load_entry(url: str):
+    meta_path, body_path = _cache_paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None
+    if meta.get("url") != url:
+        return None
+    return meta, body
+
+
+def _save_entry(url: str, response: requests.Response, immutable: bool):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    meta_path, body_path = _cache_paths(url)
+    meta = {
+        "url": url,
+        "fetched_at": time.time(),
+        "immutable": immutable,
+        "encoding": response.encoding,
+        "headers": {
+            k: response.headers[k] for k in ("ETag", "Last-Modified", "Content-Type")
+            if k in response.headers
+        },
+    }
+    # Body first so a metadata file never points at a missing/partial body
+    _atomic_write(body_path, response.content)
+    _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+def _touch_entry(url: str, meta: dict):
+    meta_path, _ = _cache_paths(url)
+    meta["fetched_at"] = time.time()
+    _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+def _cached_response(url: str, meta: dict, body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.encoding = meta.get("encoding")
+    response.headers.update(meta.get("headers", {}))
+    response.headers["X-Cache"] = "HIT"
+    return response
+
+
+def cached_get(url: str, ttl: float = 0, immutable: bool = False, cache_if=None, **kwargs) -> requests.Response:
+    """
+    Like get(), but backed by the on-disk cache.
+
+    ttl        seconds a cached copy is served without contacting the server;
+               0 means "always revalidate" (cheap 304 when nothing changed)
+    immutable  the page will never change again; once cached it is served from
+               disk forever. Only pass it when any 200 is known to be the real
+               page, otherwise call mark_immutable() once the body checks out.
+    cache_if   optional check on a fresh 200 response; when it returns False the
+               body is returned but not stored (e.g. an error JSON)
+    """
+    url = request_url(url, kwargs.pop("params", None))
+    entry = _load_entry(url)
+    if entry:
+        meta, body = entry
+        age = time.time() - meta["fetched_at"]
+        if meta.get("immutable") or age < ttl:
+            return _cached_response(url, meta, body)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if "ETag" in meta["headers"]:
+            headers["If-None-Match"] = meta["headers"]["ETag"]
+        if "Last-Modified" in meta["headers"]:
+            headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+        kwargs["headers"] = headers
+
+    response = get(url, **kwargs)
+
+    if entry and response.status_code == 304:
+        logger.debug(f"Not modified: {url}")
+        meta["immutable"] = meta.get("immutable") or immutable
+        _touch_entry(url, meta)
+        return _cached_response(url, meta, body)
+
+    if response.ok and (cache_if is None or cache_if(response)):
+        try:
+            _save_entry(url, response, immutable)
+        except OSError as e:
+            logger.warning(f"Could not cache {url}: {e}")
+    return response
+
+
+def mark_immutable(url: str, params=None) -> bool:
+    """
+    Serve the cached copy of url from disk from now on (e.g. a completed season
+    whose page parsed into rows). Returns False if nothing is cached for it.
+    """
+    url = request_url(url, params)
+    entry = _load_entry(url)
+    if entry is None:
+        return False
+    meta, _ = entry
+    if not meta.get("immutable"):
+        meta["immutable"] = True
+        _atomic_write(_cache_paths(url)[0], json.dumps(meta).encode("utf-8"))
+    return True
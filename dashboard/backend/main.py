@@ -1,6 +1,9 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from start import get_all_data
+from data_store import store
+from schedule_parsers import SCHOOL_SCHEDULES, schedule_url
+import roster_store
+from response_cache import roster_cache, file_key, json_response
 import pandas as pd
 import logging
 import os
@@ -19,61 +22,77 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+def start_data_refresh():
+    """Start the background task that keeps the data snapshot fresh"""
+    store.start()
+
+@app.on_event("shutdown")
+def stop_data_refresh():
+    store.stop()
+
 @app.get("/")
 def root():
     return {"message": "UCLA Tennis API", "status": "running"}
 
+def _roster_records(roster_df):
+    """Roster rows for JSON, with every missing value (NaN or 'nan') shown as 'N/A'"""
+    roster_df = roster_df.astype(object).where(roster_df.notna(), 'N/A')
+    return roster_df.replace('nan', 'N/A').to_dict('records')
+
+def _read_ucla_roster_csv(csv_path):
+    logger.info(f"Reading roster directly from {csv_path}")
+    roster_df = roster_store.read_roster("ucla")
+    
+    # Clean up the data
+    # Strip whitespace from all string columns
+    for col in roster_df.columns:
+        if roster_df[col].dtype == 'object':
+            roster_df[col] = roster_df[col].astype(str).str.strip()
+    
+    # Replace empty strings and 'nan' with 'N/A'
+    roster_df = roster_df.replace('', 'N/A')
+    roster_df = roster_df.replace('nan', 'N/A')
+    roster_df = roster_df.fillna('N/A')
+    
+    logger.info(f"Successfully loaded {len(roster_df)} players from CSV")
+    logger.info(f"CSV columns: {list(roster_df.columns)}")
+    return roster_df
+
 @app.get("/roster")
-def get_roster():
+def get_roster(request: Request):
     """Get current roster with stats from CSV"""
     try:
-        # First try to get data from get_all_data
-        data = get_all_data()
+        # First try to get data from the in-memory snapshot
+        data = store.get_data()
         roster_df = data.get('roster', pd.DataFrame())
         
-        # If empty, try to read CSV directly
-        if roster_df.empty:
-            csv_path = "rosters/ucla_roster.csv"
-            if os.path.exists(csv_path):
-                logger.info(f"Reading roster directly from {csv_path}")
-                roster_df = pd.read_csv(csv_path)
-                
-                # Clean up the data
-                # Strip whitespace from all string columns
-                for col in roster_df.columns:
-                    if roster_df[col].dtype == 'object':
-                        roster_df[col] = roster_df[col].astype(str).str.strip()
-                
-                # Replace empty strings and 'nan' with 'N/A'
-                roster_df = roster_df.replace('', 'N/A')
-                roster_df = roster_df.replace('nan', 'N/A')
-                roster_df = roster_df.fillna('N/A')
-                
-                logger.info(f"Successfully loaded {len(roster_df)} players from CSV")
-                logger.info(f"CSV columns: {list(roster_df.columns)}")
-            else:
+        if not roster_df.empty:
+            # the snapshot's roster only changes when a refresh replaces it
+            key = ("snapshot", store.status()["sources"].get("roster"))
+            build = lambda: _roster_records(roster_df)
+        else:
+            # If empty, read the CSV directly
+            csv_path = roster_store.roster_path("ucla")
+            if not os.path.exists(csv_path):
                 logger.error(f"CSV file not found at {csv_path}")
                 raise HTTPException(
                     status_code=503, 
                     detail=f"Roster CSV file not found. Expected at: {os.path.abspath(csv_path)}"
                 )
+            key = file_key(csv_path)
+            build = lambda: _roster_records(_read_ucla_roster_csv(csv_path))
         
-        if roster_df.empty:
+        # Serialized once per snapshot / file version, then served as cached bytes
+        body, etag = roster_cache.get("roster", key, build)
+        if body == b"[]":
             raise HTTPException(status_code=503, detail="Roster data is empty")
-        
-        # Convert to dict and ensure all values are strings (not NaN)
-        result = roster_df.to_dict('records')
-        
-        # Additional cleanup of the result
-        for player in result:
-            for key, value in player.items():
-                if pd.isna(value) or value == 'nan':
-                    player[key] = 'N/A'
-        
-        return result
+        return json_response(request, body, etag)
         
     except HTTPException:
         raise
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching roster: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching roster: {str(e)}")
@@ -82,7 +101,7 @@ def get_roster():
 def get_current_schedule():
     """Get current season schedule"""
     try:
-        data = get_all_data()
+        data = store.get_data()
         schedule_df = data.get('current_schedule', pd.DataFrame())
         
         if schedule_df.empty:
@@ -93,6 +112,8 @@ def get_current_schedule():
         schedule_df = schedule_df.fillna('')
         
         return schedule_df.to_dict('records')
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching schedule: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching schedule: {str(e)}")
@@ -101,9 +122,11 @@ def get_current_schedule():
 def get_seasons():
     """Get list of available seasons"""
     try:
-        data = get_all_data()
+        data = store.get_data()
         seasons = data.get('seasons', {})
         return sorted(list(seasons.keys()), reverse=True)
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching seasons: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching seasons: {str(e)}")
@@ -112,7 +135,7 @@ def get_seasons():
 def get_season_data(season: str):
     """Get data for a specific season with cumulative scores"""
     try:
-        data = get_all_data()
+        data = store.get_data()
         seasons = data.get('seasons', {})
         
         if season not in seasons:
@@ -200,6 +223,8 @@ def get_season_data(season: str):
         return df.to_dict('records')
     except HTTPException:
         raise
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching season data: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching season data: {str(e)}")
@@ -207,7 +232,7 @@ def get_season_data(season: str):
 @app.get("/health")
 def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "UCLA Tennis API"}
+    return {"status": "healthy", "service": "UCLA Tennis API", "data": store.status()}
 
 @app.get("/compare/big10")
 def compare_big10_schools():
@@ -254,26 +279,10 @@ def get_school_season_data(school: str, season: str):
     try:
         from start import fetch_school_season_schedule
         
-        # Map school names to their website URLs and formats
-        school_configs = {
-            "USC": {"url": "https://usctrojans.com/sports/mens-tennis/schedule/", "format": "text"},
-            "Ohio State": {"url": "https://ohiostatebuckeyes.com/sports/mens-tennis/schedule/", "format": "text"},
-            "Michigan": {"url": "https://mgoblue.com/sports/mens-tennis/schedule/", "format": "text"},
-            "Penn State": {"url": "https://gopsusports.com/sports/mens-tennis/schedule/", "format": "season"},
-            "Illinois": {"url": "https://fightingillini.com/sports/mens-tennis/schedule/", "format": "season"},
-            "Northwestern": {"url": "https://nusports.com/sports/mens-tennis/schedule/", "format": "text"},
-            "Indiana": {"url": "https://iuhoosiers.com/sports/mens-tennis/schedule/", "format": "text"},
-            "Purdue": {"url": "https://purduesports.com/sports/mens-tennis/schedule/", "format": "season"},
-            "Wisconsin": {"url": "https://uwbadgers.com/sports/mens-tennis/schedule/", "format": "text"},
-            "Nebraska": {"url": "https://huskers.com/sports/mens-tennis/schedule/", "format": "season"},
-            "Michigan State": {"url": "https://msuspartans.com/sports/mens-tennis/schedule/", "format": "text"}
-        }
-        
-        if school not in school_configs:
+        if school not in SCHOOL_SCHEDULES:
             raise HTTPException(status_code=404, detail=f"School {school} not found")
         
-        config = school_configs[school]
-        df = fetch_school_season_schedule(config["url"], season, school, config["format"])
+        df = fetch_school_season_schedule(school, season)
         
         if df.empty:
             logger.warning(f"No data found for {school} season {season}")
@@ -378,23 +387,16 @@ def debug_scrape(school: str, season: str):
     try:
         from start import fetch_school_season_schedule
         
-        school_urls = {
-            "Penn State": "https://gopsusports.com/sports/mens-tennis/schedule/",
-            "Purdue": "https://purduesports.com/sports/mens-tennis/schedule/",
-            "Nebraska": "https://huskers.com/sports/mens-tennis/schedule",
-            "Illinois": "https://fightingillini.com/sports/mens-tennis/schedule/",
-        }
+        if school not in SCHOOL_SCHEDULES:
+            return {"error": f"School {school} not configured"}
         
-        if school not in school_urls:
-            return {"error": f"School {school} not in debug list"}
-        
-        base_url = school_urls[school]
-        df = fetch_school_season_schedule(base_url, season, school)
+        df = fetch_school_season_schedule(school, season)
         
         return {
             "school": school,
             "season": season,
-            "url_used": base_url + season,
+            "layout": SCHOOL_SCHEDULES[school]["layout"],
+            "url_used": schedule_url(school, season),
             "rows_found": len(df),
             "columns": list(df.columns) if not df.empty else [],
             "raw_data": df.to_dict('records') if not df.empty else [],
@@ -404,43 +406,47 @@ def debug_scrape(school: str, season: str):
         return {"error": str(e), "traceback": str(e.__traceback__)}
 
 @app.get("/schools/{school}/roster")
-def get_school_roster(school: str):
+def get_school_roster(school: str, request: Request):
     """Get roster for a specific school"""
     try:
-        school_file_map = {
-            "UCLA": "rosters/ucla_roster.csv",
-            "USC": "rosters/usc_roster.csv",
-            "Purdue": "rosters/purdue_roster.csv",
-            "Penn State": "rosters/penn_state_roster.csv",
-            "Nebraska": "rosters/nebraska_roster.csv",
-            "Ohio State": "rosters/ohio_state_roster.csv",
-            "Michigan": "rosters/michigan_roster.csv",
-            "Illinois": "rosters/illinois_roster.csv",
-            "Northwestern": "rosters/northwestern_roster.csv",
-            "Indiana": "rosters/indiana_roster.csv",
-            "Wisconsin": "rosters/wisconsin_roster.csv",
-            "Michigan State": "rosters/michigan_state_roster.csv"
+        school_key_map = {
+            "UCLA": "ucla",
+            "USC": "usc",
+            "Purdue": "purdue",
+            "Penn State": "penn_state",
+            "Nebraska": "nebraska",
+            "Ohio State": "ohio_state",
+            "Michigan": "michigan",
+            "Illinois": "illinois",
+            "Northwestern": "northwestern",
+            "Indiana": "indiana",
+            "Wisconsin": "wisconsin",
+            "Michigan State": "michigan_state"
         }
         
         logger.info(f"Looking for roster for school: {school}")
         
-        if school not in school_file_map:
+        if school not in school_key_map:
             logger.error(f"School {school} not in mapping")
             raise HTTPException(status_code=404, detail=f"Roster for {school} not found")
         
-        csv_path = school_file_map[school]
+        csv_path = roster_store.roster_path(school_key_map[school])
         logger.info(f"Trying to load roster from: {csv_path}")
         
         if not os.path.exists(csv_path):
             logger.error(f"File does not exist: {csv_path}")
-            logger.info(f"Current directory: {os.getcwd()}")
-            logger.info(f"Files in rosters/: {os.listdir('rosters') if os.path.exists('rosters') else 'rosters dir not found'}")
+            logger.info(f"Files in rosters/: {os.listdir(roster_store.ROSTERS_DIR) if os.path.exists(roster_store.ROSTERS_DIR) else 'rosters dir not found'}")
             raise HTTPException(status_code=404, detail=f"Roster file not found for {school} at {csv_path}")
         
-        df = pd.read_csv(csv_path)
-        df = df.fillna('N/A')
+        # sliced from the memory-mapped combined roster file when it is current, and
+        # only re-serialized when the roster file has been rewritten
+        def build():
+            df = roster_store.read_roster(school_key_map[school])
+            df = df.fillna('N/A')
+            return df.to_dict('records')
         
-        return df.to_dict('records')
+        body, etag = roster_cache.get(("school", school), file_key(csv_path), build)
+        return json_response(request, body, etag)
         
     except HTTPException:
         raise
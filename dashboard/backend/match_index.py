@@ -0,0 +1,112 @@
+"""
+Per-player index over a match results CSV (match_results.csv / mens_results.csv).
+
+Record and report scripts used to find a player's matches by scanning the
+whole table with (Player1 == name) | (Player2 == name) plus str.startswith
+event filters. MatchIndex loads the results once and precomputes:
+
+    - for every name, the row positions where it appears as Player1 or Player2
+    - an event-type code per row (dual / ita / ncaa / other)
+    - a season code per row: the year the college season started (Aug - Jul)
+
+so a player's slice is a lookup of just their rows:
+
+    index = load_index(path)
+    index.matches("Rudy Quan", events=COLLEGE_EVENTS, season=2024)
+    index.select(events=COLLEGE_EVENTS, season=2025)    # every player at once
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+EVENT_TYPES = ["dual", "ita", "ncaa", "other"]
+COLLEGE_EVENTS = ("dual", "ita", "ncaa")
+EVENT_PATTERNS = {
+    "dual": r"^Dual Match",
+    "ita": r"^\d{4} ITA",
+    "ncaa": r"^\d{4}(?:-\d{2})? NCAA Division",
+}
+SEASON_START_MONTH = 8
+
+
+def season_codes(dates):
+    """Season (its starting year) of each date: Aug 2025 - Jul 2026 is 2025; -1 for missing dates"""
+    dates = pd.DatetimeIndex(dates)
+    seasons = dates.year - (dates.month < SEASON_START_MONTH)
+    return np.where(dates.isna(), -1, seasons).astype("int16")
+
+
+def event_codes(event_names):
+    """Position in EVENT_TYPES of each event name"""
+    names = pd.Series(event_names).astype("string")
+    codes = np.full(len(names), EVENT_TYPES.index("other"), dtype="int8")
+    for event, pattern in EVENT_PATTERNS.items():
+        codes[names.str.contains(pattern, na=False).to_numpy(dtype=bool)] = EVENT_TYPES.index(event)
+    return codes
+
+
+class MatchIndex:
+    def __init__(self, results):
+        self.results = results.reset_index(drop=True)
+        self.results["Date"] = pd.to_datetime(self.results["Date"])
+        self.event_codes = event_codes(self.results["Event Name"])
+        self.season_codes = season_codes(self.results["Date"])
+
+        # every (name, row) pair from both player columns, grouped by name in row order
+        n = len(self.results)
+        names = np.concatenate([self.results["Player1"].to_numpy(), self.results["Player2"].to_numpy()])
+        codes, uniques = pd.factorize(names)
+        rows = np.tile(np.arange(n), 2)
+        keep = codes >= 0
+        codes, rows = codes[keep], rows[keep]
+        order = np.lexsort((rows, codes))
+        self._rows = rows[order]
+        self._bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(uniques)))])
+        self._positions = {name: i for i, name in enumerate(uniques)}
+
+    def mask(self, events=None, season=None):
+        """Boolean mask over all results for these event types and season (None = any)"""
+        mask = np.ones(len(self.results), dtype=bool)
+        if events is not None:
+            mask &= np.isin(self.event_codes, [EVENT_TYPES.index(e) for e in events])
+        if season is not None:
+            mask &= self.season_codes == season
+        return mask
+
+    def rows(self, player, events=None, season=None):
+        """Row positions of a player's matches, in file order"""
+        i = self._positions.get(player)
+        if i is None:
+            return np.empty(0, dtype=int)
+        rows = np.unique(self._rows[self._bounds[i]:self._bounds[i + 1]])
+        if events is not None:
+            rows = rows[np.isin(self.event_codes[rows], [EVENT_TYPES.index(e) for e in events])]
+        if season is not None:
+            rows = rows[self.season_codes[rows] == season]
+        return rows
+
+    def matches(self, player, events=None, season=None):
+        """A player's matches as a DataFrame (rows of results, original index kept)"""
+        return self.results.iloc[self.rows(player, events, season)]
+
+    def select(self, events=None, season=None):
+        """All matches of these event types and season"""
+        return self.results[self.mask(events, season)]
+
+    def players(self):
+        return list(self._positions)
+
+
+@lru_cache(maxsize=None)
+def load_index(path, drop_duplicates=False):
+    """
+    MatchIndex over a results CSV, built once per process. Every caller gets
+    the same object, so treat index.results as read-only: add derived columns
+    to a copy (index.results.assign(...)), never in place.
+    """
+    results = pd.read_csv(path)
+    if drop_duplicates:
+        results = results.drop_duplicates()
+    return MatchIndex(results)
@@ -0,0 +1,71 @@
+"""
+Pre-serialized JSON responses for the roster endpoints.
+
+Each cached response is keyed by what it was built from, usually a roster
+file's (path, mtime, size). As long as the key matches, requests get the same
+JSON bytes and ETag without touching pandas. When update_records.py or the
+scraper rewrites the file its mtime changes, so the next request rebuilds it.
+Writes that don't change a roster leave the mtime alone (see roster_store.py),
+so the cached bytes stay valid.
+
+    body, etag = roster_cache.get(("school", school), file_key(path), build)
+    return json_response(request, body, etag)
+
+Clients that send If-None-Match with the current ETag get an empty 304.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from fastapi import Request, Response
+
+
+def file_key(path):
+    """Cache key for content built from a file; changes whenever the file is replaced"""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def serialize(content):
+    """JSON bytes exactly as FastAPI's JSONResponse would render them"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class ResponseCache:
+    """One (key, body, etag) entry per name; a new key replaces the old entry"""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, key, build):
+        """
+        (body, etag) for `name`. build() returns the JSON-able content and is
+        only called when there is no entry for this key yet.
+        """
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1], entry[2]
+        body = serialize(build())
+        etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        with self._lock:
+            self._entries[name] = (key, body, etag)
+        return body, etag
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def json_response(request: Request, body, etag):
+    """200 with the cached bytes, or 304 when the client already has this ETag"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in match.split(",")) or match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+roster_cache = ResponseCache()
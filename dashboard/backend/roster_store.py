@@ -0,0 +1,205 @@
+"""
+Reads and writes for rosters/.
+
+    rosters/<school>_roster.csv    one CSV per school (what people open and edit)
+    rosters/all_rosters.csv        combined CSV written by scrape_all_rosters.py
+    rosters/all_rosters.arrow      every school's roster in one uncompressed Arrow
+                                   file, with each school's row range, columns and
+                                   column types in the schema metadata
+
+Every write goes to a temp file that is renamed over the target, so the API
+never sees a half-written roster, and a write whose content is identical to
+what is on disk is skipped (the file and its mtime stay untouched).
+
+The API memory-maps all_rosters.arrow and slices a school's rows out of it
+instead of parsing CSV on each request. It is rebuilt by build_combined()
+after a batch of roster writes; if a school's CSV is newer than the combined
+file (e.g. edited by hand), read_roster() reads that CSV instead.
+
+pyarrow is optional: without it only the CSVs are written and read.
+"""
+
+import glob
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROSTERS_DIR = os.path.join(SCRIPT_DIR, "rosters")
+COMBINED_CSV = "all_rosters.csv"
+COMBINED_ARROW = "all_rosters.arrow"
+METADATA_KEY = b"schools"
+
+
+def roster_path(school_key, rosters_dir=ROSTERS_DIR):
+    return os.path.join(rosters_dir, f"{school_key}_roster.csv")
+
+
+def school_keys(rosters_dir=ROSTERS_DIR):
+    """Keys of every <school>_roster.csv in the folder, sorted"""
+    paths = glob.glob(os.path.join(rosters_dir, "*_roster.csv"))
+    return sorted(os.path.basename(p)[: -len("_roster.csv")] for p in paths)
+
+
+# ── writes ──────────────────────────────────────────────────────────────────
+def _write_bytes(path, data):
+    """Atomically replace path with data unless it already holds exactly that. Returns True if written."""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        os.remove(tmp)
+        raise
+    return True
+
+
+def write_csv(df, path):
+    """df.to_csv(path, index=False), atomic and skipped when unchanged. Returns True if written."""
+    return _write_bytes(path, df.to_csv(index=False).encode("utf-8"))
+
+
+def write_roster(school_key, df, rosters_dir=ROSTERS_DIR):
+    """Write one school's roster CSV. Returns True if the file changed."""
+    return write_csv(df, roster_path(school_key, rosters_dir))
+
+
+def _to_arrow(df):
+    """
+    (table, types): df as an Arrow table, and the Arrow type each column had
+    as read from the CSV, so read_roster() can restore it after _concat().
+    """
+    types = {field.name: str(field.type) for field in pa.Schema.from_pandas(df, preserve_index=False)}
+    # all-empty columns (e.g. a Year column nobody filled in) go in as nulls so they
+    # combine with the same column holding text at another school
+    df = df.astype({col: object for col in df.columns if df[col].isna().all()})
+    return pa.Table.from_pandas(df, preserve_index=False), types
+
+
+def _concat(tables):
+    try:
+        return pa.concat_tables(tables, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # a column that is numeric at one school and text at another
+        columns = {name for t in tables for name in t.column_names}
+        clash = {name for name in columns
+                 if len({t.schema.field(name).type for t in tables if name in t.column_names}) > 1}
+        tables = [t.cast(pa.schema([
+            pa.field(f.name, pa.string()) if f.name in clash else f for f in t.schema
+        ])) for t in tables]
+        return pa.concat_tables(tables, promote_options="permissive")
+
+
+def build_combined(rosters_dir=ROSTERS_DIR):
+    """
+    Rebuild all_rosters.arrow from the per-school CSVs. Returns True if it changed.
+    Call once after a batch of write_roster() calls.
+    """
+    if not HAVE_ARROW:
+        return False
+    tables, schools, start = [], {}, 0
+    for key in school_keys(rosters_dir):
+        df = pd.read_csv(roster_path(key, rosters_dir))
+        table, types = _to_arrow(df)
+        tables.append(table)
+        schools[key] = {"start": start, "rows": len(df), "columns": list(df.columns), "types": types}
+        start += len(df)
+    if not tables:
+        return False
+    combined = _concat(tables)
+    # keep only the types the combined file changed (e.g. UTR is a number at one
+    # school and "Unrated" text at another)
+    for view in schools.values():
+        view["types"] = {name: t for name, t in view["types"].items()
+                         if str(combined.schema.field(name).type) != t}
+    combined = combined.replace_schema_metadata({METADATA_KEY: json.dumps(schools)})
+    sink = pa.BufferOutputStream()
+    feather.write_feather(combined, sink, compression="uncompressed")
+    path = os.path.join(rosters_dir, COMBINED_ARROW)
+    try:
+        if _write_bytes(path, sink.getvalue().to_pybytes()):
+            return True
+        # same rosters, but mark it current again for CSVs that were rewritten
+        os.utime(path)
+        return False
+    except PermissionError as e:
+        # Windows won't replace a file the running API has mapped; the API keeps
+        # serving the newer CSVs until the next rebuild goes through
+        logger.warning(f"Could not replace {COMBINED_ARROW}: {e}")
+        return False
+
+
+# ── reads ───────────────────────────────────────────────────────────────────
+_mapped = {}
+_mapped_lock = threading.Lock()
+
+
+def load_combined(rosters_dir=ROSTERS_DIR):
+    """
+    (mtime_ns, table, {school: {"start", "rows", "columns", "types"}}) for the
+    memory-mapped all_rosters.arrow, or None if it doesn't exist. The mapping
+    is reused until the file is replaced.
+    """
+    path = os.path.join(rosters_dir, COMBINED_ARROW)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    if not HAVE_ARROW:
+        return None
+    with _mapped_lock:
+        cached = _mapped.get(path)
+        if cached is None or cached[0] != mtime:
+            table = feather.read_table(path, memory_map=True)
+            cached = (mtime, table, json.loads(table.schema.metadata[METADATA_KEY]))
+            _mapped[path] = cached
+    return cached
+
+
+def read_roster(school_key, rosters_dir=ROSTERS_DIR):
+    """
+    One school's roster as a DataFrame, like pd.read_csv(roster_path(school_key)).
+    Sliced from the mapped combined file when that is at least as new as the CSV.
+    Raises FileNotFoundError if the school has no roster.
+    """
+    csv_path = roster_path(school_key, rosters_dir)
+    csv_mtime = os.stat(csv_path).st_mtime_ns
+    combined = load_combined(rosters_dir)
+    if combined is not None:
+        arrow_mtime, table, schools = combined
+        view = schools.get(school_key)
+        if view is not None and csv_mtime <= arrow_mtime:
+            rows = table.slice(view["start"], view["rows"]).select(view["columns"])
+            types = view.get("types")
+            if types:
+                rows = rows.cast(pa.schema([
+                    pa.field(f.name, pa.type_for_alias(types[f.name])) if f.name in types else f
+                    for f in rows.schema
+                ]))
+            df = rows.to_pandas()
+            # null text cells come back as None where read_csv gives NaN
+            text = df.columns[df.dtypes == object]
+            df[text] = df[text].where(df[text].notna(), np.nan)
+            return df
+    return pd.read_csv(csv_path)
@@ -0,0 +1,157 @@
+"""
+Vectorized parser for singles score strings like the ones UTRScraper.get_score_string
+writes to match_results.csv / mens_results.csv:
+
+    "6-4, 3-6, 7-6(5)"     sets from Player1's side, tiebreak loser points in ()
+    "6-3, 1-0(8)"          1-0 is a match tiebreak (counts as a set)
+    "None-6, 6-4, 6-4"     UTR stores a 0 as None
+    "6-4, 2-1 RET"         retirement (RET / Ret. / W/O / DEF also accepted)
+    "6-4, 3-3 UF"          unfinished: no winner whatever the sets say
+    "6-4, 3-3"             also unfinished: a set can't end level, so play was
+                           stopped (e.g. the dual match was already clinched)
+
+parse_scores() handles a whole Series at once (one str.findall pass, then
+numpy on the flattened sets) instead of splitting each string in Python:
+
+    parsed = parse_scores(results['Score'])
+    parsed['winner']      # 1 = Player1, 2 = Player2, 0 = no winner
+
+    python scores.py [results.csv]     # benchmark against the per-row loop
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# one set: games of each side, optional tiebreak points after either number
+SET_RE = r"(?P<p1>\d+|None)(?:\((?P<tb1>\d+)\))?-(?P<p2>\d+|None)(?:\((?P<tb2>\d+)\))?"
+RETIRED_RE = r"(?i)\b(?:RET|W/?O|DEF)"
+UNFINISHED_RE = r"\bUF\b"
+MAX_SETS = 5
+
+
+def set_scores(scores):
+    """
+    Long table of every set in a Series of scores: match (index label of the
+    score), pos (its position in the Series), set (0-based), p1 / p2 games and
+    tiebreak (bool).
+    """
+    scores = pd.Series(scores)
+    found = scores.astype("string").str.findall(SET_RE)
+    counts = found.str.len().fillna(0).to_numpy(dtype=int)
+    # (sets, 4) array of p1, tb1, p2, tb2 strings; "" where there was no tiebreak
+    flat = np.array(list(itertools.chain.from_iterable(found.dropna())), dtype=str).reshape(-1, 4)
+    games = np.where(flat[:, [0, 2]] == "None", "0", flat[:, [0, 2]]).astype("int16")
+    starts = np.cumsum(counts) - counts
+    return pd.DataFrame({
+        "match": np.repeat(scores.index.to_numpy(), counts),
+        "pos": np.repeat(np.arange(len(scores)), counts),
+        "set": np.arange(len(flat)) - np.repeat(starts, counts),
+        "p1": games[:, 0],
+        "p2": games[:, 1],
+        "tiebreak": (flat[:, 1] != "") | (flat[:, 3] != ""),
+    })
+
+
+def parse_scores(scores):
+    """
+    Per-match summary aligned with `scores` (same index):
+    p1_sets, p2_sets, p1_games, p2_games, sets_played, tiebreaks,
+    retired, unfinished, winner (1 = Player1, 2 = Player2, 0 = none).
+    A set counts for whoever has more games; tied sets count for nobody. The
+    winner has more sets, unless the match is unfinished (marked UF, or the
+    last set is level without a retirement) or nothing parsed.
+    """
+    scores = pd.Series(scores)
+    text = scores.astype("string")
+    sets = set_scores(scores)
+    pos = sets["pos"].to_numpy()
+    n = len(scores)
+
+    def total(values):
+        return np.bincount(pos, weights=values, minlength=n).astype(int)
+
+    is_last = np.append(pos[1:] != pos[:-1], True) if len(pos) else np.empty(0, dtype=bool)
+    level_last = total(is_last & (sets["p1"] == sets["p2"]).to_numpy()) > 0
+
+    parsed = pd.DataFrame({
+        "p1_sets": total(sets["p1"] > sets["p2"]),
+        "p2_sets": total(sets["p2"] > sets["p1"]),
+        "p1_games": total(sets["p1"]),
+        "p2_games": total(sets["p2"]),
+        "sets_played": np.bincount(pos, minlength=n),
+        "tiebreaks": total(sets["tiebreak"]),
+        "retired": text.str.contains(RETIRED_RE, na=False).to_numpy(dtype=bool),
+        "unfinished": text.str.contains(UNFINISHED_RE, na=False).to_numpy(dtype=bool),
+    }, index=scores.index)
+    parsed["unfinished"] |= level_last & ~parsed["retired"]
+    winner = np.select([parsed["p1_sets"] > parsed["p2_sets"], parsed["p2_sets"] > parsed["p1_sets"]], [1, 2], 0)
+    parsed["winner"] = np.where(parsed["unfinished"], 0, winner).astype("int8")
+    return parsed
+
+
+def set_games(scores):
+    """(len(scores), MAX_SETS, 2) int array of games per set, -1 where a set wasn't played"""
+    scores = pd.Series(scores)
+    sets = set_scores(scores)
+    sets = sets[sets["set"] < MAX_SETS]
+    games = np.full((len(scores), MAX_SETS, 2), -1, dtype="int16")
+    pos = sets["pos"].to_numpy()
+    games[pos, sets["set"], 0] = sets["p1"]
+    games[pos, sets["set"], 1] = sets["p2"]
+    return games
+
+
+def winners(data, winner_codes=None):
+    """Name of each match's winner (NaN when there is none), from Player1 / Player2"""
+    if winner_codes is None:
+        winner_codes = parse_scores(data["Score"])["winner"]
+    codes = np.asarray(winner_codes)
+    return pd.Series(
+        np.select([codes == 1, codes == 2], [data["Player1"], data["Player2"]], None),
+        index=data.index,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import time
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Benchmark parse_scores() on a results CSV")
+    parser.add_argument("results", nargs="?", default=os.path.join(script_dir, "..", "..", "data", "mens", "mens_results.csv"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scores = pd.read_csv(args.results)["Score"]
+
+    # the per-row loop the record scripts used to run
+    def count_sets_won(score):
+        p1 = p2 = 0
+        if isinstance(score, str):
+            for set_score in score.split(","):
+                parts = set_score.strip().split("-")
+                try:
+                    a, b = int(parts[0].split("(")[0]), int(parts[1].split("(")[0])
+                except (ValueError, IndexError):
+                    continue
+                p1, p2 = p1 + (a > b), p2 + (b > a)
+        return p1, p2
+
+    def best(fn):
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = fn()
+            times.append(time.perf_counter() - start)
+        return min(times), result
+
+    loop_time, loop = best(lambda: scores.apply(count_sets_won).apply(pd.Series))
+    vec_time, parsed = best(lambda: parse_scores(scores))
+    differ = (loop[0].to_numpy() != parsed["p1_sets"].to_numpy()) | (loop[1].to_numpy() != parsed["p2_sets"].to_numpy())
+    print(f"{len(scores)} scores")
+    print(f"  per-row loop:  {loop_time * 1000:8.1f} ms")
+    print(f"  parse_scores:  {vec_time * 1000:8.1f} ms  ({loop_time / vec_time:.1f}x)")
+    print(f"  set counts differ on {differ.sum()} rows (scores with a None side, which the loop skipped)")
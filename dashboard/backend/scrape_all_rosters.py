@@ -1,6 +1,6 @@
 """
 scrape_all_rosters.py  —  Playwright edition
-Requires: pip install playwright beautifulsoup4 pandas
+Requires: pip install playwright beautifulsoup4 pandas requests
           playwright install chromium
 """
 
@@ -10,18 +10,19 @@ import os
 import time
 import json
 import logging
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+from html_parser import make_soup
+from utr_client import AsyncUTRClient
+import roster_store
 from playwright.async_api import async_playwright, TimeoutError as PWTimeout
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s | %(message)s")
 log = logging.getLogger(__name__)
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-ROSTERS_DIR = os.path.join(SCRIPT_DIR, "rosters")
+ROSTERS_DIR = roster_store.ROSTERS_DIR
 os.makedirs(ROSTERS_DIR, exist_ok=True)
 
 HEADERS = {
@@ -71,48 +72,73 @@ def _norm(name: str) -> str:
 
 
 # ---------------------------------------------------------------------------
-# Playwright page fetcher — renders JS then returns HTML
+# Playwright page pool — renders JS then returns HTML
+# A fixed set of pages (spread over a few browser contexts) is shared by every
+# school and profile fetch. Politeness is enforced per domain instead of with
+# global sleeps: at most PER_DOMAIN_PAGES concurrent loads per host and at
+# least PER_DOMAIN_DELAY seconds between load starts on the same host.
 # ---------------------------------------------------------------------------
 
-async def fetch_rendered(url: str, browser, wait_for: str = ".sidearm-roster-player, .s-person, article, tr") -> str:
-    page = await browser.new_page()
-    try:
-        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        try:
-            await page.wait_for_selector(wait_for, timeout=10000)
-        except PWTimeout:
-            pass
-        await page.wait_for_timeout(2000)
-        html = await page.content()
-        return html
-    finally:
-        await page.close()
-
+POOL_CONTEXTS     = 4
+PAGES_PER_CONTEXT = 2
+PER_DOMAIN_PAGES  = 2
+PER_DOMAIN_DELAY  = 0.5
+MAX_SCHOOLS_IN_FLIGHT = 6
+
+
+class PagePool:
+    def __init__(self, browser, contexts: int = POOL_CONTEXTS, pages_per_context: int = PAGES_PER_CONTEXT):
+        self.browser = browser
+        self.n_contexts = contexts
+        self.pages_per_context = pages_per_context
+        self._contexts = []
+        self._pages: asyncio.Queue = asyncio.Queue()
+        self._domain_sems: dict[str, asyncio.Semaphore] = {}
+        self._domain_next: dict[str, float] = {}
+        self._domain_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        for _ in range(self.n_contexts):
+            ctx = await self.browser.new_context(user_agent=HEADERS["User-Agent"])
+            self._contexts.append(ctx)
+            for _ in range(self.pages_per_context):
+                self._pages.put_nowait(await ctx.new_page())
+        return self
+
+    async def __aexit__(self, *exc):
+        for ctx in self._contexts:
+            await ctx.close()
+
+    async def _polite_slot(self, host: str):
+        """Reserve the next allowed start time for this host and sleep until then"""
+        async with self._domain_lock:
+            now = time.monotonic()
+            start = max(now, self._domain_next.get(host, now))
+            self._domain_next[host] = start + PER_DOMAIN_DELAY
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def fetch(self, url: str, wait_for: str) -> str:
+        host = urlparse(url).netloc
+        sem = self._domain_sems.setdefault(host, asyncio.Semaphore(PER_DOMAIN_PAGES))
+        async with sem:
+            await self._polite_slot(host)
+            page = await self._pages.get()
+            try:
+                await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                try:
+                    await page.wait_for_selector(wait_for, timeout=10000)
+                    # let late JS finish, but stop as soon as the network is quiet
+                    await page.wait_for_load_state("networkidle", timeout=2000)
+                except PWTimeout:
+                    pass
+                return await page.content()
+            finally:
+                self._pages.put_nowait(page)
 
-# ---------------------------------------------------------------------------
-# UTR lookup
-# ---------------------------------------------------------------------------
 
-def get_utr_data(player_name: str, school: str = "") -> tuple[str, str]:
-    queries = [player_name, f"{player_name} {school}"] if school else [player_name]
-    for query in queries:
-        try:
-            data = requests.get(
-                f"https://app.universaltennis.com/api/v2/search/players?query={query}&top=1",
-                headers=HEADERS, timeout=10,
-            ).json()
-            key = "hits" if "hits" in data else "Hits"
-            hit = data[key][0]
-            pid = hit.get("id") or hit.get("Id")
-            player = requests.get(
-                f"https://app.universaltennis.com/api/v1/player/{pid}",
-                headers=HEADERS, timeout=10,
-            ).json()
-            utr = player.get("singlesUtr") or "Unrated"
-            return str(utr), f"https://app.utrsports.net/profiles/{pid}"
-        except Exception as e:
-            log.debug(f"UTR error for '{query}': {e}")
-    return "N/A", "N/A"
+async def fetch_rendered(url: str, pool: PagePool, wait_for: str = ".sidearm-roster-player, .s-person, article, tr") -> str:
+    return await pool.fetch(url, wait_for)
 
 
 # ---------------------------------------------------------------------------
@@ -124,9 +150,21 @@ def get_utr_data(player_name: str, school: str = "") -> tuple[str, str]:
 # ---------------------------------------------------------------------------
 
 PROFILE_RE = re.compile(r"/(?:sports/mens-tennis|sport/mten)/roster/[^/]+/(\d+)", re.I)
-
-def parse_roster_html(html: str, base_url: str) -> list[dict]:
-    soup = BeautifulSoup(html, "html.parser")
+GENERIC_RE = re.compile(r"/roster/[^/]+/\d+", re.I)
+TRAILING_ID_RE = re.compile(r"/(\d+)/?$")
+PERSON_CARD_RE = re.compile(r"s-person|roster-player|player-card", re.I)
+NAME_CLASS_RE = re.compile(r"name", re.I)
+CARD_CLASS_RE = re.compile(r"roster.player|player.card|athlete|s-person", re.I)
+ROSTER_HREF_RE = re.compile(r"roster", re.I)
+
+# card field patterns: Strategy A (Sidearm) and Strategies B/C (generic)
+SIDEARM_YEAR_RE     = re.compile(r"academic.year|class.year|eligibility|year", re.I)
+SIDEARM_HOMETOWN_RE = re.compile(r"hometown|city|high.school", re.I)
+GENERIC_YEAR_RE     = re.compile(r"year|class|eligibility|academic", re.I)
+GENERIC_HOMETOWN_RE = re.compile(r"hometown|city|location", re.I)
+
+def parse_roster_html(html: str, base_url: str, parser: str = None) -> list[dict]:
+    soup = make_soup(html, parser)
     players: list[dict] = []
 
     # ── shared dedup state ──────────────────────────────────────────────────
@@ -165,34 +203,33 @@ def parse_roster_html(html: str, base_url: str) -> list[dict]:
         if not name:
             continue
         card = _find_card(link)
-        year     = _extract_year(_field_text(card, r"academic.year|class.year|eligibility|year"))
-        hometown = _field_text(card, r"hometown|city|high.school") or "N/A"
+        year     = _extract_year(_field_text(card, SIDEARM_YEAR_RE))
+        hometown = _field_text(card, SIDEARM_HOMETOWN_RE) or "N/A"
         _add(pid, name, profile_url, year, hometown)
 
     if players:
         return players
 
     # --- Strategy B: generic /roster/<slug>/<id> pattern ---
-    GENERIC_RE = re.compile(r"/roster/[^/]+/\d+", re.I)
     for link in soup.find_all("a", href=GENERIC_RE):
         href = link["href"]
-        pid_m = re.search(r"/(\d+)/?$", href)
+        pid_m = TRAILING_ID_RE.search(href)
         pid = pid_m.group(1) if pid_m else ""
         profile_url = urljoin(base_url, href)
         name = _extract_name(link)
         if not name or len(name) < 3:
             continue
         card = _find_card(link)
-        year     = _extract_year(_field_text(card, r"year|class|eligibility|academic"))
-        hometown = _field_text(card, r"hometown|city|location") or "N/A"
+        year     = _extract_year(_field_text(card, GENERIC_YEAR_RE))
+        hometown = _field_text(card, GENERIC_HOMETOWN_RE) or "N/A"
         _add(pid, name, profile_url, year, hometown)
 
     if players:
         return players
 
     # --- Strategy C: s-person / player-card elements ---
-    for card in soup.find_all(class_=re.compile(r"s-person|roster-player|player-card", re.I)):
-        name_tag = (card.find(class_=re.compile(r"name", re.I)) or card.find(["h2", "h3", "h4"]))
+    for card in soup.find_all(class_=PERSON_CARD_RE):
+        name_tag = (card.find(class_=NAME_CLASS_RE) or card.find(["h2", "h3", "h4"]))
         if not name_tag:
             continue
         name = name_tag.get_text(" ", strip=True)
@@ -200,11 +237,11 @@ def parse_roster_html(html: str, base_url: str) -> list[dict]:
             continue
         link = card.find("a", href=True)
         href = link["href"] if link else ""
-        pid_m = re.search(r"/(\d+)/?$", href)
+        pid_m = TRAILING_ID_RE.search(href)
         pid = pid_m.group(1) if pid_m else ""
         profile_url = urljoin(base_url, href) if href else "N/A"
-        year     = _extract_year(_field_text(card, r"year|class|eligibility|academic"))
-        hometown = _field_text(card, r"hometown|city|location") or "N/A"
+        year     = _extract_year(_field_text(card, GENERIC_YEAR_RE))
+        hometown = _field_text(card, GENERIC_HOMETOWN_RE) or "N/A"
         _add(pid, name, profile_url, year, hometown)
 
     return players
@@ -212,7 +249,7 @@ def parse_roster_html(html: str, base_url: str) -> list[dict]:
 
 def _extract_name(link) -> str:
     for tag in ("h2", "h3", "h4", "span", "div"):
-        elem = link.find(tag, class_=re.compile(r"name", re.I))
+        elem = link.find(tag, class_=NAME_CLASS_RE)
         if elem:
             return elem.get_text(" ", strip=True)
     for tag in ("h2", "h3", "h4"):
@@ -226,21 +263,20 @@ def _extract_name(link) -> str:
 
 
 def _find_card(link):
-    rx = re.compile(r"roster.player|player.card|athlete|s-person", re.I)
     node = link.parent
     for _ in range(6):
         if node is None:
             break
-        if rx.search(" ".join(node.get("class", []))):
+        if CARD_CLASS_RE.search(" ".join(node.get("class", []))):
             return node
         node = node.parent
     return link.parent
 
 
-def _field_text(card, pattern: str) -> str:
+def _field_text(card, pattern: re.Pattern) -> str:
     if card is None:
         return ""
-    elem = card.find(class_=re.compile(pattern, re.I))
+    elem = card.find(class_=pattern)
     if elem:
         t = elem.get_text(" ", strip=True)
         if 1 < len(t) < 100:
@@ -252,14 +288,39 @@ def _field_text(card, pattern: str) -> str:
 # Individual player profile page
 # ---------------------------------------------------------------------------
 
-async def scrape_player_profile(url: str, browser) -> dict:
-    try:
-        html = await fetch_rendered(url, browser, wait_for="body")
-    except Exception:
-        return {}
+BIO_CLASS_RE      = re.compile(r"player.bio|athlete.bio|s-person|bio", re.I)
+HOMETOWN_CLASS_RE = re.compile(r"hometown|city|location", re.I)
+YEAR_CLASS_RE     = re.compile(r"year|class|eligibility", re.I)
+HOMETOWN_TEXT_RE  = re.compile(r'Hometown[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z]{2,})', re.I)
+
+
+def _first_by_class(soup, patterns: dict) -> dict:
+    """
+    First element (in document order) whose class matches each pattern,
+    found in one walk over the document instead of one soup.find() per pattern.
+    """
+    found = {}
+    for elem in soup.find_all(class_=True):
+        classes = elem.get("class") or []
+        joined = " ".join(classes)
+        for key, rx in patterns.items():
+            if key in found:
+                continue
+            if rx.search(joined) or any(rx.search(c) for c in classes):
+                found[key] = elem
+        if len(found) == len(patterns):
+            break
+    return found
+
 
-    soup = BeautifulSoup(html, "html.parser")
-    bio = soup.find(class_=re.compile(r"player.bio|athlete.bio|s-person|bio", re.I)) or soup
+def parse_player_profile(html: str, parser: str = None) -> dict:
+    soup = make_soup(html, parser)
+    found = _first_by_class(soup, {
+        "bio": BIO_CLASS_RE,
+        "hometown": HOMETOWN_CLASS_RE,
+        "year": YEAR_CLASS_RE,
+    })
+    bio = found.get("bio") or soup
 
     year = hometown = ""
 
@@ -272,52 +333,56 @@ async def scrape_player_profile(url: str, browser) -> dict:
         if any(k in label for k in ["hometown", "city", "home"]) and len(val) < 100:
             hometown = val or label
 
-    if not hometown:
-        elem = soup.find(class_=re.compile(r"hometown|city|location", re.I))
-        if elem:
-            ht = elem.get_text(strip=True)
-            if len(ht) < 100:
-                hometown = ht
+    if not hometown and "hometown" in found:
+        ht = found["hometown"].get_text(strip=True)
+        if len(ht) < 100:
+            hometown = ht
 
-    if not year:
-        elem = soup.find(class_=re.compile(r"year|class|eligibility", re.I))
-        if elem:
-            yt = elem.get_text(strip=True)
-            if len(yt) < 30:
-                year = yt
+    if not year and "year" in found:
+        yt = found["year"].get_text(strip=True)
+        if len(yt) < 30:
+            year = yt
 
     if not hometown:
-        m = re.search(r'Hometown[:\s]+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,\s*[A-Z]{2,})', soup.get_text(), re.I)
+        m = HOMETOWN_TEXT_RE.search(soup.get_text())
         if m:
             hometown = m.group(1)
 
     return {"Year_In_School": _extract_year(year) if year else "N/A", "Hometown": hometown or "N/A"}
 
 
+async def scrape_player_profile(url: str, pool: PagePool) -> dict:
+    try:
+        html = await fetch_rendered(url, pool, wait_for="body")
+    except Exception:
+        return {}
+    return parse_player_profile(html)
+
+
 # ---------------------------------------------------------------------------
 # Per-school scraper
 # FIX: dedup rows within a school by normalised name before UTR lookups,
 #      so we never hit the UTR API twice for the same player.
 # ---------------------------------------------------------------------------
 
-async def scrape_school(school_key: str, cfg: dict, browser) -> pd.DataFrame:
+async def scrape_school(school_key: str, cfg: dict, pool: PagePool, utr: AsyncUTRClient) -> pd.DataFrame:
     display = cfg["display"]
-    log.info(f"\n{'='*60}\nScraping {display} ...")
+    log.info(f"Scraping {display} ...")
 
-    html = await fetch_rendered(cfg["roster_url"], browser)
+    html = await fetch_rendered(cfg["roster_url"], pool)
     if not html:
         log.error(f"Could not fetch {display}")
         return pd.DataFrame()
 
     players = parse_roster_html(html, cfg["base_url"])
-    log.info(f"  Found {len(players)} players")
+    log.info(f"  {display}: found {len(players)} players")
 
     if not players:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = make_soup(html)
         log.warning(f"  DEBUG — page title: {soup.title.string if soup.title else 'N/A'}")
-        log.warning(f"  DEBUG — all <a href> containing 'roster': {[a['href'] for a in soup.find_all('a', href=re.compile(r'roster', re.I))[:5]]}")
+        log.warning(f"  DEBUG — all <a href> containing 'roster': {[a['href'] for a in soup.find_all('a', href=ROSTER_HREF_RE)[:5]]}")
 
-    rows = []
+    unique = []
     seen_in_school: set[str] = set()   # FIX: catches any stragglers at row-build time
 
     for p in players:
@@ -329,22 +394,32 @@ async def scrape_school(school_key: str, cfg: dict, browser) -> pd.DataFrame:
             log.info(f"    Skipping duplicate (row-level): {name}")
             continue
         seen_in_school.add(norm)
+        unique.append(p)
 
-        year     = p.get("Year_In_School", "N/A")
-        hometown = p.get("Hometown", "N/A")
+    # UTR lookups start right away and run while the profile pages render.
+    log.info(f"    UTR: {len(unique)} lookups for {display}")
+    utr_task = asyncio.create_task(utr.lookup_many([(p["Name"], display) for p in unique]))
+
+    # Fetch every missing profile at once; the pool and per-domain limits
+    # decide how many actually load in parallel.
+    async def _profile(p):
+        if p.get("Year_In_School", "N/A") != "N/A" and p.get("Hometown", "N/A") != "N/A":
+            return {}
+        log.info(f"    Profile fetch: {p['Name']}")
+        return await scrape_player_profile(p["Profile_URL"], pool)
 
-        if year == "N/A" or hometown == "N/A":
-            log.info(f"    Profile fetch: {name}")
-            extra = await scrape_player_profile(p["Profile_URL"], browser)
-            if year == "N/A":
-                year = extra.get("Year_In_School", "N/A")
-            if hometown == "N/A":
-                hometown = extra.get("Hometown", "N/A")
-            await asyncio.sleep(0.5)
+    extras = await asyncio.gather(*(_profile(p) for p in unique))
+    utr_results = await utr_task
 
-        log.info(f"    UTR: {name}")
-        utr_rating, utr_url = get_utr_data(name, school=display)
-        await asyncio.sleep(0.75)
+    rows = []
+    for p, extra, (utr_rating, utr_url) in zip(unique, extras, utr_results):
+        name     = p["Name"]
+        year     = p.get("Year_In_School", "N/A")
+        hometown = p.get("Hometown", "N/A")
+        if year == "N/A":
+            year = extra.get("Year_In_School", "N/A")
+        if hometown == "N/A":
+            hometown = extra.get("Hometown", "N/A")
 
         rows.append({
             "School":      display,
@@ -367,25 +442,34 @@ async def scrape_school(school_key: str, cfg: dict, browser) -> pd.DataFrame:
 # ---------------------------------------------------------------------------
 
 async def main():
-    all_frames = []
-
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch(headless=True)
+    frames: dict[str, pd.DataFrame] = {}
+    in_flight = asyncio.Semaphore(MAX_SCHOOLS_IN_FLIGHT)
 
-        for school_key, cfg in SCHOOLS.items():
+    async def _run(school_key: str, cfg: dict, pool: PagePool, utr: AsyncUTRClient):
+        async with in_flight:
             try:
-                df = await scrape_school(school_key, cfg, browser)
-                if not df.empty:
-                    path = os.path.join(ROSTERS_DIR, f"{school_key}_roster.csv")
-                    df.to_csv(path, index=False)
-                    log.info(f"  Saved {len(df)} rows -> {path}")
-                    all_frames.append(df)
-                await asyncio.sleep(2)
+                df = await scrape_school(school_key, cfg, pool, utr)
             except Exception as e:
                 log.exception(f"Fatal error on {school_key}: {e}")
+                return
+        if not df.empty:
+            path = roster_store.roster_path(school_key, ROSTERS_DIR)
+            if roster_store.write_roster(school_key, df, ROSTERS_DIR):
+                log.info(f"  Saved {len(df)} rows -> {path}")
+            else:
+                log.info(f"  Unchanged {path}")
+            frames[school_key] = df
 
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=True)
+        utr = AsyncUTRClient(headers=HEADERS)
+        async with PagePool(browser) as pool:
+            await asyncio.gather(*(_run(key, cfg, pool, utr) for key, cfg in SCHOOLS.items()))
         await browser.close()
 
+    # combine in SCHOOLS order so the output is stable regardless of finish order
+    all_frames = [frames[key] for key in SCHOOLS if key in frames]
+
     if all_frames:
         combined = pd.concat(all_frames, ignore_index=True)
 
@@ -398,8 +482,9 @@ async def main():
         if before != after:
             log.info(f"  Deduped combined CSV: {before} → {after} rows (removed {before - after})")
 
-        out = os.path.join(ROSTERS_DIR, "all_rosters.csv")
-        combined.to_csv(out, index=False)
+        out = os.path.join(ROSTERS_DIR, roster_store.COMBINED_CSV)
+        roster_store.write_csv(combined, out)
+        roster_store.build_combined(ROSTERS_DIR)
         log.info(f"\nCombined -> {out} ({len(combined)} total rows)")
         print(f"\nTotal players scraped: {len(combined)}")
     else:
@@ -1,8 +1,10 @@
 import requests
-from bs4 import BeautifulSoup
+import http_client
+from html_parser import make_soup
 import pandas as pd
 from datetime import datetime
 import logging
+from schedule_parsers import SCHOOL_SCHEDULES, schedule_url, season_years, parse_schedule
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,19 +26,34 @@ SEASONS = [
     "2025-26"
 ]
 
-BASE_URL = "https://uclabruins.com/sports/mens-tennis/schedule/text/"
+# Response cache TTLs (seconds). 0 = always revalidate with a conditional GET,
+# which costs a 304 with no body when the page has not changed.
+SCHEDULE_TTL = 0
+STATS_TTL = 300
+
+def season_is_complete(season: str) -> bool:
+    """A season is finished (and its pages immutable) once June of its end year has passed"""
+    try:
+        _, end_year = season_years(season)
+    except ValueError:
+        return False
+    return datetime.now() >= datetime(end_year, 6, 1)
+
+def fetch_page(url: str, ttl: float = SCHEDULE_TTL):
+    """GET a page through the shared response cache"""
+    return http_client.cached_get(url, ttl=ttl, headers=HEADERS, timeout=10)
 
 def fetch_schedule():
     """Fetch current season schedule"""
     url = "https://uclabruins.com/sports/mens-tennis/schedule/text/2025-26"
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = fetch_page(url)
         response.raise_for_status()
     except requests.RequestException as e:
         logger.error(f"Error fetching schedule: {e}")
         return pd.DataFrame()
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = make_soup(response.text)
     table = soup.find("table")
 
     if not table:
@@ -66,88 +83,21 @@ def fetch_schedule():
     return pd.DataFrame(data)
 
 def fetch_season_schedule(season):
-    """Fetch schedule for a specific season"""
-    url = BASE_URL + season
-    
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        logger.error(f"Error fetching season {season}: {e}")
-        return pd.DataFrame()
-
-    soup = BeautifulSoup(response.text, "html.parser")
-    table = soup.find("table")
-
-    if not table:
-        logger.warning(f"No table found for season {season}")
-        return pd.DataFrame()
-
-    # Parse season years
-    try:
-        start_year, end_year = season.split("-")
-        start_year = int(start_year)
-        end_year = int("20" + end_year) if len(end_year) == 2 else int(end_year)
-    except ValueError as e:
-        logger.error(f"Invalid season format {season}: {e}")
-        return pd.DataFrame()
-
-    rows = []
-    for tr in table.find_all("tr")[1:]:  # Skip header
-        tds = [td.get_text(strip=True) for td in tr.find_all("td")]
-        
-        if len(tds) < 4:
-            continue
-        
-        # Pad with empty strings
-        tds += [""] * (7 - len(tds))
-
-        date_str = tds[0]
-        formatted_date = ""
-
-        if date_str:
-            # Remove day of week in parentheses if present
-            date_str = date_str.split("(")[0].strip()
-            try:
-                date_obj = datetime.strptime(date_str, "%b %d")
-                month = date_obj.month
-                
-                # Assign year based on academic calendar
-                # Jan-May = end_year, Jun-Dec = start_year
-                if month >= 1 and month <= 5:
-                    year = end_year
-                else:
-                    year = start_year
-                
-                date_obj = datetime(year, date_obj.month, date_obj.day)
-                formatted_date = date_obj.strftime("%m-%d-%Y")
-            except ValueError as e:
-                logger.warning(f"Could not parse date {date_str}: {e}")
-                formatted_date = ""
-
-        rows.append({
-            "Date": formatted_date,
-            "Opponent": tds[3],
-            "Location": tds[4], 
-            "Result": tds[6],
-            "Season": season,
-            "Last_Updated": datetime.now().isoformat()
-        })
-    
-    return pd.DataFrame(rows)
+    """Fetch UCLA schedule for a specific season"""
+    return fetch_school_season_schedule("UCLA", season)
 
 def fetch_player_stats():
     """Fetch player statistics"""
     url = "https://static.uclabruins.com/custompages/Stats/2025-26/MTEN/teamcume.htm"
     
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = fetch_page(url, ttl=STATS_TTL)
         response.raise_for_status()
     except requests.RequestException as e:
         logger.error(f"Error fetching player stats: {e}")
         return pd.DataFrame()
 
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = make_soup(response.text)
     table = soup.find("table")
 
     if not table:
@@ -207,16 +157,24 @@ def fetch_roster_with_stats():
         return pd.DataFrame()
 
 def get_all_data():
-    """Fetch all data (schedule, roster, seasons)"""
+    """Fetch all data (schedule, roster, seasons) concurrently"""
     logger.info("Fetching all data...")
-    
-    schedule_df = fetch_schedule()
-    roster_df = fetch_roster_with_stats()
-    
+
+    # Every page is fetched at the same time over the shared session, so a cold
+    # refresh takes about as long as the slowest page instead of the sum of all.
+    jobs = {
+        "current_schedule": fetch_schedule,
+        "roster": fetch_roster_with_stats,
+    }
+    for season in SEASONS:
+        jobs[season] = lambda season=season: fetch_season_schedule(season)
+
+    results = http_client.fetch_all(lambda key: jobs[key](), jobs.keys())
+    results = {key: df if df is not None else pd.DataFrame() for key, df in results.items()}
+
     seasons_data = {}
     for season in SEASONS:
-        logger.info(f"Fetching season {season}...")
-        df = fetch_season_schedule(season)
+        df = results[season]
         if not df.empty:
             seasons_data[season] = df
         else:
@@ -225,345 +183,27 @@ def get_all_data():
     logger.info(f"Data fetch complete. Seasons loaded: {list(seasons_data.keys())}")
     
     return {
-        'current_schedule': schedule_df,
-        'roster': roster_df,
+        'current_schedule': results["current_schedule"],
+        'roster': results["roster"],
         'seasons': seasons_data
     }
 
-def fetch_purdue_season_schedule(season: str):
-    """Custom scraper for Purdue"""
-    url = f"https://purduesports.com/sports/mens-tennis/schedule/{season}"
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        logger.error(f"Error fetching Purdue season {season}: {e}")
-        return pd.DataFrame()
-
-    soup = BeautifulSoup(response.text, "html.parser")
-    table = soup.find("table", class_="sidearm-schedule-games-table") or soup.find("table")
-    
-    if not table:
-        logger.warning(f"No table found for Purdue season {season}")
-        return pd.DataFrame()
-
-    try:
-        start_year, end_year = season.split("-")
-        start_year = int(start_year)
-        end_year = int("20" + end_year) if len(end_year) == 2 else int(end_year)
-    except ValueError as e:
-        logger.error(f"Invalid season format {season}: {e}")
-        return pd.DataFrame()
-
-    rows = []
-    for tr in table.find_all("tr"):
-        if tr.find("th"):
-            continue
-        tds = tr.find_all("td")
-        if len(tds) < 3:
-            continue
-        
-        cells = [td.get_text(separator=" ", strip=True) for td in tds]
-        cells += [""] * (7 - len(cells))
-        
-        date_str = cells[0]
-        formatted_date = ""
-        if date_str:
-            date_str = date_str.split("(")[0].strip()
-            try:
-                date_obj = datetime.strptime(date_str, "%b %d")
-                month = date_obj.month
-                year = end_year if month <= 5 else start_year
-                date_obj = datetime(year, date_obj.month, date_obj.day)
-                formatted_date = date_obj.strftime("%m-%d-%Y")
-            except ValueError:
-                pass
-        
-        opponent = cells[3] if len(cells) > 3 else cells[1]
-        location = cells[4] if len(cells) > 4 else ""
-        result = cells[6] if len(cells) > 6 else cells[-1]
-        
-        rows.append({
-            "Date": formatted_date,
-            "Opponent": opponent,
-            "Location": location,
-            "Result": result,
-            "Season": season,
-            "Last_Updated": datetime.now().isoformat()
-        })
-    return pd.DataFrame(rows)
-
-def fetch_nebraska_season_schedule(season: str):
-    """Custom scraper for Nebraska"""
-    url = f"https://huskers.com/sports/mens-tennis/schedule/{season}"
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        logger.error(f"Error fetching Nebraska season {season}: {e}")
-        return pd.DataFrame()
-
-    soup = BeautifulSoup(response.text, "html.parser")
-    table = soup.find("table", class_="sidearm-schedule-games-table") or soup.find("table")
-    
-    if not table:
-        logger.warning(f"No table found for Nebraska season {season}")
-        return pd.DataFrame()
-
-    try:
-        start_year, end_year = season.split("-")
-        start_year = int(start_year)
-        end_year = int("20" + end_year) if len(end_year) == 2 else int(end_year)
-    except ValueError as e:
-        logger.error(f"Invalid season format {season}: {e}")
-        return pd.DataFrame()
-
-    rows = []
-    for tr in table.find_all("tr"):
-        if tr.find("th"):
-            continue
-        tds = tr.find_all("td")
-        if len(tds) < 3:
-            continue
-        
-        cells = [td.get_text(separator=" ", strip=True) for td in tds]
-        cells += [""] * (7 - len(cells))
-        
-        date_str = cells[0]
-        formatted_date = ""
-        if date_str:
-            date_str = date_str.split("(")[0].strip()
-            try:
-                date_obj = datetime.strptime(date_str, "%b %d")
-                month = date_obj.month
-                year = end_year if month <= 5 else start_year
-                date_obj = datetime(year, date_obj.month, date_obj.day)
-                formatted_date = date_obj.strftime("%m-%d-%Y")
-            except ValueError:
-                pass
-        
-        opponent = cells[3] if len(cells) > 3 else cells[1]
-        location = cells[4] if len(cells) > 4 else ""
-        result = cells[6] if len(cells) > 6 else cells[-1]
-        
-        rows.append({
-            "Date": formatted_date,
-            "Opponent": opponent,
-            "Location": location,
-            "Result": result,
-            "Season": season,
-            "Last_Updated": datetime.now().isoformat()
-        })
-    return pd.DataFrame(rows)
-
-def fetch_pennstate_season_schedule(season: str):
-    """Custom scraper for Penn State"""
-    url = f"https://gopsusports.com/sports/mens-tennis/schedule/{season}"
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        logger.error(f"Error fetching Penn State season {season}: {e}")
-        return pd.DataFrame()
-
-    soup = BeautifulSoup(response.text, "html.parser")
-    table = soup.find("table", class_="sidearm-schedule-games-table") or soup.find("table")
-    
-    if not table:
-        logger.warning(f"No table found for Penn State season {season}")
-        return pd.DataFrame()
-
-    try:
-        start_year, end_year = season.split("-")
-        start_year = int(start_year)
-        end_year = int("20" + end_year) if len(end_year) == 2 else int(end_year)
-    except ValueError as e:
-        logger.error(f"Invalid season format {season}: {e}")
-        return pd.DataFrame()
-
-    rows = []
-    for tr in table.find_all("tr"):
-        if tr.find("th"):
-            continue
-        tds = tr.find_all("td")
-        if len(tds) < 3:
-            continue
-        
-        cells = [td.get_text(separator=" ", strip=True) for td in tds]
-        cells += [""] * (7 - len(cells))
-        
-        date_str = cells[0]
-        formatted_date = ""
-        if date_str:
-            date_str = date_str.split("(")[0].strip()
-            try:
-                date_obj = datetime.strptime(date_str, "%b %d")
-                month = date_obj.month
-                year = end_year if month <= 5 else start_year
-                date_obj = datetime(year, date_obj.month, date_obj.day)
-                formatted_date = date_obj.strftime("%m-%d-%Y")
-            except ValueError:
-                pass
-        
-        opponent = cells[3] if len(cells) > 3 else cells[1]
-        location = cells[4] if len(cells) > 4 else ""
-        result = cells[6] if len(cells) > 6 else cells[-1]
-        
-        rows.append({
-            "Date": formatted_date,
-            "Opponent": opponent,
-            "Location": location,
-            "Result": result,
-            "Season": season,
-            "Last_Updated": datetime.now().isoformat()
-        })
-    return pd.DataFrame(rows)
-
-def fetch_illinois_season_schedule(season: str):
-    """Custom scraper for Illinois (Sidearm card-based schedule)"""
-    url = f"https://fightingillini.com/sports/mens-tennis/schedule/{season}"
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        logger.error(f"Error fetching Illinois season {season}: {e}")
+def fetch_school_season_schedule(school_name: str, season: str):
+    """Fetch season schedule for any school configured in schedule_parsers.SCHOOL_SCHEDULES"""
+    if school_name not in SCHOOL_SCHEDULES:
+        logger.error(f"No schedule config for {school_name}")
         return pd.DataFrame()
 
-    soup = BeautifulSoup(response.text, "html.parser")
-
+    url = schedule_url(school_name, season)
     try:
-        start_year, end_year = season.split("-")
-        start_year = int(start_year)
-        end_year = int("20" + end_year) if len(end_year) == 2 else int(end_year)
-    except ValueError as e:
-        logger.error(f"Invalid season format {season}: {e}")
-        return pd.DataFrame()
-
-    rows = []
-    for game in soup.find_all("li", class_=lambda c: c and "sidearm-schedule-game" in c):
-        # Date
-        date_tag = game.find("div", class_="sidearm-schedule-game-opponent-date")
-        date_str = date_tag.find("span").get_text(strip=True) if date_tag else ""
-        formatted_date = ""
-        if date_str:
-            date_str_clean = date_str.split("(")[0].strip()
-            try:
-                date_obj = datetime.strptime(date_str_clean, "%b %d")
-                month = date_obj.month
-                year = end_year if month <= 5 else start_year
-                formatted_date = datetime(year, month, date_obj.day).strftime("%m-%d-%Y")
-            except ValueError:
-                pass
-
-        # Opponent
-        opp_tag = game.find("div", class_="sidearm-schedule-game-opponent-name")
-        opponent = opp_tag.get_text(strip=True) if opp_tag else ""
-
-        # Location
-        loc_tag = game.find("div", class_="sidearm-schedule-game-location")
-        location = loc_tag.get_text(" ", strip=True) if loc_tag else ""
-
-        # Result from sidearm-schedule-game-result
-        result_tag = game.find("div", class_="sidearm-schedule-game-result")
-        result = ""
-        if result_tag:
-            spans = [s.get_text(strip=True) for s in result_tag.find_all("span") if s.get_text(strip=True)]
-            result = " ".join(spans).strip()
-
-        if not opponent:
-            continue
-
-        rows.append({
-            "Date": formatted_date,
-            "Opponent": opponent,
-            "Location": location,
-            "Result": result,
-            "Season": season,
-            "Last_Updated": datetime.now().isoformat()
-        })
-
-    return pd.DataFrame(rows)
-
-def fetch_school_season_schedule(base_url: str, season: str, school_name: str = None, url_format: str = "text"):
-    """Fetch season schedule for any school given their base URL"""
-    if school_name == "Purdue":
-        return fetch_purdue_season_schedule(season)
-    if school_name == "Nebraska":
-        return fetch_nebraska_season_schedule(season)
-    if school_name == "Penn State":
-        return fetch_pennstate_season_schedule(season)
-    if school_name == "Illinois":
-        return fetch_illinois_season_schedule(season)
-    
-    # Build URL based on format
-    if url_format == "text":
-        url = f"{base_url}text/{season}"
-    else:
-        url = base_url + season
-    
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = fetch_page(url)
         response.raise_for_status()
     except requests.RequestException as e:
-        logger.error(f"Error fetching season {season} from {url}: {e}")
+        logger.error(f"Error fetching {school_name} season {season} from {url}: {e}")
         return pd.DataFrame()
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    table = soup.find("table")
-
-    if not table:
-        logger.warning(f"No table found for season {season} at {url}")
-        return pd.DataFrame()
-
-    # Parse season years
-    try:
-        start_year, end_year = season.split("-")
-        start_year = int(start_year)
-        end_year = int("20" + end_year) if len(end_year) == 2 else int(end_year)
-    except ValueError as e:
-        logger.error(f"Invalid season format {season}: {e}")
-        return pd.DataFrame()
-
-    rows = []
-    for tr in table.find_all("tr")[1:]:  # Skip header
-        tds = [td.get_text(strip=True) for td in tr.find_all("td")]
-        
-        if len(tds) < 4:
-            continue
-        
-        # Pad with empty strings
-        tds += [""] * (7 - len(tds))
-
-        date_str = tds[0]
-        formatted_date = ""
-
-        if date_str:
-            # Remove day of week in parentheses if present
-            date_str = date_str.split("(")[0].strip()
-            try:
-                date_obj = datetime.strptime(date_str, "%b %d")
-                month = date_obj.month
-                
-                # Assign year based on academic calendar
-                # Jan-May = end_year, Jun-Dec = start_year
-                if month >= 1 and month <= 5:
-                    year = end_year
-                else:
-                    year = start_year
-                
-                date_obj = datetime(year, date_obj.month, date_obj.day)
-                formatted_date = date_obj.strftime("%m-%d-%Y")
-            except ValueError as e:
-                logger.warning(f"Could not parse date {date_str}: {e}")
-                formatted_date = ""
-
-        rows.append({
-            "Date": formatted_date,
-            "Opponent": tds[3],
-            "Location": tds[4], 
-            "Result": tds[6],
-            "Season": season,
-            "Last_Updated": datetime.now().isoformat()
-        })
-    
-    return pd.DataFrame(rows)
\ No newline at end of file
+    df = parse_schedule(response.text, season, SCHOOL_SCHEDULES[school_name]["layout"])
+    # a completed season's page never changes again, but only trust it once it parsed into games
+    if not df.empty and season_is_complete(season):
+        http_client.mark_immutable(url)
+    return df
@@ -0,0 +1,71 @@
+import functools
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import main
+from data_store import SnapshotStore
+
+
+def schedule(*opponents):
+    return pd.DataFrame({"Opponent": list(opponents)})
+
+
+class Loader:
+    """Returns the queued get_all_data() results in turn"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+
+    def __call__(self):
+        return self.results.pop(0)
+
+
+def test_refresh_swaps_in_a_new_snapshot():
+    store = SnapshotStore(Loader(
+        {"current_schedule": schedule("USC"), "roster": schedule("Rudy Quan"),
+         "seasons": {"2024-25": schedule("Cal")}},
+        {"current_schedule": schedule("USC", "Stanford"), "roster": schedule("Rudy Quan"),
+         "seasons": {"2025-26": schedule("Pepperdine")}},
+    ))
+    store.refresh()
+    first = store.get_data()
+    store.refresh()
+    second = store.get_data()
+
+    assert second is not first
+    assert list(first["current_schedule"]["Opponent"]) == ["USC"]
+    assert list(second["current_schedule"]["Opponent"]) == ["USC", "Stanford"]
+    assert sorted(second["seasons"]) == ["2024-25", "2025-26"]
+
+
+def test_empty_source_keeps_previous_data_and_timestamp():
+    store = SnapshotStore(Loader(
+        {"current_schedule": schedule("USC"), "roster": schedule("Rudy Quan")},
+        {"current_schedule": schedule("Stanford"), "roster": pd.DataFrame()},
+    ))
+    store.refresh()
+    roster_updated = store.status()["sources"]["roster"]
+    store.refresh()
+
+    assert list(store.get_data()["roster"]["Opponent"]) == ["Rudy Quan"]
+    assert list(store.get_data()["current_schedule"]["Opponent"]) == ["Stanford"]
+    assert store.status()["sources"]["roster"] == roster_updated
+
+
+def test_requests_before_the_first_snapshot_get_503(monkeypatch):
+    store = SnapshotStore(Loader())
+    monkeypatch.setattr(store, "get_data", functools.partial(store.get_data, timeout=0.01))
+    monkeypatch.setattr(main, "store", store)
+
+    assert store.status()["ready"] is False
+    request = Request({"type": "http", "method": "GET", "path": "/roster", "headers": []})
+    for endpoint in (lambda: main.get_roster(request), main.get_current_schedule, main.get_seasons):
+        with pytest.raises(HTTPException) as e:
+            endpoint()
+        assert e.value.status_code == 503
@@ -0,0 +1,48 @@
+"""
+Every installed parser backend must give the same roster and schedules as
+BeautifulSoup's "html.parser" on the saved pages.
+"""
+
+import os
+
+import pytest
+
+import schedule_parsers
+from html_parser import available_parsers, make_soup
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(BACKEND_DIR, "tests", "fixtures")
+FAST_PARSERS = [p for p in available_parsers() if p != "html.parser"]
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_html_parser_is_available():
+    assert "html.parser" in available_parsers()
+    assert make_soup("<p>x</p>", "html.parser").p.get_text() == "x"
+
+
+@pytest.mark.parametrize("parser", FAST_PARSERS)
+def test_roster_parity(parser):
+    scrape_all_rosters = pytest.importorskip("scrape_all_rosters")
+    html = read(os.path.join(BACKEND_DIR, "ucla_roster_debug.html"))
+    expected = scrape_all_rosters.parse_roster_html(html, "https://uclabruins.com", parser="html.parser")
+    assert expected
+    assert scrape_all_rosters.parse_roster_html(html, "https://uclabruins.com", parser=parser) == expected
+
+
+@pytest.mark.parametrize("parser", FAST_PARSERS)
+@pytest.mark.parametrize("layout", list(schedule_parsers.LAYOUTS))
+def test_schedule_parity(monkeypatch, layout, parser):
+    html = read(os.path.join(FIXTURES, f"schedule_{layout}.html"))
+
+    def parse(backend):
+        monkeypatch.setattr(schedule_parsers, "make_soup", lambda text: make_soup(text, backend))
+        return schedule_parsers.parse_schedule(html, "2025-26", layout).drop(columns="Last_Updated")
+
+    expected = parse("html.parser")
+    assert not expected.empty
+    assert parse(parser).equals(expected)
@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+import requests
+
+import http_client
+
+
+def response(body, status=200, headers=None):
+    r = requests.Response()
+    r.status_code = status
+    r._content = body
+    r.encoding = "utf-8"
+    r.headers.update(headers or {})
+    return r
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Fake http_client.get: serves `pages` (url -> Response) and records every URL requested"""
+    monkeypatch.setattr(http_client, "CACHE_DIR", str(tmp_path))
+    pages, requested = {}, []
+
+    def get(url, **kwargs):
+        requested.append(url)
+        return pages[url]
+
+    monkeypatch.setattr(http_client, "get", get)
+    return pages, requested
+
+
+def test_params_are_part_of_the_key(server):
+    pages, requested = server
+    pages["https://x.test/search?q=a"] = response(b"a")
+    pages["https://x.test/search?q=b"] = response(b"b")
+    assert http_client.cached_get("https://x.test/search", ttl=60, params={"q": "a"}).content == b"a"
+    assert http_client.cached_get("https://x.test/search", ttl=60, params={"q": "b"}).content == b"b"
+    assert http_client.cached_get("https://x.test/search?q=a", ttl=60).content == b"a"
+    assert len(requested) == 2
+
+
+def test_fresh_entry_is_served_from_disk(server):
+    pages, requested = server
+    pages["https://x.test/p"] = response(b"page")
+    http_client.cached_get("https://x.test/p", ttl=60)
+    cached = http_client.cached_get("https://x.test/p", ttl=60)
+    assert cached.content == b"page"
+    assert cached.headers["X-Cache"] == "HIT"
+    assert len(requested) == 1
+
+
+def test_stale_entry_revalidates_with_etag(server, monkeypatch):
+    pages, requested = server
+    pages["https://x.test/p"] = response(b"page", headers={"ETag": '"v1"'})
+    http_client.cached_get("https://x.test/p")
+
+    seen = {}
+
+    def not_modified(url, headers=None, **kwargs):
+        seen.update(headers or {})
+        return response(b"", status=304)
+
+    monkeypatch.setattr(http_client, "get", not_modified)
+    assert http_client.cached_get("https://x.test/p").content == b"page"
+    assert seen["If-None-Match"] == '"v1"'
+
+
+def test_cache_if_rejects_error_bodies(server):
+    pages, requested = server
+    pages["https://x.test/player/None"] = response(b'{"error": "not found"}')
+    check = lambda r: "singlesUtr" in r.json()
+    assert http_client.cached_get("https://x.test/player/None", ttl=60, cache_if=check).json() == {"error": "not found"}
+    http_client.cached_get("https://x.test/player/None", ttl=60, cache_if=check)
+    assert len(requested) == 2
+    # error statuses are never stored either
+    pages["https://x.test/down"] = response(b"oops", status=500)
+    http_client.cached_get("https://x.test/down", ttl=60)
+    http_client.cached_get("https://x.test/down", ttl=60)
+    assert requested[-2:] == ["https://x.test/down"] * 2
+
+
+def test_mark_immutable(server):
+    pages, requested = server
+    assert not http_client.mark_immutable("https://x.test/2023-24")
+    pages["https://x.test/2023-24"] = response(b"<table></table>")
+    http_client.cached_get("https://x.test/2023-24")   # ttl 0: revalidated every time
+    assert http_client.mark_immutable("https://x.test/2023-24")
+    http_client.cached_get("https://x.test/2023-24")
+    assert len(requested) == 1
+
+
+class SlowSession:
+    """Stands in for http_client.session, recording how many requests each host has open at once"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.open, self.peak = {}, {}
+
+    def get(self, url, **kwargs):
+        host = url.split("/")[2]
+        with self.lock:
+            self.open[host] = self.open.get(host, 0) + 1
+            self.peak[host] = max(self.peak.get(host, 0), self.open[host])
+        time.sleep(0.02)
+        with self.lock:
+            self.open[host] -= 1
+        return response(url.encode())
+
+
+def test_get_limits_requests_per_host(monkeypatch):
+    session = SlowSession()
+    monkeypatch.setattr(http_client, "session", session)
+    monkeypatch.setattr(http_client, "_host_limits", {})
+    monkeypatch.setattr(http_client, "MAX_PER_HOST", 2)
+
+    urls = [f"https://{host}.test/{i}" for host in ("a", "b") for i in range(8)]
+    results = http_client.fetch_all(http_client.get, urls, max_workers=16)
+
+    assert session.peak == {"a.test": 2, "b.test": 2}
+    assert [r.content for r in results.values()] == [url.encode() for url in urls]
+
+
+def test_fetch_all_stores_none_for_a_failed_item():
+    def fetch(n):
+        if n == 2:
+            raise ValueError("boom")
+        return n * 10
+
+    assert http_client.fetch_all(fetch, [1, 2, 3]) == {1: 10, 2: None, 3: 30}
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from match_index import MatchIndex, load_index, season_codes
+
+
+def results():
+    return pd.DataFrame({
+        "Event Name": ["Dual Match: UCLA vs USC", "2025 ITA Fall Nationals", "UTR Pro Tennis Tour", "Dual Match: UCLA vs Cal"],
+        "Date": ["2025-09-20", "2025-10-05", "2025-11-01", "2024-02-01"],
+        "Player1": ["A", "B", "A", "C"],
+        "Player2": ["B", "C", "D", "A"],
+        "Score": ["6-4, 6-4", "6-3, 6-3", "6-1, 6-1", "6-2, 6-2"],
+    })
+
+
+def test_season_codes():
+    dates = pd.to_datetime(["2025-07-31", "2025-08-01", "2026-05-20", None])
+    assert season_codes(dates).tolist() == [2024, 2025, 2025, -1]
+
+
+def test_player_rows_and_filters():
+    index = MatchIndex(results())
+    assert index.rows("A").tolist() == [0, 2, 3]
+    assert index.rows("A", events=("dual", "ita", "ncaa")).tolist() == [0, 3]
+    assert index.rows("A", season=2025).tolist() == [0, 2]
+    assert index.rows("Nobody").tolist() == []
+    assert index.matches("B")["Event Name"].tolist() == ["Dual Match: UCLA vs USC", "2025 ITA Fall Nationals"]
+    assert len(index.select(events=("dual", "ita", "ncaa"), season=2025)) == 2
+
+
+def test_load_index_is_shared(tmp_path):
+    path = str(tmp_path / "results.csv")
+    results().to_csv(path, index=False)
+    assert load_index(path) is load_index(path)
+    assert pd.api.types.is_datetime64_any_dtype(load_index(path).results["Date"])
@@ -0,0 +1,103 @@
+import asyncio
+import time
+
+import pytest
+
+scrape_all_rosters = pytest.importorskip("scrape_all_rosters")
+
+from scrape_all_rosters import PagePool, PWTimeout
+
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.url = None
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+        self.browser.loading(url, +1)
+        await asyncio.sleep(0.03)
+        self.browser.loading(url, -1)
+
+    async def wait_for_selector(self, selector, timeout):
+        if "slow" in self.url:
+            raise PWTimeout("selector never showed up")
+
+    async def wait_for_load_state(self, state, timeout):
+        pass
+
+    async def content(self):
+        return f"<html>{self.url}</html>"
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def new_page(self):
+        page = FakePage(self.browser)
+        self.browser.pages.append(page)
+        return page
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """Records every context and page opened, and per-host loads in flight and start times"""
+
+    def __init__(self):
+        self.contexts, self.pages = [], []
+        self.open, self.peak, self.starts = {}, {}, {}
+
+    async def new_context(self, **kwargs):
+        self.contexts.append(FakeContext(self))
+        return self.contexts[-1]
+
+    def loading(self, url, delta):
+        host = url.split("/")[2]
+        if delta > 0:
+            self.starts.setdefault(host, []).append(time.monotonic())
+        self.open[host] = self.open.get(host, 0) + delta
+        self.peak[host] = max(self.peak.get(host, 0), self.open[host])
+
+
+@pytest.fixture(autouse=True)
+def short_delay(monkeypatch):
+    monkeypatch.setattr(scrape_all_rosters, "PER_DOMAIN_DELAY", 0.01)
+
+
+def run(browser, urls, **kwargs):
+    async def go():
+        async with PagePool(browser, **kwargs) as pool:
+            pages = await asyncio.gather(*(pool.fetch(url, "tr") for url in urls))
+            return pages, pool._pages.qsize()
+    return asyncio.run(go())
+
+
+def test_pool_opens_a_fixed_set_of_pages_and_closes_its_contexts():
+    browser = FakeBrowser()
+    urls = [f"https://{host}.test/{i}" for host in ("a", "b", "c") for i in range(4)]
+    pages, idle = run(browser, urls, contexts=2, pages_per_context=3)
+
+    assert pages == [f"<html>{url}</html>" for url in urls]
+    assert len(browser.pages) == 6 and idle == 6
+    assert [ctx.closed for ctx in browser.contexts] == [True, True]
+
+
+def test_per_domain_limit_and_spacing():
+    browser = FakeBrowser()
+    run(browser, [f"https://{host}.test/{i}" for host in ("a", "b") for i in range(4)], contexts=4, pages_per_context=2)
+
+    assert browser.peak == {"a.test": scrape_all_rosters.PER_DOMAIN_PAGES, "b.test": scrape_all_rosters.PER_DOMAIN_PAGES}
+    for starts in browser.starts.values():
+        gaps = [b - a for a, b in zip(starts, starts[1:])]
+        assert min(gaps) >= 0.01 - 0.002
+
+
+def test_selector_timeout_still_returns_the_page():
+    browser = FakeBrowser()
+    pages, idle = run(browser, ["https://a.test/slow"], contexts=1, pages_per_context=1)
+    assert pages == ["<html>https://a.test/slow</html>"]
+    assert idle == 1
@@ -0,0 +1,74 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from starlette.requests import Request
+
+from response_cache import ResponseCache, file_key, json_response, serialize
+
+
+def request(if_none_match=None):
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_builds_once_per_key():
+    cache, calls = ResponseCache(), []
+
+    def build():
+        calls.append(1)
+        return {"players": ["Rudy Quan"]}
+
+    body, etag = cache.get("roster", 1, build)
+    assert cache.get("roster", 1, build) == (body, etag)
+    assert len(calls) == 1
+    assert json.loads(body) == {"players": ["Rudy Quan"]}
+
+    cache.get("roster", 2, build)
+    assert len(calls) == 2
+
+
+def test_etag_follows_content():
+    cache = ResponseCache()
+    _, etag = cache.get("a", 1, lambda: [1, 2])
+    _, same = cache.get("b", 1, lambda: [1, 2])
+    _, other = cache.get("a", 2, lambda: [1, 3])
+    assert etag == same != other
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_serialize_matches_json_response():
+    from fastapi.responses import JSONResponse
+    content = {"Player": "Emon van Loben Sels", "UTR": 13.4, "Hometown": "São Paulo", "Year": None}
+    assert serialize(content) == JSONResponse(content).body
+
+
+def test_200_then_304():
+    body, etag = ResponseCache().get("roster", 1, lambda: {"ok": True})
+
+    first = json_response(request(), body, etag)
+    assert first.status_code == 200
+    assert first.body == body
+    assert first.headers["etag"] == etag
+    assert first.media_type == "application/json"
+
+    for header in (etag, f'"stale", {etag}', "*"):
+        again = json_response(request(header), body, etag)
+        assert again.status_code == 304
+        assert again.body == b""
+        assert again.headers["etag"] == etag
+
+    assert json_response(request('"stale"'), body, etag).status_code == 200
+
+
+def test_file_key_changes_when_file_is_replaced(tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_text("Player\nA\n")
+    key = file_key(path)
+    assert file_key(path) == key
+    path.write_text("Player\nA\nB\n")
+    os.utime(path, ns=(key[1] + 1, key[1] + 1))
+    assert file_key(path) != key
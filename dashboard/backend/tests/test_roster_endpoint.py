@@ -0,0 +1,53 @@
+import json
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("pyarrow")
+
+from starlette.requests import Request
+
+import main
+import roster_store
+
+
+class EmptyStore:
+    """Snapshot with no roster yet, so /roster reads the UCLA file itself"""
+
+    def get_data(self):
+        return {}
+
+
+@pytest.fixture
+def rosters_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "store", EmptyStore())
+    monkeypatch.setattr(roster_store.roster_path, "__defaults__", (str(tmp_path),))
+    monkeypatch.setattr(roster_store.read_roster, "__defaults__", (str(tmp_path),))
+    main.roster_cache.clear()
+    yield tmp_path
+    main.roster_cache.clear()
+
+
+def get_roster():
+    request = Request({"type": "http", "method": "GET", "path": "/roster", "headers": []})
+    return json.loads(main.get_roster(request).body)
+
+
+@pytest.mark.parametrize("combined", [False, True])
+def test_blank_fields_are_na(rosters_dir, combined):
+    roster_store.write_roster("ucla", pd.DataFrame({
+        "Player": ["Rudy Quan", "Spencer Johnson"],
+        "Year": ["Sr", None],
+        "Hometown": [None, "Dallas, TX"],
+        "UTR": [14.1, 13.5],
+        "Notes": [None, None],
+    }), rosters_dir)
+    if combined:
+        assert roster_store.build_combined(rosters_dir)
+
+    assert get_roster() == [
+        {"Player": "Rudy Quan", "Year": "Sr", "Hometown": "N/A", "UTR": 14.1, "Notes": "N/A"},
+        {"Player": "Spencer Johnson", "Year": "N/A", "Hometown": "Dallas, TX", "UTR": 13.5,
+         "Notes": "N/A"},
+    ]
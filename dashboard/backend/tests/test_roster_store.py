@@ -0,0 +1,60 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import roster_store
+
+pytest.importorskip("pyarrow")
+
+ROSTERS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rosters")
+
+
+def write(rosters_dir, key, df):
+    df.to_csv(roster_store.roster_path(key, rosters_dir), index=False)
+
+
+def assert_matches_csv(key, rosters_dir):
+    expected = pd.read_csv(roster_store.roster_path(key, rosters_dir))
+    pd.testing.assert_frame_equal(roster_store.read_roster(key, rosters_dir), expected)
+
+
+def test_read_roster_keeps_each_schools_types(tmp_path):
+    write(tmp_path, "numeric", pd.DataFrame({
+        "Player": ["A", "B"], "UTR": [13.4, 12.0], "Year": [None, None], "Rank": [1, 2],
+    }))
+    write(tmp_path, "text", pd.DataFrame({
+        "Player": ["C", "D"], "UTR": ["Unrated", "11.2"], "Year": ["Fr", "So"], "Rank": [1.5, None],
+    }))
+    assert roster_store.build_combined(tmp_path)
+
+    numeric = roster_store.read_roster("numeric", tmp_path)
+    assert numeric["UTR"].dtype == "float64"
+    assert numeric["Rank"].dtype == "int64"
+    assert_matches_csv("numeric", tmp_path)
+    assert_matches_csv("text", tmp_path)
+
+
+def test_read_roster_matches_csv_for_every_school(tmp_path):
+    for key in roster_store.school_keys(ROSTERS):
+        shutil.copy(roster_store.roster_path(key, ROSTERS), tmp_path)
+    assert roster_store.build_combined(tmp_path)
+    for key in roster_store.school_keys(tmp_path):
+        assert_matches_csv(key, tmp_path)
+
+
+def test_newer_csv_is_read_instead_of_combined(tmp_path):
+    write(tmp_path, "school", pd.DataFrame({"Player": ["A"], "UTR": [10.0]}))
+    roster_store.build_combined(tmp_path)
+    arrow_mtime = os.stat(tmp_path / roster_store.COMBINED_ARROW).st_mtime_ns
+
+    write(tmp_path, "school", pd.DataFrame({"Player": ["A", "B"], "UTR": [10.0, 11.0]}))
+    os.utime(roster_store.roster_path("school", tmp_path), ns=(arrow_mtime + 1, arrow_mtime + 1))
+    assert len(roster_store.read_roster("school", tmp_path)) == 2
+
+
+def test_unchanged_write_is_skipped(tmp_path):
+    df = pd.DataFrame({"Player": ["A"], "UTR": [10.0]})
+    assert roster_store.write_roster("school", df, tmp_path)
+    assert not roster_store.write_roster("school", df, tmp_path)
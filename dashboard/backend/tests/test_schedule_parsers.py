@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+import schedule_parsers
+from schedule_parsers import format_date, parse_schedule, schedule_url, season_years
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def parse_fixture(layout):
+    with open(os.path.join(FIXTURES, f"schedule_{layout}.html"), encoding="utf-8") as f:
+        df = parse_schedule(f.read(), "2025-26", layout)
+    assert list(df.columns) == ["Date", "Opponent", "Location", "Result", "Season", "Last_Updated"]
+    assert (df["Season"] == "2025-26").all()
+    return df.drop(columns=["Season", "Last_Updated"]).to_dict("records")
+
+
+def test_season_years():
+    assert season_years("2025-26") == (2025, 2026)
+    assert season_years("2025-2026") == (2025, 2026)
+    with pytest.raises(ValueError):
+        season_years("2025")
+
+
+@pytest.mark.parametrize("date_str, expected", [
+    ("Feb 14 (Sat)", "02-14-2026"),   # Jan-May: end year
+    ("May 31", "05-31-2026"),
+    ("Jun 1", "06-01-2025"),          # Jun-Dec: start year
+    ("Sep 26 (Fri)", "09-26-2025"),
+    ("TBA", ""),
+    ("", ""),
+])
+def test_format_date(date_str, expected):
+    assert format_date(date_str, 2025, 2026) == expected
+
+
+def test_schedule_url():
+    assert schedule_url("UCLA", "2025-26") == "https://uclabruins.com/sports/mens-tennis/schedule/text/2025-26"
+    assert schedule_url("Purdue", "2025-26") == "https://purduesports.com/sports/mens-tennis/schedule/2025-26"
+
+
+def test_every_school_has_a_known_layout():
+    for config in schedule_parsers.SCHOOL_SCHEDULES.values():
+        assert config["layout"] in schedule_parsers.LAYOUTS
+        assert config["base_url"].endswith("/schedule/")
+
+
+def test_text_layout():
+    # header row skipped, short rows skipped, a <th> inside a row is ignored
+    assert parse_fixture("text") == [
+        {"Date": "01-17-2026", "Opponent": "Pepperdine", "Location": "Los Angeles, Calif.", "Result": "W, 4-1"},
+        {"Date": "02-14-2026", "Opponent": "Stanford", "Location": "Stanford, Calif.", "Result": "L, 3-4"},
+        {"Date": "03-06-2026", "Opponent": "Ohio State", "Location": "Columbus, Ohio", "Result": ""},
+        {"Date": "09-26-2025", "Opponent": "Bruin Fall Invitational", "Location": "Los Angeles, Calif.", "Result": ""},
+    ]
+
+
+def test_table_layout():
+    # the games table is used even though another table comes first
+    assert parse_fixture("table") == [
+        {"Date": "01-24-2026", "Opponent": "Notre Dame", "Location": "West Lafayette, Ind.", "Result": "W 4-2"},
+        {"Date": "04-12-2026", "Opponent": "Nebraska", "Location": "", "Result": ""},
+        {"Date": "10-03-2025", "Opponent": "Midwest Regional", "Location": "Champaign, Ill.", "Result": ""},
+    ]
+
+
+def test_card_layout():
+    # cards without an opponent are skipped
+    assert parse_fixture("card") == [
+        {"Date": "01-31-2026", "Opponent": "DePaul", "Location": "Urbana, Ill.", "Result": "W, 7-0"},
+        {"Date": "03-20-2026", "Opponent": "Michigan", "Location": "Ann Arbor, Mich.", "Result": ""},
+        {"Date": "", "Opponent": "Big Ten Championships", "Location": "Columbus, Ohio", "Result": ""},
+    ]
+
+
+def test_page_without_a_table():
+    assert parse_schedule("<html><body><p>No games</p></body></html>", "2025-26", "text").empty
+
+
+def test_bad_season():
+    assert parse_schedule("<table></table>", "2025", "text").empty
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from scores import parse_scores, set_games, winners
+
+
+def parse(*scores, index=None):
+    return parse_scores(pd.Series(scores, index=index, dtype=object))
+
+
+def test_straight_sets_and_tiebreaks():
+    parsed = parse("6-4, 7-6(5)", "3-6, 6(4)-7")
+    assert parsed["p1_sets"].tolist() == [2, 0]
+    assert parsed["p2_sets"].tolist() == [0, 2]
+    assert parsed["p1_games"].tolist() == [13, 9]
+    assert parsed["tiebreaks"].tolist() == [1, 1]
+    assert parsed["winner"].tolist() == [1, 2]
+
+
+def test_match_tiebreak_counts_as_a_set():
+    parsed = parse("6-3, 3-6, 1-0(8)")
+    assert parsed["sets_played"].tolist() == [3]
+    assert parsed["winner"].tolist() == [1]
+
+
+def test_none_is_zero_games():
+    parsed = parse("None-6, 6-4, 6-4", "6-None, 6-None")
+    assert parsed["p1_games"].tolist() == [12, 12]
+    assert parsed["winner"].tolist() == [1, 1]
+
+
+def test_retired_and_unfinished():
+    parsed = parse("6-4, 2-1 RET", "6-4, 3-3 UF", "6-4, 3-3", "W/O")
+    assert parsed["retired"].tolist() == [True, False, False, True]
+    assert parsed["unfinished"].tolist() == [False, True, True, False]
+    # a retirement is decided by the sets; a level last set with no retirement has no winner
+    assert parsed["winner"].tolist() == [1, 0, 0, 0]
+
+
+def test_missing_and_empty_scores():
+    parsed = parse(None, np.nan, "", "n/a")
+    assert parsed["sets_played"].tolist() == [0, 0, 0, 0]
+    assert parsed["winner"].tolist() == [0, 0, 0, 0]
+
+
+def test_keeps_index_even_with_duplicate_labels():
+    parsed = parse("6-4, 6-4", "4-6, 4-6", "6-1, 6-1", index=[5, 5, 2])
+    assert parsed.index.tolist() == [5, 5, 2]
+    assert parsed["winner"].tolist() == [1, 2, 1]
+
+
+def test_empty_series():
+    parsed = parse_scores(pd.Series([], dtype=object))
+    assert parsed.empty
+    assert "winner" in parsed.columns
+
+
+def test_set_games():
+    games = set_games(pd.Series(["6-4, 3-6, 1-0(5)", None], index=[1, 1]))
+    assert games.shape == (2, 5, 2)
+    assert games[0, :3].tolist() == [[6, 4], [3, 6], [1, 0]]
+    assert (games[0, 3:] == -1).all()
+    assert (games[1] == -1).all()
+
+
+def test_winners():
+    data = pd.DataFrame({
+        "Player1": ["A", "C", "E"],
+        "Player2": ["B", "D", "F"],
+        "Score": ["6-4, 6-4", "4-6, 4-6", "6-4, 3-3"],
+    })
+    names = winners(data)
+    assert names[:2].tolist() == ["A", "D"]
+    assert pd.isna(names[2])
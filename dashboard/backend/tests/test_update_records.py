@@ -0,0 +1,44 @@
+import pandas as pd
+
+import roster_store
+from match_index import MatchIndex
+from update_records import compute_all_records, update_rosters
+
+
+def index(*matches):
+    return MatchIndex(pd.DataFrame(matches, columns=["Event Name", "Date", "Player1", "Player2", "Score"]))
+
+
+def test_records_count_every_set_of_a_comma_separated_score():
+    records = compute_all_records(index(
+        ("Dual Match: UCLA vs USC", "2026-02-01", "Rudy Quan", "Stefan Dostanic", "6-4, 3-6, 6-2"),
+        ("Dual Match: UCLA vs Cal", "2026-02-08", "Rudy Quan", "Max Exsted", "7-6(5), 6-7(3), 10-8"),
+        # retired mid-set: one set each, so no winner. The old whitespace split
+        # ignored "6-4," and scored this as a win for Player2 on "2-3" alone.
+        ("Dual Match: UCLA vs Stanford", "2026-02-15", "Rudy Quan", "Nick Dessy", "6-4, 2-3"),
+    ))
+    assert records.loc["Rudy Quan"].tolist() == ["2-0", "2-0"]
+    assert records.loc["Stefan Dostanic"].tolist() == ["0-1", "0-1"]
+    assert "Nick Dessy" not in records.index
+
+
+def test_conference_window_and_event_filter():
+    records = compute_all_records(index(
+        ("2025 ITA Fall Nationals", "2025-11-05", "Rudy Quan", "Ozan Baris", "6-3, 6-4"),
+        ("Dual Match: UCLA vs USC", "2026-03-01", "Ozan Baris", "Rudy Quan", "6-3, 6-4"),
+        ("2026 NCAA Division I Championships", "2026-05-20", "Rudy Quan", "Ozan Baris", "6-3, 6-4"),
+        ("UTR Pro Tennis Tour", "2026-02-01", "Rudy Quan", "Ozan Baris", "6-0, 6-0"),
+        ("Dual Match: UCLA vs USC", "2025-03-01", "Rudy Quan", "Ozan Baris", "6-0, 6-0"),
+    ))
+    assert records.loc["Rudy Quan"].tolist() == ["2-1", "1-1"]
+    assert records.loc["Ozan Baris"].tolist() == ["1-2", "1-1"]
+
+
+def test_update_rosters_fills_missing_players_with_0_0(tmp_path):
+    roster_store.write_roster("ucla", pd.DataFrame({"Player": ["Rudy Quan ", "Kaylan Bigun"]}), tmp_path)
+    records = pd.DataFrame({"Overall_Record": ["5-2"], "Conference_Record": ["3-1"]}, index=["Rudy Quan"])
+
+    update_rosters(records, school_keys=["ucla", "usc"], rosters_dir=tmp_path)
+    roster = pd.read_csv(roster_store.roster_path("ucla", tmp_path))
+    assert roster["Overall_Record"].tolist() == ["5-2", "0-0"]
+    assert roster["Conference_Record"].tolist() == ["3-1", "0-0"]
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from utr_cache import UTRCache, normalize_name
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return UTRCache(str(tmp_path / "utr_cache.sqlite3"))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """time.time() that the test moves forward by hand"""
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+def test_normalize_name():
+    assert normalize_name("Émon van Loben-Sels") == "emonvanlobensels"
+    assert normalize_name("") == ""
+
+
+def test_entries_expire_after_their_ttl(cache, clock):
+    cache.set_id("Rudy Quan", 101)
+    cache.set_rating(101, 14.1)
+    cache.set_history(101, [{"date": "2025-01-06", "rating": 14.0}])
+
+    clock[0] += 60
+    assert cache.get_id("rudy quan", ttl=120) == "101"
+    assert cache.get_rating(101, ttl=120) == 14.1
+    assert cache.get_history(101, ttl=120) == [{"date": "2025-01-06", "rating": 14.0}]
+
+    clock[0] += 120
+    assert cache.get_id("Rudy Quan", ttl=120) is None
+    assert cache.get_rating(101, ttl=120) is None
+    assert cache.get_history(101, ttl=120) is None
+
+
+def test_rating_and_history_are_kept_separately(cache):
+    cache.set_history(101, [])
+    assert cache.get_rating(101) is None
+    cache.set_rating(101, "Unrated")
+    assert cache.get_rating(101) == "Unrated"
+    assert cache.get_history(101) == []
+
+
+def test_school_entry_is_tried_before_the_name_only_one(cache):
+    cache.set_id("Andy Nguyen", 1)
+    cache.set_id("Andy Nguyen", 2, school="UCLA Bruins")
+    assert cache.get_id("Andy Nguyen", school="UCLA Bruins") == "2"
+    assert cache.get_id("Andy Nguyen", school="USC Trojans") == "1"
+    assert cache.get_id("Andy Nguyen") == "1"
+
+
+def test_pinned_id_never_expires_or_gets_overwritten(cache, clock):
+    cache.pin("Andy Nguyen", 1234567, school="UCLA Bruins")
+    cache.set_id("Andy Nguyen", 999, school="UCLA Bruins")
+    clock[0] += 365 * 24 * 3600
+    assert cache.get_id("Andy Nguyen", school="UCLA Bruins") == "1234567"
+
+    cache.unpin("Andy Nguyen", school="UCLA Bruins")
+    assert cache.get_id("Andy Nguyen", school="UCLA Bruins") is None
+    cache.set_id("Andy Nguyen", 999, school="UCLA Bruins")
+    assert cache.get_id("Andy Nguyen", school="UCLA Bruins") == "999"
+
+
+def test_entries_survive_a_reopen(tmp_path):
+    path = str(tmp_path / "utr_cache.sqlite3")
+    UTRCache(path).set_id("Rudy Quan", 101)
+    assert UTRCache(path).get_id("Rudy Quan") == "101"
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+import http_client
+import utr_client
+from utr_cache import UTRCache
+from utr_client import AsyncUTRClient, TokenBucket
+
+
+def response(data, status=200, headers=None):
+    r = requests.Response()
+    r.status_code = status
+    r._content = json.dumps(data).encode()
+    r.headers.update(headers or {})
+    return r
+
+
+class FakeUTR:
+    """Stands in for http_client.get: players by name, queued failures, and requests in flight"""
+
+    def __init__(self, players):
+        self.players = players            # name -> (id, singlesUtr)
+        self.failures = []                # responses returned before the real answer
+        self.requested = []
+        self.lock = threading.Lock()
+        self.open = self.peak = 0
+
+    def get(self, url, params=None, **kwargs):
+        with self.lock:
+            self.requested.append(url)
+            self.open += 1
+            self.peak = max(self.peak, self.open)
+        time.sleep(0.01)
+        with self.lock:
+            self.open -= 1
+            if self.failures:
+                return self.failures.pop(0)
+        if url == utr_client.SEARCH_URL:
+            pid = self.players[params["query"]][0]
+            return response({"hits": [{"id": pid}]})
+        pid = url.rsplit("/", 1)[1]
+        utr = next(u for i, u in self.players.values() if str(i) == pid)
+        return response({"singlesUtr": utr})
+
+
+@pytest.fixture
+def utr(monkeypatch):
+    fake = FakeUTR({"Rudy Quan": (101, 14.1), "Spencer Johnson": (102, 13.5), "Kaylan Bigun": (103, 14.8)})
+    monkeypatch.setattr(http_client, "get", fake.get)
+    monkeypatch.setattr(utr_client, "BACKOFF_BASE", 0.01)
+    return fake
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return UTRCache(str(tmp_path / "utr_cache.sqlite3"))
+
+
+def test_lookup_many_keeps_order_and_fills_the_cache(utr, cache):
+    client = AsyncUTRClient(cache=cache)
+    players = [("Kaylan Bigun", ""), ("Rudy Quan", ""), ("Nobody", "")]
+    assert asyncio.run(client.lookup_many(players)) == [
+        ("14.8", utr_client.PROFILE_URL.format(pid=103)),
+        ("14.1", utr_client.PROFILE_URL.format(pid=101)),
+        ("N/A", "N/A"),
+    ]
+    assert cache.get_id("Rudy Quan") == "101"
+
+    utr.requested.clear()
+    asyncio.run(AsyncUTRClient(cache=cache).lookup("Rudy Quan"))
+    assert utr.requested == []
+
+
+def test_transient_errors_are_retried(utr, cache):
+    utr.failures += [response({}, 429, {"Retry-After": "0"}), response({}, 503)]
+    client = AsyncUTRClient(cache=cache)
+    assert asyncio.run(client.lookup("Spencer Johnson")) == ("13.5", utr_client.PROFILE_URL.format(pid=102))
+    assert len(utr.requested) == 4
+
+
+def test_requests_in_flight_are_capped(utr, cache):
+    client = AsyncUTRClient(cache=cache, rate=1000, burst=100, concurrency=2)
+    asyncio.run(client.lookup_many([(name, "") for name in utr.players] * 3))
+    assert utr.peak == 2
+
+
+def test_token_bucket_limits_the_rate():
+    async def take(n):
+        bucket = TokenBucket(rate=50, capacity=2)
+        started = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(take(2)) < 0.02
+    assert asyncio.run(take(7)) >= 5 / 50 - 0.01
@@ -1,94 +1,93 @@
 import pandas as pd
+import numpy as np
 import os
+import argparse
+
+from match_index import load_index, COLLEGE_EVENTS
+from scores import parse_scores
+import roster_store
 
 # ── Config ────────────────────────────────────────────────────────────────────
 CONF_START = pd.Timestamp('2026-01-01')
 CONF_END   = pd.Timestamp('2026-05-31')
+SEASON     = 2025  # 2025-26 dual matches, ITA and NCAA events
 
-# ── Load data ─────────────────────────────────────────────────────────────────
-mens_results = pd.read_csv('C:\\Users\\emmal\\OneDrive\\Desktop\\scounting_strategy_yr2526\\dashboard\\backend\\match_results.csv')
-mens_results['Date'] = pd.to_datetime(mens_results['Date'])
-
-# ── Helpers ───────────────────────────────────────────────────────────────────
-def count_sets_won(score):
-    if not isinstance(score, str) or not score.strip():
-        return 0, 0
-    p1, p2 = 0, 0
-    for set_score in score.split():
-        parts = set_score.split('-')
-        if len(parts) != 2:
-            continue
-        try:
-            a, b = int(parts[0]), int(parts[1].split('(')[0])
-            if a > b:
-                p1 += 1
-            elif b > a:
-                p2 += 1
-        except ValueError:
-            continue
-    return p1, p2
-
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(SCRIPT_DIR, 'match_results.csv')
+ROSTERS_DIR = roster_store.ROSTERS_DIR
 
-def get_winner(row):
-    p1_sets = row.get('player1_sets', 0)
-    p2_sets = row.get('player2_sets', 0)
-    if p1_sets == p2_sets:
-        return 'Unfinished'
-    return row['Player1'] if p1_sets > p2_sets else row['Player2']
-
-
-def filter_player(data, player_name):
-    data = data[(data['Player1'] == player_name) | (data['Player2'] == player_name)]
-    data = data[data['Event Name'].str.startswith(
-        ('Dual Match', '2025 ITA', '2025-26 NCAA Division'), na=False
-    )]
-    data = data[data['Date'] > '2025-08-01']
-    return data
+SCHOOL_KEYS = [
+    "ucla", "usc", "michigan", "ohio_state", "penn_state",
+    "indiana", "illinois", "northwestern", "purdue",
+    "wisconsin", "nebraska", "michigan_state",
+]
 
 
-def compute_records(player_name):
-    player_matches = filter_player(mens_results, player_name)
+# ── Helpers ───────────────────────────────────────────────────────────────────
+def player_results(data):
+    """
+    Long table with one row per (player, match): player, date, won, finished.
+    A match is finished when the score has a winner (see scores.parse_scores).
+    """
+    winner = parse_scores(data['Score'])['winner'].to_numpy()
+    finished = winner != 0
+    return pd.DataFrame({
+        'player': np.concatenate([data['Player1'].to_numpy(), data['Player2'].to_numpy()]),
+        'date': np.concatenate([data['Date'].to_numpy()] * 2),
+        'won': np.concatenate([winner == 1, winner == 2]),
+        'finished': np.concatenate([finished, finished]),
+    })
+
+
+def compute_all_records(index):
+    """
+    Overall and conference W-L for every player in a MatchIndex, in one pass.
+    Returns a DataFrame indexed by player with 'Overall_Record' and 'Conference_Record'.
+    """
+    long = player_results(index.select(events=COLLEGE_EVENTS, season=SEASON))
+    long = long[long['finished']]
+    long['lost'] = ~long['won']
+    long['conf'] = (long['date'] >= CONF_START) & (long['date'] <= CONF_END)
+
+    overall = long.groupby('player')[['won', 'lost']].sum()
+    conf = long[long['conf']].groupby('player')[['won', 'lost']].sum().reindex(overall.index, fill_value=0)
+    return pd.DataFrame({
+        'Overall_Record': overall['won'].astype(str) + '-' + overall['lost'].astype(str),
+        'Conference_Record': conf['won'].astype(str) + '-' + conf['lost'].astype(str),
+    })
+
+
+def update_rosters(records, school_keys=SCHOOL_KEYS, rosters_dir=ROSTERS_DIR):
+    """
+    Write each roster's Overall_Record / Conference_Record columns ("0-0" for players
+    without matches), then rebuild the combined roster file the API reads once.
+    """
+    for school_key in school_keys:
+        roster_path = roster_store.roster_path(school_key, rosters_dir)
+        if not os.path.exists(roster_path):
+            print(f"[SKIP] {roster_path} not found")
+            continue
 
-    if player_matches.empty:
-        return "0-0", "0-0"
+        roster_df = pd.read_csv(roster_path)
+        results = records.reindex(roster_df['Player'].str.strip()).fillna('0-0')
 
-    df = player_matches.copy()
-    df[['player1_sets', 'player2_sets']] = (
-        df['Score'].apply(count_sets_won).apply(pd.Series)
-    )
-    df['result'] = df.apply(get_winner, axis=1)
-    conf = df[(df['Date'] >= CONF_START) & (df['Date'] <= CONF_END)]
+        roster_df['Overall_Record']    = results['Overall_Record'].to_numpy()
+        roster_df['Conference_Record'] = results['Conference_Record'].to_numpy()
 
-    ow = int((df['result'] == player_name).sum())
-    ol = int(((df['result'] != player_name) & (df['result'] != 'Unfinished')).sum())
-    cw = int((conf['result'] == player_name).sum())
-    cl = int(((conf['result'] != player_name) & (conf['result'] != 'Unfinished')).sum())
+        if roster_store.write_roster(school_key, roster_df, rosters_dir):
+            print(f"Saved -> {roster_path}")
+        else:
+            print(f"Unchanged {roster_path}")
 
-    return f"{ow}-{ol}", f"{cw}-{cl}"
+    if roster_store.build_combined(rosters_dir):
+        print(f"Saved -> {os.path.join(rosters_dir, roster_store.COMBINED_ARROW)}")
 
 
 # ── Apply to every player ─────────────────────────────────────────────────────
-SCHOOL_KEYS = [
-    "ucla", "usc", "michigan", "ohio_state", "penn_state",
-    "indiana", "illinois", "northwestern", "purdue",
-    "wisconsin", "nebraska", "michigan_state",
-]
-
-for school_key in SCHOOL_KEYS:
-    roster_path = f"C:\\Users\\emmal\\OneDrive\\Desktop\\scounting_strategy_yr2526\\dashboard\\backend\\rosters\\{school_key}_roster.csv"
-    if not os.path.exists(roster_path):
-        print(f"[SKIP] {roster_path} not found")
-        continue
-
-    roster_df = pd.read_csv(roster_path)
-    
-    results = roster_df['Player'].apply(lambda name: pd.Series(
-        compute_records(name.strip()),
-        index=['Overall_Record', 'Conference_Record']
-    ))
-
-    roster_df['Overall_Record']    = results['Overall_Record']
-    roster_df['Conference_Record'] = results['Conference_Record']
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill roster W-L records from match results")
+    parser.add_argument("--results", default=RESULTS_PATH, help="match results CSV (default: match_results.csv here)")
+    parser.add_argument("--rosters", default=ROSTERS_DIR, help="folder with <school>_roster.csv files")
+    args = parser.parse_args()
 
-    roster_df.to_csv(roster_path, index=False)
-    print(f"Saved -> {roster_path}")
\ No newline at end of file
+    update_rosters(compute_all_records(load_index(args.results)), rosters_dir=args.rosters)
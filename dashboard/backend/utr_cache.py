@@ -0,0 +1,186 @@
+"""
+Persistent UTR lookup cache shared by scrape_all_rosters.py and
+data/match_scraper.py.
+
+    name (+ optional school)  ->  UTR player id
+    UTR player id             ->  current singles rating, rating history
+
+Entries expire after their TTL so re-runs only hit UTR for new or stale
+players. Ambiguous names can be pinned to a specific id by hand; pinned
+entries never expire and are never overwritten by a search:
+
+    python utr_cache.py pin "Andy Nguyen" 1234567 --school "UCLA Bruins"
+    python utr_cache.py unpin "Andy Nguyen" --school "UCLA Bruins"
+    python utr_cache.py show "Andy Nguyen"
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+DB_PATH = os.environ.get(
+    "UTR_CACHE_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "utr_cache.sqlite3"),
+)
+
+ID_TTL      = 30 * 24 * 3600   # name -> id
+RATING_TTL  = 24 * 3600        # current singles rating
+HISTORY_TTL = 7 * 24 * 3600    # weekly rating history
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS player_ids (
+    name       TEXT NOT NULL,
+    school     TEXT NOT NULL DEFAULT '',
+    utr_id     TEXT NOT NULL,
+    pinned     INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (name, school)
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    utr_id             TEXT PRIMARY KEY,
+    rating             TEXT,
+    rating_updated_at  REAL,
+    history            TEXT,
+    history_updated_at REAL
+);
+"""
+
+
+def normalize_name(name: str) -> str:
+    """'Émon van Loben-Sels' -> 'emonvanlobensels'"""
+    if not name:
+        return ""
+    nfkd = unicodedata.normalize("NFKD", name)
+    ascii_name = "".join(c for c in nfkd if not unicodedata.combining(c))
+    return re.sub(r"[^a-z]", "", ascii_name.lower())
+
+
+class UTRCache:
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _query(self, sql: str, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _write(self, sql: str, params=()):
+        with self._lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    # ── name -> id ───────────────────────────────────────────────────────────
+    def get_id(self, name: str, school: str = "", ttl: float = ID_TTL):
+        """Cached UTR id for a name (school-specific entry first, then name only)"""
+        now = time.time()
+        for key_school in ([normalize_name(school), ""] if school else [""]):
+            row = self._query(
+                "SELECT utr_id, pinned, updated_at FROM player_ids WHERE name = ? AND school = ?",
+                (normalize_name(name), key_school),
+            )
+            if row and (row[1] or now - row[2] < ttl):
+                return row[0]
+        return None
+
+    def set_id(self, name: str, utr_id, school: str = ""):
+        """Store a searched id; never overwrites a pinned entry"""
+        self._write(
+            """INSERT INTO player_ids (name, school, utr_id, pinned, updated_at)
+               VALUES (?, ?, ?, 0, ?)
+               ON CONFLICT(name, school) DO UPDATE
+               SET utr_id = excluded.utr_id, updated_at = excluded.updated_at
+               WHERE pinned = 0""",
+            (normalize_name(name), normalize_name(school), str(utr_id), time.time()),
+        )
+
+    def pin(self, name: str, utr_id, school: str = ""):
+        """Manually map an ambiguous name to a specific UTR id"""
+        self._write(
+            """INSERT OR REPLACE INTO player_ids (name, school, utr_id, pinned, updated_at)
+               VALUES (?, ?, ?, 1, ?)""",
+            (normalize_name(name), normalize_name(school), str(utr_id), time.time()),
+        )
+
+    def unpin(self, name: str, school: str = ""):
+        self._write(
+            "DELETE FROM player_ids WHERE name = ? AND school = ?",
+            (normalize_name(name), normalize_name(school)),
+        )
+
+    # ── id -> rating / history ───────────────────────────────────────────────
+    def get_rating(self, utr_id, ttl: float = RATING_TTL):
+        row = self._query("SELECT rating, rating_updated_at FROM ratings WHERE utr_id = ?", (str(utr_id),))
+        if row and row[1] is not None and time.time() - row[1] < ttl:
+            return json.loads(row[0])
+        return None
+
+    def set_rating(self, utr_id, rating):
+        self._write(
+            """INSERT INTO ratings (utr_id, rating, rating_updated_at) VALUES (?, ?, ?)
+               ON CONFLICT(utr_id) DO UPDATE
+               SET rating = excluded.rating, rating_updated_at = excluded.rating_updated_at""",
+            (str(utr_id), json.dumps(rating), time.time()),
+        )
+
+    def get_history(self, utr_id, ttl: float = HISTORY_TTL):
+        """Cached list of {'date', 'rating'} weeks, or None if missing/stale"""
+        row = self._query("SELECT history, history_updated_at FROM ratings WHERE utr_id = ?", (str(utr_id),))
+        if row and row[1] is not None and time.time() - row[1] < ttl:
+            return json.loads(row[0])
+        return None
+
+    def set_history(self, utr_id, history):
+        self._write(
+            """INSERT INTO ratings (utr_id, history, history_updated_at) VALUES (?, ?, ?)
+               ON CONFLICT(utr_id) DO UPDATE
+               SET history = excluded.history, history_updated_at = excluded.history_updated_at""",
+            (str(utr_id), json.dumps(history), time.time()),
+        )
+
+
+_default = None
+
+
+def get_cache() -> UTRCache:
+    """Process-wide cache instance on DB_PATH"""
+    global _default
+    if _default is None:
+        _default = UTRCache()
+    return _default
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the UTR lookup cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_pin = sub.add_parser("pin", help="map a name to a UTR id")
+    p_pin.add_argument("name")
+    p_pin.add_argument("utr_id")
+    p_pin.add_argument("--school", default="")
+    p_unpin = sub.add_parser("unpin", help="remove a name mapping")
+    p_unpin.add_argument("name")
+    p_unpin.add_argument("--school", default="")
+    p_show = sub.add_parser("show", help="show the cached id and rating for a name")
+    p_show.add_argument("name")
+    p_show.add_argument("--school", default="")
+    args = parser.parse_args()
+
+    cache = get_cache()
+    if args.command == "pin":
+        cache.pin(args.name, args.utr_id, args.school)
+        print(f"Pinned {args.name} -> {args.utr_id}")
+    elif args.command == "unpin":
+        cache.unpin(args.name, args.school)
+        print(f"Removed {args.name}")
+    else:
+        utr_id = cache.get_id(args.name, args.school, ttl=float("inf"))
+        rating = cache.get_rating(utr_id, ttl=float("inf")) if utr_id else None
+        print(f"{args.name}: id={utr_id} rating={rating}")
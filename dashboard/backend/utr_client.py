@@ -0,0 +1,131 @@
+"""
+Async UTR client used by the roster scraper.
+
+Requests go through the shared pooled session in http_client and run in
+worker threads, so the event loop (and Playwright rendering) keeps going
+while UTR answers. A token bucket caps the overall request rate, a
+semaphore caps how many lookups are in flight, and transient failures
+(429 / 5xx / connection errors) are retried with exponential backoff.
+Ids and ratings are read from / written to the shared utr_cache first, so
+only new or stale players reach the API.
+"""
+
+import asyncio
+import logging
+import random
+import time
+
+import requests
+
+import http_client
+from utr_cache import get_cache
+
+log = logging.getLogger(__name__)
+
+SEARCH_URL = "https://app.universaltennis.com/api/v2/search/players"
+PLAYER_URL = "https://app.universaltennis.com/api/v1/player/{pid}"
+PROFILE_URL = "https://app.utrsports.net/profiles/{pid}"
+
+RATE_PER_SEC = 4        # sustained requests per second to UTR
+BURST        = 8        # bucket size
+CONCURRENCY  = 8        # max requests in flight
+MAX_RETRIES  = 3
+BACKOFF_BASE = 1.0      # seconds; doubles every retry
+
+
+class TokenBucket:
+    """Async token bucket: acquire() waits until a token is available"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class RetryableError(Exception):
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AsyncUTRClient:
+    def __init__(self, headers: dict = None, rate: float = RATE_PER_SEC, burst: int = BURST,
+                 concurrency: int = CONCURRENCY, cache=None):
+        self.headers = headers or {}
+        self.cache = cache or get_cache()
+        self._bucket = TokenBucket(rate, burst)
+        self._in_flight = asyncio.Semaphore(concurrency)
+
+    def _get(self, url: str, params: dict = None) -> dict:
+        response = http_client.get(url, params=params, headers=self.headers, timeout=10)
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get("Retry-After")
+            raise RetryableError(
+                f"HTTP {response.status_code} for {response.url}",
+                float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        response.raise_for_status()
+        return response.json()
+
+    async def get_json(self, url: str, params: dict = None) -> dict:
+        for attempt in range(MAX_RETRIES + 1):
+            await self._bucket.acquire()
+            try:
+                async with self._in_flight:
+                    return await asyncio.to_thread(self._get, url, params)
+            except (RetryableError, requests.ConnectionError, requests.Timeout) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = getattr(e, "retry_after", None) or BACKOFF_BASE * 2 ** attempt
+                delay += random.uniform(0, 0.25 * delay)
+                log.debug(f"UTR retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+
+    async def search_player_id(self, query: str):
+        data = await self.get_json(SEARCH_URL, {"query": query, "top": 1})
+        key = "hits" if "hits" in data else "Hits"
+        hit = data[key][0]
+        return hit.get("id") or hit.get("Id")
+
+    async def get_player(self, pid) -> dict:
+        return await self.get_json(PLAYER_URL.format(pid=pid))
+
+    async def lookup(self, player_name: str, school: str = "") -> tuple[str, str]:
+        """(singles UTR, profile URL) for a player; ("N/A", "N/A") if not found"""
+        pid = self.cache.get_id(player_name, school)
+        if pid is not None:
+            utr = self.cache.get_rating(pid)
+            if utr is not None:
+                return str(utr), PROFILE_URL.format(pid=pid)
+
+        queries = [player_name, f"{player_name} {school}"] if school else [player_name]
+        for query in queries:
+            try:
+                if pid is None:
+                    pid = await self.search_player_id(query)
+                player = await self.get_player(pid)
+                utr = player.get("singlesUtr") or "Unrated"
+                self.cache.set_id(player_name, pid, school)
+                self.cache.set_rating(pid, utr)
+                return str(utr), PROFILE_URL.format(pid=pid)
+            except Exception as e:
+                log.debug(f"UTR error for '{query}': {e}")
+                pid = None
+        return "N/A", "N/A"
+
+    async def lookup_many(self, players: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """Concurrent lookup() for [(name, school), ...], results in the same order"""
+        return await asyncio.gather(*(self.lookup(name, school) for name, school in players))
@@ -0,0 +1,2 @@
+# The match_scraper module is imported by name. Having a conftest here makes pytest
+# put data/ on sys.path for data/tests.
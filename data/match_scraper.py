@@ -1,3 +1,9 @@
+import os
+import sys
+import json
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
 import pandas as pd
 import numpy as np
@@ -5,26 +11,118 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 import unicodedata
 
+# The shared HTTP session / response cache and the UTR id/rating cache live with the
+# dashboard backend. They import normally when dashboard/backend is on PYTHONPATH;
+# otherwise the copy in this checkout is used, so the script runs from anywhere.
+try:
+    import http_client
+    from utr_cache import get_cache
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard', 'backend'))
+    import http_client
+    from utr_cache import get_cache
+
+# response cache TTLs (seconds)
+SEARCH_TTL = 7 * 24 * 3600   # name -> id lookups rarely change
+PLAYER_TTL = 24 * 3600       # current rating / rating history
+RESULTS_TTL = 3600           # match results
+
+# players fetched at once by the batch API
+MAX_WORKERS = 8
+
+
+def _json_with(*keys):
+    """cache_if check for http_client: only keep UTR responses that are JSON objects with one of `keys`"""
+    def check(response):
+        try:
+            data = response.json()
+        except ValueError:
+            return False
+        return isinstance(data, dict) and any(data.get(key) is not None for key in keys)
+    return check
+
+
+class RatingTimeline:
+    """
+    A player's weekly UTR history as sorted date / rating arrays.
+    lookup() finds the closest week for many match dates at once with searchsorted.
+    """
+
+    MAX_GAP_DAYS = 365
+
+    def __init__(self, history):
+        dates = np.array([week['date'][:10] for week in history], dtype='datetime64[D]')
+        ratings = np.array([week['rating'] for week in history], dtype=object)
+        order = np.argsort(dates, kind='stable')
+        self.dates = dates[order]
+        self.ratings = ratings[order]
+
+    @property
+    def empty(self):
+        return len(self.dates) == 0
+
+    def lookup(self, match_dates):
+        """Rating from the closest week for each date (nan if none within MAX_GAP_DAYS)"""
+        match_dates = np.asarray(match_dates, dtype='datetime64[D]')
+        out = np.full(len(match_dates), np.nan, dtype=object)
+        if self.empty or len(match_dates) == 0:
+            return out
+
+        # candidate weeks on either side of each match date; ties go to the earlier week
+        right = np.clip(np.searchsorted(self.dates, match_dates), 0, len(self.dates) - 1)
+        left = np.clip(right - 1, 0, len(self.dates) - 1)
+        left_gap = np.abs((match_dates - self.dates[left]).astype(int))
+        right_gap = np.abs((self.dates[right] - match_dates).astype(int))
+        closest = np.where(left_gap <= right_gap, left, right)
+        gap = np.minimum(left_gap, right_gap)
+
+        in_range = gap <= self.MAX_GAP_DAYS
+        out[in_range] = self.ratings[closest[in_range]]
+        return out
+
+
 class UTRScraper:
 
+    def __init__(self, cache=None, http=None):
+        # name -> id and id -> rating/history lookups shared with the roster scraper
+        self.cache = cache or get_cache()
+        # anything with cached_get(url, ttl) returning a requests.Response (default: http_client)
+        self.http = http or http_client
+        self._timelines = {}
+        self._timeline_locks = defaultdict(threading.Lock)  # one history download per player, even across threads
+
     def get_user_id(self, name):
+        user_id = self.cache.get_id(name)
+        if user_id is not None:
+            return user_id
+
         num_results = 1
         try:
-            page = requests.get(f'https://app.universaltennis.com/api/v2/search/players?query={name}&top={num_results}')
+            page = self.http.cached_get(f'https://app.universaltennis.com/api/v2/search/players?query={name}&top={num_results}',
+                                        ttl=SEARCH_TTL, cache_if=_json_with('hits', 'Hits'))
             data = page.json()
             # extract user id from either 'hits' or 'Hits' because utr has two JSON responses
             key = 'hits' if 'hits' in data else 'Hits'
-            return data[key][0]['id'] if key == 'hits' else data[key][0]['Id']
+            user_id = data[key][0]['id'] if key == 'hits' else data[key][0]['Id']
         except (KeyError, IndexError, requests.exceptions.RequestException) as e:
             print(f'Error: Could not find user ID for {name}')
+            return None
+        self.cache.set_id(name, user_id)
+        return user_id
             
     def get_utr(self, name):
         user_id = self.get_user_id(name)
+        if user_id is None:
+            return None
+        singles_utr = self.cache.get_rating(user_id)
+        if singles_utr is not None:
+            return singles_utr
         # get player utr
         url = f'https://app.universaltennis.com/api/v1/player/{user_id}'
-        page = requests.get(url)
+        page = self.http.cached_get(url, ttl=PLAYER_TTL, cache_if=_json_with('singlesUtr'))
         data = page.json()
         singles_utr = data['singlesUtr']
+        self.cache.set_rating(user_id, singles_utr)
         return singles_utr
     
     # convert UTR scoring into a string
@@ -32,8 +130,10 @@ class UTRScraper:
         sets = []
         for i in range(1, 4):
             if str(i) in score:
-                loser_score = score[str(i)]['loser'] if score[str(i)]['loser'] is not None else '0' # account for 0 stored as None in the UTR data
-                set_score = f"{score[str(i)]['winner']}-{loser_score}"
+                # account for 0 stored as None in the UTR data (either side)
+                winner_score = score[str(i)]['winner'] if score[str(i)]['winner'] is not None else '0'
+                loser_score = score[str(i)]['loser'] if score[str(i)]['loser'] is not None else '0'
+                set_score = f"{winner_score}-{loser_score}"
                 if score[str(i)]['tiebreak'] != None:
                     set_score += f"({score[str(i)]['tiebreak']})"
                 sets.append(set_score)
@@ -52,104 +152,251 @@ class UTRScraper:
     
 
     # get UTR rating at the time of the match
-    def get_historical_UTR(self, name, match_date):
-        print(name)
-        # create dicitonary of (weekly) dates and UTR ratings
+    # weekly (date, rating) history for a player, [] if UTR has none
+    def get_rating_history(self, name):
         user_id = self.get_user_id(name)
-        url = f'https://app.universaltennis.com/api/v1/player/{user_id}/stats?type=singles&resultType=verified&Months=12&fetchAllResults=false'
-        page = requests.get(url)
-        stats = page.json()
+        if user_id is None:
+            return []
+        history = self.cache.get_history(user_id)
+        if history is not None:
+            return history
 
-        # for now, if there's no extendedRatingProfile history, return nan
+        url = f'https://app.universaltennis.com/api/v1/player/{user_id}/stats?type=singles&resultType=verified&Months=12&fetchAllResults=false'
         try:
-            utr_history = stats['extendedRatingProfile']['history']
-        except (KeyError, IndexError, TypeError):
-            print(f'Error: Could not find UTR history for {name}')
-            return np.nan
-        if utr_history == None:
-            print(f'Error: Could not find UTR history for {name}')
-            return np.nan
+            page = self.http.cached_get(url, ttl=PLAYER_TTL, cache_if=_json_with('extendedRatingProfile'))
+            page.raise_for_status()
+            stats = page.json()
+        except (ValueError, requests.exceptions.RequestException) as e:
+            print(f'Error: Could not fetch UTR history for {name}: {e}')
+            return []
 
-        utr_dict = {}
-        for week in utr_history:
-            date = datetime.strptime(week['date'], '%Y-%m-%dT%H:%M:%S').date()
-            rating = week['ratingDisplay']
-            utr_dict[date] = rating
+        # only a real stats response is cached; anything else is retried next run
+        if not isinstance(stats, dict) or 'extendedRatingProfile' not in stats:
+            return []
+        utr_history = (stats['extendedRatingProfile'] or {}).get('history') or []
 
-        # get the UTR rating from the closest date
-        closest_date = None
-        closest_diff = None
-        for key in utr_dict.keys():
-            diff = abs((key - match_date).days)
-            if closest_diff is None or diff < closest_diff:
-                closest_diff = diff
-                closest_date = key
+        history = [{'date': week['date'], 'rating': week['ratingDisplay']} for week in utr_history]
+        self.cache.set_history(user_id, history)
+        return history
 
-        # if closest date is more than a year away, return nan
-        if closest_date is None or abs((closest_date - match_date).days) > 365:
-            print(f'Error: UTR history not in range {name} on {match_date}')
-            return np.nan
+    # sorted rating timeline for a player, built once per scraper instance
+    def get_timeline(self, name):
+        with self._timeline_locks[name]:
+            if name not in self._timelines:
+                self._timelines[name] = RatingTimeline(self.get_rating_history(name))
+        return self._timelines[name]
 
-        return utr_dict[closest_date]
+    # download the rating histories of many players concurrently; get_timeline then hits memory
+    def prefetch_timelines(self, names, max_workers=MAX_WORKERS):
+        http_client.fetch_all(self.get_timeline, pd.unique(np.asarray(names, dtype=object)), max_workers)
 
+    # get UTR ratings at the time of many matches for one player at once
+    def get_historical_UTRs(self, name, match_dates):
+        timeline = self.get_timeline(name)
+        if timeline.empty:
+            print(f'Error: Could not find UTR history for {name}')
+        return timeline.lookup(match_dates)
 
+    # get UTR rating at the time of the match
+    def get_historical_UTR(self, name, match_date):
+        return self.get_historical_UTRs(name, [match_date])[0]
 
-    def get_singles_results(self, name):
+    # one row per singles result, without historical ratings
+    def _parse_result(self, event_name, result):
+        date = self.convert_date(result['date'])
+        player1 = self.remove_accents(result['players']['winner1']['firstName'].split()[0] + ' ' + result['players']['winner1']['lastName'])
+        player2 = self.remove_accents(result['players']['loser1']['firstName'] + ' ' + result['players']['loser1']['lastName'])
+        player1_singles_utr = result['players']['winner1']['singlesUtr']
+        player2_singles_utr = result['players']['loser1']['singlesUtr']
+        score = self.get_score_string(result['score'])
+        return [event_name, date, player1, player2, score, player1_singles_utr, player2_singles_utr]
+
+    # fill 'Player1/2 Historical UTR' with one timeline lookup per distinct player
+    def add_historical_UTRs(self, singles_results):
+        n = len(singles_results)
+        dates = pd.to_datetime(singles_results['Date']).to_numpy(dtype='datetime64[D]')
+
+        # long form: both player columns stacked, so each player is looked up once
+        names = np.concatenate([singles_results['Player1'].to_numpy(), singles_results['Player2'].to_numpy()])
+        all_dates = np.concatenate([dates, dates])
+        historical = np.full(2 * n, np.nan, dtype=object)
+        for player in pd.unique(names):
+            mask = names == player
+            historical[mask] = self.get_historical_UTRs(player, all_dates[mask])
+
+        singles_results['Player1 Historical UTR'] = historical[:n]
+        singles_results['Player2 Historical UTR'] = historical[n:]
+        return singles_results
+
+    # all singles results for a player, without historical ratings
+    def get_raw_singles_results(self, name):
         user_id = self.get_user_id(name)
+        if user_id is None:
+            raise LookupError(f'no UTR id for {name}')
 
         # add ?type=singles for singles only
         url = f'https://app.universaltennis.com/api/v1/player/{user_id}/results?type=singles'
-        page = requests.get(url)
+        page = self.http.cached_get(url, ttl=RESULTS_TTL, cache_if=_json_with('events'))
         data = page.json()
 
         results = []
         for event in data['events']:
             event_name = event['name']
+            event_results = event['results'] if len(event['draws']) == 0 else event['draws'][0]['results']
+            for result in event_results:
+                results.append(self._parse_result(event_name, result))
 
-            if len(event['draws']) == 0:
-                for result in event['results']:
-                    date = self.convert_date(result['date'])
-                    player1 = self.remove_accents(result['players']['winner1']['firstName'].split()[0] + ' ' + result['players']['winner1']['lastName'])
-                    player2 = self.remove_accents(result['players']['loser1']['firstName'] + ' ' + result['players']['loser1']['lastName'])
-                    player1_singles_utr = result['players']['winner1']['singlesUtr']
-                    player2_singles_utr = result['players']['loser1']['singlesUtr']
-                    player1_historical_utr = self.get_historical_UTR(player1, datetime.strptime(date, '%Y-%m-%d').date())
-                    player2_historical_utr = self.get_historical_UTR(player2, datetime.strptime(date, '%Y-%m-%d').date())
-                    score = self.get_score_string(result['score'])
-                    results.append([event_name, date, player1, player2, score, player1_singles_utr, player2_singles_utr, player1_historical_utr, player2_historical_utr])
-            else:
-                for result in event['draws'][0]['results']:
-                    date = self.convert_date(result['date'])
-                    player1 = self.remove_accents(result['players']['winner1']['firstName'].split()[0] + ' ' + result['players']['winner1']['lastName'])
-                    player2 = self.remove_accents(result['players']['loser1']['firstName'] + ' ' + result['players']['loser1']['lastName'])
-                    player1_singles_utr = result['players']['winner1']['singlesUtr']
-                    player2_singles_utr = result['players']['loser1']['singlesUtr']
-                    player1_historical_utr = self.get_historical_UTR(player1, datetime.strptime(date, '%Y-%m-%d').date())
-                    player2_historical_utr = self.get_historical_UTR(player2, datetime.strptime(date, '%Y-%m-%d').date())
-                    score = self.get_score_string(result['score'])
-                    results.append([event_name, date, player1, player2, score, player1_singles_utr, player2_singles_utr, player1_historical_utr, player2_historical_utr])
-
-        singles_results = pd.DataFrame(results, columns=['Event Name', 'Date', 'Player1', 'Player2', 'Score', 'Player1 UTR', 'Player2 UTR', 'Player1 Historical UTR', 'Player2 Historical UTR'])
-        return singles_results
+        return pd.DataFrame(results, columns=['Event Name', 'Date', 'Player1', 'Player2', 'Score', 'Player1 UTR', 'Player2 UTR'])
+
+    def get_singles_results(self, name):
+        return self.add_historical_UTRs(self.get_raw_singles_results(name))
+
+    # fetch many players on a thread pool; yields (name, results, error) as each one finishes
+    def stream_singles_results(self, names, max_workers=MAX_WORKERS, with_history=True):
+        fetch = self.get_singles_results if with_history else self.get_raw_singles_results
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(fetch, name): name for name in dict.fromkeys(names)}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    yield name, future.result(), None
+                except Exception as e:
+                    yield name, None, e
+
+    # batch version of get_singles_results: rows are appended to out_path as players
+    # complete, and one player failing does not stop the rest
+    def get_singles_results_batch(self, names, out_path=None, max_workers=MAX_WORKERS):
+        frames, failures = {}, {}
+        wrote_header = False
+        for name, data, error in self.stream_singles_results(names, max_workers):
+            if error is not None:
+                print(f'Error: {name} failed: {error}')
+                failures[name] = str(error)
+                continue
+            print(f'{name}: {len(data)} results')
+            frames[name] = data
+            if out_path and not data.empty:
+                data.to_csv(out_path, mode='a' if wrote_header else 'w', header=not wrote_header, index=False)
+                wrote_header = True
+
+        # the returned frame is in the order of `names`, whatever order players finished in
+        ordered = [frames[name] for name in dict.fromkeys(names) if name in frames]
+        results = pd.concat(ordered, ignore_index=True) if ordered else pd.DataFrame(columns=RESULT_COLUMNS)
+        return results, failures
     
     def get_doubles_results(self):
         # later?
         return
 
 
+# ---------------------------------------------------------------------------
+# Incremental ingestion
+# match_results_state.json keeps the newest match date seen per player. Each
+# run only keeps results on/after that date, looks up historical UTRs for the
+# rows that are actually new (histories fetched concurrently), dedupes on
+# match_key and rewrites the CSV atomically (temp file + rename).
+# ---------------------------------------------------------------------------
+
+RESULT_COLUMNS = ['Event Name', 'Date', 'Player1', 'Player2', 'Score', 'Player1 UTR', 'Player2 UTR', 'Player1 Historical UTR', 'Player2 Historical UTR']
+KEY_COLUMNS = ['Date', 'Event Name', 'Player1', 'Player2']
+
+
+def match_key(df):
+    """Stable per-match key: date + event + both players (case/space-insensitive)"""
+    parts = [df[col].astype(str).str.strip().str.lower() for col in KEY_COLUMNS]
+    return parts[0].str.cat(parts[1:], sep='|')
+
+
+def load_state(state_path):
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            return json.load(f)
+    return {}
+
+
+def atomic_write(path, write):
+    """Call write(tmp_path) then move the temp file over `path` in one step"""
+    tmp = f'{path}.tmp'
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def ingest_results(scraper, names, out_path='match_results.csv', state_path=None, full=False):
+    state_path = state_path or os.path.splitext(out_path)[0] + '_state.json'
+    # without the CSV the saved high-water marks would skip results we no longer have
+    full = full or not os.path.exists(out_path)
+    state = {} if full else load_state(state_path)
+
+    if not full:
+        existing = pd.read_csv(out_path)
+    else:
+        existing = pd.DataFrame(columns=RESULT_COLUMNS)
+    known = set(match_key(existing)) if not existing.empty else set()
+
+    new_frames, failures = {}, {}
+    for name, raw, error in scraper.stream_singles_results(names, with_history=False):
+        if error is not None:
+            print(f'Error: {name} failed: {error}')
+            failures[name] = str(error)
+            continue
+        if raw.empty:
+            continue
+
+        # same-day matches are re-checked; the key dedupe drops the ones we already have
+        high_water = state.get(name)
+        state[name] = max(high_water or '', raw['Date'].max())
+        if high_water:
+            raw = raw[raw['Date'] >= high_water]
+
+        keys = match_key(raw)
+        raw = raw[~keys.isin(known) & ~keys.duplicated()]
+        known.update(match_key(raw))
+        print(f'{name}: {len(raw)} new results')
+
+        if not raw.empty:
+            new_frames[name] = raw
+
+    if new_frames:
+        # players finish in any order; new rows go in the order of `names` so reruns write the same file
+        new = pd.concat([new_frames[name] for name in dict.fromkeys(names) if name in new_frames], ignore_index=True)
+        # every history download for the new rows at once, then the lookups are in memory
+        scraper.prefetch_timelines(np.concatenate([new['Player1'].to_numpy(), new['Player2'].to_numpy()]))
+        new = scraper.add_historical_UTRs(new)
+        combined = pd.concat([existing, new], ignore_index=True)
+        combined = combined[~match_key(combined).duplicated()]
+        atomic_write(out_path, lambda tmp: combined.to_csv(tmp, index=False))
+        print(f'Wrote {len(combined)} rows to {out_path}')
+    else:
+        print(f'No new results, {out_path} unchanged')
+
+    def write_state(tmp):
+        with open(tmp, 'w') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+    atomic_write(state_path, write_state)
+    return failures
+
+
 if __name__ == "__main__":
 
-    # testing code
+    import argparse
+    parser = argparse.ArgumentParser(description='Pull UTR singles results into match_results.csv')
+    parser.add_argument('--full', action='store_true', help='ignore saved state and rebuild the CSV from scratch')
+    parser.add_argument('--out', default='match_results.csv')
+    parser.add_argument('--rosters', action='store_true', help='pull every player in dashboard/backend/rosters/*_roster.csv')
+    args = parser.parse_args()
+
     scraper = UTRScraper()
     names = ["Spencer Johnson", "Gianluca Ballotta", "Cassius Chinlund", "Andrei Crabel",
             "Andy Nguyen", "Rudy Quan", "Bengt Reinhard", "Will Steinberg", "Aadarsh Tripathi",
             "Emon van Loben Sels", "Leo von Bismarck"]
+    if args.rosters:
+        import glob
+        roster_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dashboard', 'backend', 'rosters')
+        rosters = [pd.read_csv(path) for path in sorted(glob.glob(os.path.join(roster_dir, '*_roster.csv')))]
+        names = pd.concat(rosters)['Player'].dropna().str.strip().unique().tolist()
 
-    all_results = []
-    for name in names:
-        data = scraper.get_singles_results(name)
-        all_results.append(data)
-
-    pd.concat(all_results, ignore_index=True).to_csv('match_results.csv', index=False)
+    failures = ingest_results(scraper, names, out_path=args.out, full=args.full)
+    if failures:
+        print(f'{len(failures)} players failed: {sorted(failures)}')
 
 
@@ -0,0 +1,16 @@
+# Fixtures that run UTRScraper against the fake UTR API in fake_utr.py
+import pytest
+
+import match_scraper
+from fake_utr import FakeUTR
+from utr_cache import UTRCache
+
+
+@pytest.fixture
+def utr():
+    return FakeUTR()
+
+
+@pytest.fixture
+def scraper(utr, tmp_path):
+    return match_scraper.UTRScraper(cache=UTRCache(str(tmp_path / "utr_cache.sqlite3")), http=utr)
@@ -0,0 +1,69 @@
+"""Fake UTR API shared by the match_scraper tests"""
+
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+
+def json_response(url, data):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = json.dumps(data).encode("utf-8")
+    return response
+
+
+def result(date, winner, loser, sets, event="Dual Match: UCLA vs USC"):
+    """One UTR singles result: sets as (winner games, loser games) pairs"""
+    def player(name):
+        first, last = name.split(" ", 1)
+        return {"firstName": first, "lastName": last, "singlesUtr": 12.5}
+    return event, {
+        "date": f"{date}T20:00:00",
+        "players": {"winner1": player(winner), "loser1": player(loser)},
+        "score": {str(i): {"winner": w, "loser": l, "tiebreak": None} for i, (w, l) in enumerate(sets, 1)},
+    }
+
+
+class FakeUTR:
+    """
+    Stand-in for http_client talking to UTR: players (name -> id), results
+    (id -> list of result()), ids in `failing` raise on their results request
+    and ids in `slow` answer after a delay. Every URL asked for is recorded.
+    """
+
+    def __init__(self):
+        self.players, self.results, self.failing, self.slow = {}, {}, set(), {}
+        self.requested = []
+        self._lock = threading.Lock()
+
+    def add(self, name, utr_id, *results):
+        self.players[name] = utr_id
+        self.results[utr_id] = list(results)
+
+    def cached_get(self, url, ttl=0, **kwargs):
+        with self._lock:
+            self.requested.append(url)
+        parsed = urlparse(url)
+        parts = parsed.path.strip("/").split("/")
+        if parts[-1] == "players":
+            name = parse_qs(parsed.query)["query"][0]
+            hits = [{"id": self.players[name]}] if name in self.players else []
+            return json_response(url, {"hits": hits})
+        utr_id = int(parts[-2])
+        if parts[-1] == "results":
+            time.sleep(self.slow.get(utr_id, 0))
+            if utr_id in self.failing:
+                raise requests.ConnectionError(f"connection reset for player {utr_id}")
+            events = [{"name": event, "draws": [], "results": [r]} for event, r in self.results.get(utr_id, [])]
+            return json_response(url, {"events": events})
+        if parts[-1] == "stats":
+            history = [{"date": "2025-01-06T00:00:00", "ratingDisplay": f"{10 + utr_id}.00"}]
+            return json_response(url, {"extendedRatingProfile": {"history": history}})
+        raise AssertionError(f"unexpected URL {url}")
+
+    def requests_for(self, utr_id, kind):
+        return [u for u in self.requested if f"/player/{utr_id}/{kind}" in u]
@@ -0,0 +1,80 @@
+import json
+import os
+
+import pandas as pd
+
+from fake_utr import result
+from match_scraper import ingest_results
+
+NAMES = ["Rudy Quan", "Spencer Johnson"]
+# the UCLA vs USC match shows up in both players' results
+DUAL = result("2025-02-02", "Rudy Quan", "Spencer Johnson", [(7, 5), (6, 4)])
+
+
+def add_players(utr):
+    utr.add("Rudy Quan", 1, result("2025-02-01", "Rudy Quan", "Max Exsted", [(6, 4), (6, 3)]), DUAL)
+    utr.add("Spencer Johnson", 2, DUAL)
+
+
+def ingest(scraper, tmp_path, **kwargs):
+    out_path = str(tmp_path / "match_results.csv")
+    failures = ingest_results(scraper, NAMES, out_path=out_path, **kwargs)
+    with open(tmp_path / "match_results_state.json") as f:
+        state = json.load(f)
+    return pd.read_csv(out_path), state, failures
+
+
+def test_first_run_dedupes_shared_matches(scraper, utr, tmp_path):
+    add_players(utr)
+    rows, state, failures = ingest(scraper, tmp_path)
+
+    assert failures == {}
+    assert rows[["Date", "Player1", "Player2"]].values.tolist() == [
+        ["2025-02-01", "Rudy Quan", "Max Exsted"],
+        ["2025-02-02", "Rudy Quan", "Spencer Johnson"],
+    ]
+    assert state == {"Rudy Quan": "2025-02-02", "Spencer Johnson": "2025-02-02"}
+
+
+def test_rerun_only_adds_results_past_the_high_water_mark(scraper, utr, tmp_path):
+    add_players(utr)
+    ingest(scraper, tmp_path)
+
+    # a new match, plus one dated before the saved mark that only shows up now
+    utr.results[1] += [
+        result("2025-03-01", "Rudy Quan", "Kaylan Bigun", [(6, 2), (6, 2)]),
+        result("2025-01-15", "Rudy Quan", "Oliver Tarvet", [(6, 1), (6, 1)]),
+    ]
+    utr.requested.clear()
+    rows, state, _ = ingest(scraper, tmp_path)
+
+    assert rows["Player2"].tolist() == ["Max Exsted", "Spencer Johnson", "Kaylan Bigun"]
+    assert state["Rudy Quan"] == "2025-03-01"
+    assert state["Spencer Johnson"] == "2025-02-02"
+    # histories are only looked up for the players in the new row
+    assert {u.split("/")[-2] for u in utr.requested if u.endswith("/stats")} <= {"1"}
+
+    # a full rebuild picks up the late result as well
+    rows, _, _ = ingest(scraper, tmp_path, full=True)
+    assert sorted(rows["Player2"]) == ["Kaylan Bigun", "Max Exsted", "Oliver Tarvet", "Spencer Johnson"]
+
+
+def test_rerun_without_new_results_leaves_the_csv_alone(scraper, utr, tmp_path):
+    add_players(utr)
+    ingest(scraper, tmp_path)
+    out_path = tmp_path / "match_results.csv"
+    before = os.stat(out_path).st_mtime_ns
+
+    rows, _, _ = ingest(scraper, tmp_path)
+    assert len(rows) == 2
+    assert os.stat(out_path).st_mtime_ns == before
+
+
+def test_failed_player_keeps_its_mark(scraper, utr, tmp_path):
+    add_players(utr)
+    ingest(scraper, tmp_path)
+
+    utr.failing.add(2)
+    _, state, failures = ingest(scraper, tmp_path)
+    assert list(failures) == ["Spencer Johnson"]
+    assert state["Spencer Johnson"] == "2025-02-02"
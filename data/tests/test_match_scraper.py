@@ -0,0 +1,45 @@
+import pandas as pd
+
+from fake_utr import result
+
+
+def add_players(utr):
+    utr.add("Rudy Quan", 1, result("2025-02-01", "Rudy Quan", "Max Exsted", [(6, 4), (6, 3)]))
+    utr.add("Spencer Johnson", 2, result("2025-02-02", "Spencer Johnson", "Hugo Hashimoto", [(7, 5), (4, 6), (1, 0)]))
+    utr.add("Bad Player", 3)
+    utr.failing.add(3)
+
+
+def test_batch_reports_failures_and_keeps_the_rest(scraper, utr, tmp_path):
+    add_players(utr)
+    out_path = tmp_path / "results.csv"
+    names = ["Rudy Quan", "Bad Player", "Spencer Johnson", "Rudy Quan"]
+
+    results, failures = scraper.get_singles_results_batch(names, out_path=str(out_path))
+
+    assert list(failures) == ["Bad Player"]
+    assert "connection reset" in failures["Bad Player"]
+    # returned in the order the names were given, each player fetched once
+    assert results["Player1"].tolist() == ["Rudy Quan", "Spencer Johnson"]
+    assert len(utr.requests_for(1, "results")) == 1
+    assert results["Score"].tolist() == ["6-4, 6-3", "7-5, 4-6, 1-0"]
+    assert results["Player1 Historical UTR"].tolist() == ["11.00", "12.00"]
+    # nothing known about the opponents' histories
+    assert results["Player2 Historical UTR"].isna().all()
+
+    written = pd.read_csv(out_path)
+    assert sorted(written["Player1"]) == ["Rudy Quan", "Spencer Johnson"]
+
+
+def test_stream_yields_players_as_they_finish(scraper, utr):
+    add_players(utr)
+    utr.slow[1] = 0.3
+    streamed = [name for name, _, _ in scraper.stream_singles_results(["Rudy Quan", "Spencer Johnson"], with_history=False)]
+    assert streamed == ["Spencer Johnson", "Rudy Quan"]
+
+
+def test_player_without_utr_id_fails_without_a_request(scraper, utr):
+    results, failures = scraper.get_singles_results_batch(["Nobody Known"])
+    assert results.empty
+    assert list(failures) == ["Nobody Known"]
+    assert not [u for u in utr.requested if "/player/" in u]
@@ -0,0 +1,2 @@
+# serve_distribution is imported by name. Having a conftest here makes pytest put
+# scouting/ on sys.path for scouting/tests.
@@ -1,31 +1,35 @@
-import pandas as pd
+"""
+Serve statistics and serve placement JSONs from SwingVision data.
+
+    python serve_distribution.py "Rudy Quan"       # one player's summary + JSONs in ./data
+    python serve_distribution.py --all             # placement JSONs for every player
+    python serve_distribution.py --all --out DIR "Rudy Quan" "Kaylan Bigun"
+
+Batch mode loads each player's Shots/Points once and writes
+<out>/<player>/{first,second}_serve_place[_labels].json for all of them.
+"""
 
 import pandas as pd
 import numpy as np
 import os
 import json
-import ipywidgets as widgets
-from IPython.display import display
-
-# Path to the Excel file
-file_path = "combined.xlsx"
+import sys
+import argparse
 
-# Read all sheets into a dict of DataFrames
-df_dict = pd.read_excel(file_path, sheet_name=None)
+script_dir = os.path.dirname(os.path.abspath(__file__))
 
-# Access each sheet like this:
-settings_df = df_dict.get("settings")
-shots_df = df_dict.get("shots")
-points_df = df_dict.get("points")
-games_df = df_dict.get("games")
-sets_df = df_dict.get("sets")
-stats_df = df_dict.get("stats")
+# season_report modules: a normal import when season_report is on PYTHONPATH,
+# otherwise the copy in this checkout
+try:
+    from player_data import get_player_data
+    import match_store
+except ImportError:
+    sys.path.append(os.path.join(script_dir, '..', 'season_report'))
+    from player_data import get_player_data
+    import match_store
 
-combined_data_shots = pd.read_excel(f'../../data/mens/{player_name}/combined.xlsx', sheet_name='Shots')
-combined_data_points = pd.read_excel(f'../../data/mens/{player_name}/combined.xlsx', sheet_name='Points')
-combined_data_games = pd.read_excel(f'../../data/mens/{player_name}/combined.xlsx', sheet_name='Games')
-combined_data_sets = pd.read_excel(f'../../data/mens/{player_name}/combined.xlsx', sheet_name='Sets')
-combined_data_stats = pd.read_excel(f'../../data/mens/{player_name}/combined.xlsx', sheet_name='Stats')
+SERVE_TYPES = ('first_serve', 'second_serve')
+POINT_KEYS = ['Point', 'Game', 'Set', '__source_file__']
 
 def average_service_time(data):
 
@@ -39,10 +43,6 @@ def average_service_time(data):
 
     return f"{mins}:{secs:02d}"
 
-# Output Average Service Game Duration
-avg_service_game_duration = average_service_time(combined_data_games)
-min, sec = avg_service_game_duration.split(':')
-min, sec
 
 
 def service_games_won_percentage(df):
@@ -61,8 +61,6 @@ def service_games_won_percentage(df):
 
     return percentage
 
-average_games_held = str(service_games_won_percentage(combined_data_games)) + '%'
-average_games_held
 
 
 def breakpoints_saved_function(data):
@@ -77,8 +75,6 @@ def breakpoints_saved_function(data):
     return percentage
 
 
-breakpoints_saved_percentage = str(breakpoints_saved_function(combined_data_points)) + '%'
-breakpoints_saved_percentage
 
 
 def average_aces(df):
@@ -100,9 +96,6 @@ def average_aces(df):
     average = aces_per_match.mean()
     return round(average, 1)
 
-# Output Average Aces
-average_aces = average_aces(combined_data_stats)
-average_aces
 
 
 def average_doubleFaults(df):
@@ -121,8 +114,6 @@ def average_doubleFaults(df):
     return round(average_double_faults, 1)
 
 
-average_double_faults = average_doubleFaults(combined_data_stats)
-average_double_faults
 
 # Helper Function
 def find_stat(df, stat_name):
@@ -140,40 +131,50 @@ def find_stat(df, stat_name):
     return stat_total_value
 
 
-first_serves = find_stat(combined_data_stats, '1st Serves')   
-first_serves_in = find_stat(combined_data_stats, '1st Serves In') 
-first_serves_won = find_stat(combined_data_stats, '1st Serves Won')   
-
-second_serves = find_stat(combined_data_stats, '2nd Serves')   
-second_serves_in = find_stat(combined_data_stats, '2nd Serves In') 
-second_serves_won = find_stat(combined_data_stats, '2nd Serves Won')   
-
-
-first_serve_in_percentage = int(round((first_serves_in / first_serves) * 100, 0))
-first_serve_won_percentage = int(round((first_serves_won / first_serves_in) * 100, 0))
-second_serve_in_percentage = int(round((second_serves_in / second_serves) * 100, 0))
-second_serve_won_percentage = int(round((second_serves_won / second_serves_in) * 100, 0))
-
-print(f"Serve Performance Summary for {player_name}:\n")
-print(f"  1st Serve In %:        {first_serve_in_percentage}%")
-print(f"  1st Serve Won %:       {first_serve_won_percentage}%")
-print(f"  2nd Serve In %:        {second_serve_in_percentage}%")
-print(f"  2nd Serve Won %:       {second_serve_won_percentage}%")
 
-total_serves = combined_data_points[combined_data_points['Match Server'] == 'host'].shape[0]
-# total_serves = find_stat(combined_data_stats, '1st Serves') # OR this too
-serve_points_won = combined_data_points[combined_data_points['Match Server'] == 'host']['Point Winner'].value_counts().get(0, 'host')
-
-total_serve_points_won = int(round((serve_points_won / total_serves) * 100, 0))
-total_serve_points_won
-
-
-def serve_placement_labels(df_shots, df_points, serve_type):
+# Serve zones on the scaled court, x measured from the center service line.
+# |x| below the first edge is T, up to and including the second is Body, beyond it Wide;
+# x * y > 0 is the Ad side, anything else Deuce.
+ZONE_EDGES = (52.5, 105)
+SIDES = pd.CategoricalDtype(['Ad', 'Deuce'])
+ZONES = pd.CategoricalDtype(['Body', 'T', 'Wide']) # alphabetical, the order the JSON outputs have always used
+
+# x position of each zone's label in the labels JSON
+LABEL_X = {
+    ('Ad', 'Wide'): 131.25, ('Ad', 'Body'): 78.75, ('Ad', 'T'): 26.25,
+    ('Deuce', 'T'): -26.25, ('Deuce', 'Body'): -78.75, ('Deuce', 'Wide'): -131.25,
+}
+
+def classify_zones(x, y):
+    """Categorical (side, zone) for every serve at once; a missing x gives NaN, a missing y counts as Deuce"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = ~np.isnan(x)
+    ax = np.abs(x)
+    t_edge, wide_edge = ZONE_EDGES
+
+    zone = np.select([~valid, ax > wide_edge, ax >= t_edge], [None, 'Wide', 'Body'], default='T')
+    side = np.where(~valid, None, np.where(x * y > 0, 'Ad', 'Deuce'))
+    return pd.Categorical(side, dtype=SIDES), pd.Categorical(zone, dtype=ZONES)
+
+def with_point_attributes(df_shots, df_points, columns, point_rows=None, by=()):
+    """
+    Shots that belong to a point, with the given Points columns attached by array lookup.
+    point_rows is the shot -> Points row index (PlayerMatchData.point_index); built here if not given.
+    """
+    if point_rows is None:
+        point_rows = match_store.build_point_index(df_shots, df_points, by=list(by) + ['__source_file__'])
+    has_point = point_rows >= 0
+    shots = df_shots[has_point].reset_index(drop=True)
+    attrs = df_points[columns].iloc[point_rows[has_point]].reset_index(drop=True)
+    return pd.concat([shots, attrs], axis=1)
+
+def serve_placement_labels(df_shots, df_points, serve_type, point_rows=None):
     # only use matches with complete data
     # df_shots = df_shots[df_shots['__source_file__'].isin(df_points['__source_file__'])] # UPDATE: Temporary fix
 
     # add column for winner of the point
-    combined = pd.merge(df_shots, df_points[['Point', 'Game', 'Set', 'Point Winner', 'Match Server', '__source_file__']], on=['Point', 'Game', 'Set', '__source_file__'], how='left')
+    combined = with_point_attributes(df_shots, df_points, ['Point Winner', 'Match Server'], point_rows)
 
     # serves = combined[(combined['Stroke'] == 'Serve') & (combined['Match Server'] == 'host')] # Added Player Name Filter (CHANGED)
     serves = combined[(combined['Type'].isin(['first_serve', 'second_serve'])) & (combined['Match Server'] == 'host')] # Added Player Name Filter
@@ -182,7 +183,7 @@ def serve_placement_labels(df_shots, df_points, serve_type):
     # zone classification
     serves_in.loc[:, 'x_coord'] = serves_in['Bounce (x)'] * 38.2764654418
     serves_in.loc[:, 'y_coord'] = (serves_in['Bounce (y)'] - 11.8872) * 38.2764654418
-    serves_in[['side', 'serve_zone']] = serves_in.apply(classify_zone, axis=1)
+    serves_in['side'], serves_in['serve_zone'] = classify_zones(serves_in['x_coord'], serves_in['y_coord'])
 
     # Subset by First or Second Serve
     serves_in = serves_in[(serves_in['Type'] == serve_type)]
@@ -190,11 +191,12 @@ def serve_placement_labels(df_shots, df_points, serve_type):
     # Step 1: Get the counts for each side/zone combination
     # Chat Gpt this shi
     counts = serves_in[['side', 'serve_zone', 'Point Winner']].value_counts().reset_index(name='count')
+    counts = counts[counts['count'] > 0] # categoricals also list combinations that never occur
     
     # Step 2: Group by side and zone, calculate total serves and number of wins
     summary = (
         counts
-        .groupby(['side', 'serve_zone'])
+        .groupby(['side', 'serve_zone'], observed=True)
         .apply(lambda df: pd.Series({
             'total': df['count'].sum(),
             'won': df[df['Point Winner'] == 'host']['count'].sum()
@@ -217,129 +219,184 @@ def serve_placement_labels(df_shots, df_points, serve_type):
 
     return zone_counts, zone_win_percentages
 
-# First Serve
-first_serve_zone_counts, first_serve_zone_win_percentages = serve_placement_labels(combined_data_shots, combined_data_points, 'first_serve')
-first_serve_zone_counts, first_serve_zone_win_percentages
-
-# Second Serve
-second_serve_zone_counts, second_serve_zone_win_percentages = serve_placement_labels(combined_data_shots, combined_data_points, 'second_serve')
-second_serve_zone_counts, second_serve_zone_win_percentages
-
-# splits zone into two columns
-def classify_zone_split(df):
-    x = df['x']
-    y = df['y']
-    sign = x * y # if sign is pos, it's on ad side, if neg, it's deuce
-
-    if (x < -105) or (x > 105):
-        if sign > 0:
-            return pd.Series(['Ad', 'Wide'])
-        else:
-            return pd.Series(['Deuce', 'Wide'])
-    elif (-105 <= x <= -52.5) or (52.5 <= x <= 105):
-        if sign > 0:
-            return pd.Series(['Ad', 'Body'])
-        else:
-            return pd.Series(['Deuce', 'Body'])
-    elif -52.5 < x < 52.5:
-        if sign > 0:
-            return pd.Series(['Ad', 'T'])
-        else:
-            return pd.Series(['Deuce', 'T'])
-    else:
-        return pd.Series([np.nan, np.nan])
-    
-def generate_placement_jsons(df_shots, df_points, serve_type):
-    # only use matches with complete data
-    df_shots = df_shots[df_shots['__source_file__'].isin(df_points['__source_file__'])]
 
-    # add column for winner of the point
-    combined = pd.merge(df_shots, df_points[['Point', 'Game', 'Set', 'Point Winner', 'Match Server', 'Detail', '__source_file__']], on=['Point', 'Game', 'Set', '__source_file__'], how='left')
 
-    serves = combined[(combined['Type'] == serve_type) & (combined['Match Server'] == 'host')]
+def serve_placements(df_shots, df_points, serve_types=SERVE_TYPES, by=(), point_rows=None):
+    """
+    Placement rows and label rows for every in serve by the host, for all serve types
+    (and any extra grouping columns in `by`, e.g. a player column) in one pass.
+    Returns (placement, labels); both keep 'Type' and the `by` columns for splitting.
+    """
+    by = list(by)
+
+    # add column for winner of the point (shots without point data are dropped)
+    combined = with_point_attributes(df_shots, df_points, ['Point Winner', 'Match Server', 'Detail'], point_rows, by)
+
+    serves = combined[(combined['Type'].isin(serve_types)) & (combined['Match Server'] == 'host')]
     serves_in = serves[serves['Result'] == 'In'].copy()
 
     # zone classification
     serves_in.loc[:, 'x'] = serves_in['Bounce (x)'] * 38.2764654418
     serves_in.loc[:, 'y'] = (serves_in['Bounce (y)'] - 11.8872) * 38.2764654418
-    serves_in[['side', 'serveInPlacement']] = serves_in.apply(classify_zone_split, axis=1)
+    serves_in['side'], serves_in['serveInPlacement'] = classify_zones(serves_in['x'], serves_in['y'])
 
     # modify coordinates based on the y-value
     serves_in['x'] = np.where(serves_in['y'] < 0, -serves_in['x'], serves_in['x'])
     serves_in['y'] = np.where(serves_in['y'] < 0, -serves_in['y'], serves_in['y'])
 
     # add serve outcome
-    serves_in['serveOutcome'] = serves_in['Point Winner'].apply(lambda x: 'Won' if x == 'host' else 'Lost')
-    serves_in['serveOutcome'] = np.where(serves_in['Detail'] == 'Ace', 'Ace', serves_in['serveOutcome'])
+    serves_in['serveOutcome'] = np.select(
+        [serves_in['Detail'] == 'Ace', serves_in['Point Winner'] == 'host'], ['Ace', 'Won'], default='Lost'
+    )
+    serves_in['won'] = serves_in['Point Winner'] == 'host'
 
     # rename some columns to match json
     serves_in = serves_in.rename(columns={'Point': 'pointNumber', 'Player': 'serverName'})
+    placement = serves_in[by + ['Type', 'pointNumber', 'serverName', 'x', 'y', 'side', 'serveInPlacement', 'serveOutcome']]
 
-    # only get required columns
-    placement = serves_in[['pointNumber', 'serverName', 'x', 'y', 'side', 'serveInPlacement', 'serveOutcome']]
-    placement.to_json(f'data/{serve_type}_place.json', orient='records') # save json
-
-
-    ### LABELS JSON ###
+    ### LABELS ###
 
     # group by side and serveInPlacement, and calculate count and serves won
-    distribution = serves_in.groupby(['side', 'serveInPlacement']).agg(
+    groups = by + ['Type']
+    labels = serves_in.groupby(groups + ['side', 'serveInPlacement'], observed=True).agg(
         count=('pointNumber', 'size'),
-        serves_won=('Point Winner', lambda x: (x == 'host').sum())
+        serves_won=('won', 'sum')
     ).reset_index()
 
-    # calculate the win percentage (proportion)
-    distribution['proportion'] = distribution['serves_won'] / distribution['count']
+    # calculate the win percentage (proportion) and its min/max within each group
+    labels['proportion'] = labels['serves_won'] / labels['count']
+    grouped = labels.groupby(groups, observed=True)['proportion']
+    max_proportion = grouped.transform('max')
+    min_proportion = grouped.transform('min')
 
-    # find the min and max proportions
-    min_proportion = distribution['proportion'].min()
-    max_proportion = distribution['proportion'].max()
-
-    # create labels df and determine if each value is max, min, or neither
-    labels = distribution.copy()
     labels['proportion_label'] = (labels['proportion'] * 100).round(1).astype(str) + "%"
     labels['count_label'] = labels['count']
-
-    labels['x'] = np.where(
-        (labels['side'] == 'Ad') & (labels['serveInPlacement'] == 'Wide'), 131.25,
-        np.where(
-            (labels['side'] == 'Ad') & (labels['serveInPlacement'] == 'Body'), 78.75,
-            np.where(
-                (labels['side'] == 'Ad') & (labels['serveInPlacement'] == 'T'), 26.25,
-                np.where(
-                    (labels['side'] == 'Deuce') & (labels['serveInPlacement'] == 'T'), -26.25,
-                    np.where(
-                        (labels['side'] == 'Deuce') & (labels['serveInPlacement'] == 'Body'), -78.75,
-                        np.where(
-                            (labels['side'] == 'Deuce') & (labels['serveInPlacement'] == 'Wide'), -131.25,
-                            np.nan
-                        )
-                    )
-                )
-            )
-        )
-    )
+    labels['x'] = pd.MultiIndex.from_frame(labels[['side', 'serveInPlacement']].astype(str)).map(LABEL_X)
 
     # determine max/min status
-    labels['max_min'] = np.where(
-        labels['proportion'] == max_proportion, "max",
-        np.where(labels['proportion'] == min_proportion, "min", "no")
+    labels['max_min'] = np.select(
+        [labels['proportion'] == max_proportion, labels['proportion'] == min_proportion], ["max", "min"], default="no"
     )
-
-    # save labels to json
-    labels.to_json(f'data/{serve_type}_place_labels.json', orient='records')
-
-    return
-
-generate_placement_jsons(combined_data_shots, combined_data_points, 'first_serve')
-generate_placement_jsons(combined_data_shots, combined_data_points, 'second_serve')
+    return placement, labels
+
+
+def write_placement_jsons(placement, labels, serve_type, out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    group_cols = [c for c in ('player', 'Type') if c in placement.columns]
+    placement.drop(columns=group_cols).to_json(os.path.join(out_dir, f'{serve_type}_place.json'), orient='records')
+    labels.drop(columns=group_cols).to_json(os.path.join(out_dir, f'{serve_type}_place_labels.json'), orient='records')
+
+
+def generate_placement_jsons(df_shots, df_points, serve_type, out_dir='data', point_rows=None):
+    placement, labels = serve_placements(df_shots, df_points, [serve_type], point_rows=point_rows)
+    write_placement_jsons(placement, labels, serve_type, out_dir)
+
+
+def available_players(base_path=match_store.BASE_PATH):
+    """Players in data/mens with stored matches (or, without a store, a combined.xlsx)"""
+    players = []
+    for player in sorted(os.listdir(base_path)):
+        folder = os.path.join(base_path, player)
+        if match_store.has_store(player, base_path):
+            if match_store.stored_sources(folder):
+                players.append(player)
+        elif os.path.exists(os.path.join(folder, 'combined.xlsx')):
+            players.append(player)
+    return players
+
+
+def generate_all_placement_jsons(players, out_dir):
+    """
+    Placement and label JSONs for every player and serve type. Shots/Points are loaded once
+    per player and concatenated, so zones and win% come from one groupby over
+    (player, serve type, side, zone). Writes <out_dir>/<player>/<serve_type>_place[_labels].json.
+    """
+    shot_cols = ['Player', 'Type', 'Result', 'Bounce (x)', 'Bounce (y)'] + POINT_KEYS
+    point_cols = ['Point Winner', 'Match Server', 'Detail'] + POINT_KEYS
+    shots, points, point_rows = [], [], []
+    offset = 0
+    for player in players:
+        data = get_player_data(player)
+        shots.append(data.sheet('Shots', columns=shot_cols).assign(player=player))
+        points.append(data.sheet('Points', columns=point_cols).assign(player=player))
+        # each player's shot -> point index, shifted to the concatenated Points table
+        rows = data.point_index
+        point_rows.append(np.where(rows >= 0, rows + offset, -1))
+        offset += len(points[-1])
+
+    placement, labels = serve_placements(
+        pd.concat(shots, ignore_index=True), pd.concat(points, ignore_index=True), by=['player'],
+        point_rows=np.concatenate(point_rows)
+    )
+    placement_groups = dict(list(placement.groupby(['player', 'Type'], observed=True)))
+    label_groups = dict(list(labels.groupby(['player', 'Type'], observed=True)))
+    for player in players:
+        for serve_type in SERVE_TYPES:
+            key = (player, serve_type)
+            write_placement_jsons(
+                placement_groups.get(key, placement.iloc[:0]), label_groups.get(key, labels.iloc[:0]),
+                serve_type, os.path.join(out_dir, player)
+            )
+        print(f"Wrote serve placement JSONs for {player}")
+
+
+def player_report(player_name, out_dir='data'):
+    """The single-player notebook flow: print serve stats and write placement JSONs to out_dir"""
+    # Each sheet is loaded once per process, shared with anything else reading this player
+    match_data = get_player_data(player_name)
+    combined_data_shots = match_data.shots
+    combined_data_points = match_data.points
+    combined_data_games = match_data.games
+    combined_data_stats = match_data.stats
+
+    avg_service_game_duration = average_service_time(combined_data_games)
+    average_games_held = str(service_games_won_percentage(combined_data_games)) + '%'
+    breakpoints_saved_percentage = str(breakpoints_saved_function(combined_data_points)) + '%'
+    aces = average_aces(combined_data_stats)
+    double_faults = average_doubleFaults(combined_data_stats)
+
+    first_serves = find_stat(combined_data_stats, '1st Serves')
+    first_serves_in = find_stat(combined_data_stats, '1st Serves In')
+    first_serves_won = find_stat(combined_data_stats, '1st Serves Won')
+
+    second_serves = find_stat(combined_data_stats, '2nd Serves')
+    second_serves_in = find_stat(combined_data_stats, '2nd Serves In')
+    second_serves_won = find_stat(combined_data_stats, '2nd Serves Won')
+
+    first_serve_in_percentage = int(round((first_serves_in / first_serves) * 100, 0))
+    first_serve_won_percentage = int(round((first_serves_won / first_serves_in) * 100, 0))
+    second_serve_in_percentage = int(round((second_serves_in / second_serves) * 100, 0))
+    second_serve_won_percentage = int(round((second_serves_won / second_serves_in) * 100, 0))
+
+    print(f"Serve Performance Summary for {player_name}:\n")
+    print(f"  1st Serve In %:        {first_serve_in_percentage}%")
+    print(f"  1st Serve Won %:       {first_serve_won_percentage}%")
+    print(f"  2nd Serve In %:        {second_serve_in_percentage}%")
+    print(f"  2nd Serve Won %:       {second_serve_won_percentage}%")
+    print(f"  Avg Service Game:      {avg_service_game_duration}")
+    print(f"  Service Games Held:    {average_games_held}")
+    print(f"  Break Points Saved:    {breakpoints_saved_percentage}")
+    print(f"  Aces / Match:          {aces}")
+    print(f"  Double Faults / Match: {double_faults}")
+
+    for serve_type in SERVE_TYPES:
+        zone_counts, zone_win_percentages = serve_placement_labels(
+            combined_data_shots, combined_data_points, serve_type, match_data.point_index
+        )
+        print(f"  {serve_type} zones:   {zone_counts}")
+        generate_placement_jsons(combined_data_shots, combined_data_points, serve_type, out_dir, match_data.point_index)
 
 
-# Formatted ratings
-first_serve_in_percentage_rating_updated = '+' + str(first_serve_in_percentage_rating) + '%'
-first_serve_won_percentage_rating_updated = '+' + str(first_serve_won_percentage_rating) + '%'
-second_serve_won_percentage_rating_updated = '+' + str(second_serve_won_percentage_rating) + '%'
-service_games_won_percentage_rating_updated = '+' + str(service_games_won_percentage_rating) + '%'
-aces_average_rating_updated = '+' + str(aces_average_rating)
-doubleFaults_average_rating_updated = '-' + str(doubleFaults_average_rating)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve statistics and placement JSONs")
+    parser.add_argument("players", nargs="*", help="player folder names in data/mens")
+    parser.add_argument("--all", action="store_true", help="batch mode: placement JSONs for every player (or the ones listed)")
+    parser.add_argument("--out", default=None, help="output folder (default: ./data, or scouting/data/<player>/ in batch mode)")
+    args = parser.parse_args()
 
+    if args.all:
+        generate_all_placement_jsons(args.players or available_players(), args.out or os.path.join(script_dir, 'data'))
+    elif len(args.players) == 1:
+        player_report(args.players[0], args.out or 'data')
+    else:
+        parser.error("give one player, or --all for batch mode")
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# match_store comes from season_report via serve_distribution's own import
+from serve_distribution import SERVE_TYPES, classify_zones, match_store, serve_placements, with_point_attributes
+
+
+def classify_zone_split(x, y):
+    """The original one-serve-at-a-time classifier, kept as the reference"""
+    sign = x * y
+    if (x < -105) or (x > 105):
+        return ['Ad', 'Wide'] if sign > 0 else ['Deuce', 'Wide']
+    elif (-105 <= x <= -52.5) or (52.5 <= x <= 105):
+        return ['Ad', 'Body'] if sign > 0 else ['Deuce', 'Body']
+    elif -52.5 < x < 52.5:
+        return ['Ad', 'T'] if sign > 0 else ['Deuce', 'T']
+    return [np.nan, np.nan]
+
+
+EDGES = [0.0, 52.5, 105.0]
+XS = sorted({s * v for v in EDGES + [e + d for e in EDGES for d in (-1e-9, 1e-9)] + [26.0, 80.0, 150.0] for s in (1, -1)})
+
+
+@pytest.mark.parametrize("y", [-120.0, -0.5, 0.0, 0.5, 120.0, np.nan])
+def test_classify_zones_matches_the_row_classifier(y):
+    xs = np.array(XS + [np.nan])
+    side, zone = classify_zones(xs, np.full(len(xs), y))
+    got = [[s, z] for s, z in zip(side.astype(object), zone.astype(object))]
+    expected = [classify_zone_split(x, y) for x in xs]
+    assert pd.isna(got[-1]).all() and pd.isna(expected[-1]).all()
+    assert got[:-1] == expected[:-1]
+
+
+def test_classify_zones_on_random_serves():
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(-200, 200, 2000), rng.uniform(-300, 300, 2000)
+    side, zone = classify_zones(pd.Series(x), pd.Series(y))
+    assert [list(p) for p in zip(side, zone)] == [classify_zone_split(a, b) for a, b in zip(x, y)]
+    assert list(zone.categories) == ['Body', 'T', 'Wide']
+
+
+def player_match(seed, source, points=40):
+    """Random Shots/Points for one match: a serve (first or second) plus a return on each point"""
+    rng = np.random.default_rng(seed)
+    keys = {"Point": np.arange(1, points + 1), "Game": np.repeat(np.arange(1, points // 4 + 1), 4)[:points], "Set": 1}
+    points_df = pd.DataFrame({
+        **keys,
+        "Match Server": rng.choice(["host", "guest"], points, p=[0.8, 0.2]),
+        "Point Winner": rng.choice(["host", "guest"], points),
+        "Detail": rng.choice(["Ace", "Winner", "Error"], points),
+        "__source_file__": source,
+    })
+    serves = pd.DataFrame({
+        **keys,
+        "Player": "Server",
+        "Type": rng.choice(["first_serve", "second_serve"], points),
+        "Result": rng.choice(["In", "Out"], points, p=[0.7, 0.3]),
+        "Bounce (x)": rng.uniform(-4.1, 4.1, points),
+        "Bounce (y)": rng.uniform(6, 17.8, points),
+    })
+    returns = serves.assign(Type="return", Result="In")
+    shots = pd.concat([serves, returns], ignore_index=True).sort_values(["Point"], kind="stable")
+    return shots.assign(__source_file__=source).reset_index(drop=True), points_df
+
+
+def test_placements_by_player_match_each_player_alone():
+    players = {"Rudy Quan": player_match(1, "a.xlsx"), "Kaylan Bigun": player_match(2, "a.xlsx", points=24)}
+    shots = pd.concat([s.assign(player=p) for p, (s, _) in players.items()], ignore_index=True)
+    points = pd.concat([pts.assign(player=p) for p, (_, pts) in players.items()], ignore_index=True)
+
+    placement, labels = serve_placements(shots, points, by=["player"])
+
+    for player, (player_shots, player_points) in players.items():
+        alone_placement, alone_labels = serve_placements(player_shots, player_points)
+        for serve_type in SERVE_TYPES:
+            got = placement[(placement["player"] == player) & (placement["Type"] == serve_type)]
+            want = alone_placement[alone_placement["Type"] == serve_type]
+            pd.testing.assert_frame_equal(got.drop(columns="player").reset_index(drop=True),
+                                          want.reset_index(drop=True))
+
+            got = labels[(labels["player"] == player) & (labels["Type"] == serve_type)]
+            want = alone_labels[alone_labels["Type"] == serve_type]
+            assert len(want) > 0
+            pd.testing.assert_frame_equal(got.drop(columns="player").reset_index(drop=True),
+                                          want.reset_index(drop=True))
+
+
+def test_point_attributes_match_an_inner_merge():
+    shots, points = player_match(3, "a.xlsx")
+    shots.loc[shots.index[-3:], "Point"] = 99          # shots whose point wasn't recorded
+    keys = ["Point", "Game", "Set", "__source_file__"]
+    columns = ["Point Winner", "Match Server", "Detail"]
+
+    got = with_point_attributes(shots, points, columns)
+    want = shots.merge(points[keys + columns], on=keys, how="inner")
+    pd.testing.assert_frame_equal(got, want)
+
+    # a precomputed index (PlayerMatchData.point_index) gives the same placements
+    rows = match_store.build_point_index(shots, points)
+    for a, b in zip(serve_placements(shots, points), serve_placements(shots, points, point_rows=rows)):
+        pd.testing.assert_frame_equal(a, b)
@@ -0,0 +1,2 @@
+# season_report modules import each other by name (from schema import ...). Having a
+# conftest here makes pytest put this folder on sys.path for season_report/tests.
@@ -1,67 +1,206 @@
-import os
-import pandas as pd
-
-# Get the script's directory and build absolute path
-script_dir = os.path.dirname(os.path.abspath(__file__))
-base_path = os.path.join(script_dir, "..", "data", "mens")
-target_sheets = ["Settings", "Shots", "Points", "Games", "Sets", "Stats"]
-def create_combined():
-    """
-        For each player in data/mens, creates a combined .xlsx of all their matches.
-        Prints in terminal which matches + tabs have been analyzed.
-    """
-    for player in os.listdir(base_path):
-        player_folder = os.path.join(base_path, player)
-        if os.path.isdir(player_folder):
-            combined_sheets = {sheet: [] for sheet in target_sheets}
-
-            # Collect data from each file
-            for file in os.listdir(player_folder):
-                file_path = os.path.join(player_folder, file)
-                missing = []
-                combined = []
-                empty = []
-                if file.endswith(".xlsx") and file != "combined.xlsx":
-                    try:
-                        print(f"Reading {file_path}...")  # Debugging
-                        xls = pd.read_excel(file_path, sheet_name=None)
-                        for sheet in target_sheets:
-                            if sheet in xls:
-                                df = xls[sheet]
-                                if not df.empty:  # Check if the sheet has any data
-                                    #print(f"Adding data from {file} - {sheet}")  # Debugging
-                                    df['__source_file__'] = file  # Optional: source file column
-                                    combined_sheets[sheet].append(df)
-                                    combined.append(sheet)
-                                else:
-                                    empty.append(sheet)
-                                    #print(f"Sheet {sheet} in {file} is empty")  # Debugging
-                            else:
-                                missing.append(sheet)
-                                #print(f"Sheet {sheet} missing in {file}")  # Debugging
-                    except Exception as e:
-                        print(f"Error with {file_path}: {e}")
-                    print('------------------------------------------------------------------------')
-                    print(f'Successfully accessed {file}')
-                    print(f'Missing: {missing}, Empty: {empty}, Combined: {combined}')
-                    print('------------------------------------------------------------------------')
-
-            # Filter out empty lists for each sheet
-            sheets_to_write = {
-                sheet: pd.concat(dfs, ignore_index=True)
-                for sheet, dfs in combined_sheets.items()
-                if dfs  # Only include sheets with actual data
-            }
-
-            # Only write if there's at least one sheet with data
-            if sheets_to_write:
-                output_file = os.path.join(player_folder, "combined.xlsx")
-                with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-                    for sheet, df in sheets_to_write.items():
-                        df.to_excel(writer, sheet_name=sheet, index=False)
-                print(f"Created combined.xlsx for {player} with sheets: {list(sheets_to_write.keys())}")
-            else:
-                print(f"No valid data found for {player}, skipping combined.xlsx")
-
-
-create_combined()
+import os
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+import match_store
+import xlsx_stream
+
+logger = logging.getLogger(__name__)
+
+# Get the script's directory and build absolute path
+script_dir = os.path.dirname(os.path.abspath(__file__))
+base_path = os.path.join(script_dir, "..", "data", "mens")
+target_sheets = match_store.SHEETS
+
+
+def read_match(file_path):
+    """
+        Reads the target sheets of one SwingVision export.
+        Returns ({sheet: DataFrame}, missing, empty).
+    """
+    file = os.path.basename(file_path)
+    sheets, missing, empty = {}, [], []
+    xls = pd.read_excel(file_path, sheet_name=None)
+    for sheet in target_sheets:
+        if sheet in xls:
+            df = xls[sheet]
+            if not df.empty:  # Check if the sheet has any data
+                df['__source_file__'] = file  # Optional: source file column
+                sheets[sheet] = df
+            else:
+                empty.append(sheet)
+        else:
+            missing.append(sheet)
+    return sheets, missing, empty
+
+
+def stream_match(file_path, player_folder):
+    """
+        Streams every target sheet of one export straight into the match store, batch by
+        batch, without ever building the whole workbook as DataFrames.
+        Returns (combined, missing, empty) sheet names like read_match.
+    """
+    file = os.path.basename(file_path)
+    combined, missing, empty = [], [], []
+    with xlsx_stream.open_workbook(file_path) as wb:
+        for sheet in target_sheets:
+            if sheet not in wb.sheetnames:
+                missing.append(sheet)
+                match_store.write_sheet_batches(player_folder, file, sheet, [])
+            elif match_store.write_sheet_batches(player_folder, file, sheet, xlsx_stream.iter_batches(wb[sheet])):
+                combined.append(sheet)
+            else:
+                empty.append(sheet)
+    match_store.write_point_index(player_folder, file)
+    return combined, missing, empty
+
+
+def parse_workbook(player_folder, file, keep_frames=False):
+    """
+        Parses one workbook and writes it to the match store (streamed sheet by sheet,
+        unless the frames are needed for combined.xlsx). Runs in a worker process,
+        so it returns a plain record instead of printing: player, file, status, seconds,
+        combined/missing/empty sheets, the manifest entry, and the error if it failed.
+        The parsed frames are only sent back when keep_frames is set.
+    """
+    file_path = os.path.join(player_folder, file)
+    record = {"player": os.path.basename(player_folder), "file": file,
+              "combined": [], "missing": [], "empty": [], "error": None}
+    start = time.perf_counter()
+    try:
+        if keep_frames or not match_store.HAVE_ARROW:
+            sheets, record["missing"], record["empty"] = read_match(file_path)
+            match_store.write_match(player_folder, file, sheets)
+            record["combined"] = list(sheets)
+            record["frames"] = sheets
+        else:
+            record["combined"], record["missing"], record["empty"] = stream_match(file_path, player_folder)
+        record["entry"] = match_store.manifest_entry(file_path)
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def parse_all(jobs, workers=None, keep_frames=False):
+    """
+        parse_workbook() for every (player_folder, file) job, fanned out over a process
+        pool (workers=1 parses in this process). Records come back in job order
+        regardless of which worker finished first.
+    """
+    if workers == 1 or len(jobs) <= 1:
+        return [parse_workbook(folder, file, keep_frames) for folder, file in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(parse_workbook, folder, file, keep_frames) for folder, file in jobs]
+        return [future.result() for future in futures]
+
+
+def log_summary(records):
+    """One line per parsed workbook, slowest first, then totals"""
+    for r in sorted(records, key=lambda r: r["seconds"], reverse=True):
+        if r["status"] == "ok":
+            logger.info(f"  ok     {r['seconds']:6.2f}s  {r['player']}/{r['file']}  "
+                        f"combined={r['combined']} missing={r['missing']} empty={r['empty']}")
+        else:
+            logger.error(f"  error  {r['seconds']:6.2f}s  {r['player']}/{r['file']}  {r['error']}")
+    failed = sum(r["status"] != "ok" for r in records)
+    total = sum(r["seconds"] for r in records)
+    logger.info(f"Parsed {len(records)} workbooks ({failed} failed), {total:.1f}s of parse time")
+
+
+def create_combined(write_xlsx=False, full=False, workers=None):
+    """
+        For each player in data/mens, stores every match in the columnar match store
+        (see match_store.py) and optionally also writes a combined .xlsx of all their matches.
+        Only workbooks that are new or changed since the last run (per the store's manifest)
+        are parsed; matches whose workbook was deleted are dropped. full=True re-parses everything.
+        Workbooks from all players are parsed in parallel (workers processes, default one per core).
+        Returns the per-file parse records.
+    """
+    incremental = match_store.HAVE_ARROW and not full
+    plans = {}
+    jobs = []
+    for player in sorted(os.listdir(base_path)):
+        player_folder = os.path.join(base_path, player)
+        if os.path.isdir(player_folder):
+            files = sorted(f for f in os.listdir(player_folder) if f.endswith(".xlsx") and f != "combined.xlsx")
+            manifest = match_store.load_manifest(player_folder) if incremental else {}
+            changed = [f for f in files if not match_store.is_unchanged(os.path.join(player_folder, f), manifest.get(f))]
+            deleted = (set(manifest) | match_store.stored_sources(player_folder)) - set(files)
+            plans[player] = (player_folder, files, manifest, changed, deleted)
+            jobs += [(player_folder, file) for file in changed]
+
+    keep_frames = write_xlsx and not match_store.HAVE_ARROW
+    records = parse_all(jobs, workers, keep_frames)
+    by_player = {}
+    for record in records:
+        by_player.setdefault(record["player"], []).append(record)
+
+    for player, (player_folder, files, manifest, changed, deleted) in plans.items():
+        parsed = by_player.get(player, [])
+        for record in parsed:
+            if record["status"] == "ok":
+                manifest[record["file"]] = record["entry"]
+
+        # Drop stored matches whose workbook is gone
+        for source in sorted(deleted):
+            logger.info(f"Removing {player}/{source} (workbook deleted)")
+            match_store.remove_match(player_folder, source)
+            manifest.pop(source, None)
+
+        if match_store.HAVE_ARROW:
+            match_store.save_manifest(player_folder, manifest)
+        logger.info(f"{player}: {len(changed)} parsed, {len(files) - len(changed)} unchanged, {len(deleted)} removed")
+
+        output_file = os.path.join(player_folder, "combined.xlsx")
+        if not write_xlsx or (not changed and not deleted and os.path.exists(output_file)):
+            continue
+
+        # Unchanged matches come from the store instead of being re-parsed
+        if match_store.HAVE_ARROW:
+            sheets_to_write = {
+                sheet: df
+                for sheet, df in match_store.load_sheets(player, base_path=base_path).items()
+                if not df.empty
+            }
+        else:
+            # Filter out empty lists for each sheet
+            combined_sheets = {sheet: [] for sheet in target_sheets}
+            for record in parsed:
+                for sheet, df in record.get("frames", {}).items():
+                    combined_sheets[sheet].append(df)
+            sheets_to_write = {
+                sheet: pd.concat(dfs, ignore_index=True)
+                for sheet, dfs in combined_sheets.items()
+                if dfs  # Only include sheets with actual data
+            }
+
+        # Only write if there's at least one sheet with data
+        if sheets_to_write:
+            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+                for sheet, df in sheets_to_write.items():
+                    df.to_excel(writer, sheet_name=sheet, index=False)
+            logger.info(f"Created combined.xlsx for {player} with sheets: {list(sheets_to_write.keys())}")
+        else:
+            logger.info(f"No valid data found for {player}, skipping combined.xlsx")
+
+    log_summary(records)
+    return records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the per-player match store from SwingVision exports")
+    parser.add_argument("--xlsx", action="store_true", help="also write the legacy combined.xlsx per player")
+    parser.add_argument("--full", action="store_true", help="re-parse every workbook, ignoring the manifest")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: one per core, 1 = serial)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if not match_store.HAVE_ARROW and not args.xlsx:
+        logger.error("pyarrow is not installed, so the match store can't be written; use --xlsx for combined.xlsx")
+    else:
+        create_combined(write_xlsx=args.xlsx, full=args.full, workers=args.workers)
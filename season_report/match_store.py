@@ -0,0 +1,314 @@
+"""
+Columnar store for SwingVision match data.
+
+getdata.py writes every parsed match workbook here as one Parquet file per
+sheet, partitioned by player and source file:
+
+    data/mens/<player>/store/<Sheet>/<source_file>.parquet
+    data/mens/<player>/store/PointIndex/<source_file>.parquet
+    data/mens/<player>/store/manifest.json
+
+The manifest records size, mtime and sha256 of every stored workbook so
+getdata.py only re-parses exports that were added or changed. PointIndex
+holds, for every shot, the row of its point in that match's Points sheet, so
+analytics can pull point attributes by array indexing instead of merging
+Shots and Points on (Point, Game, Set, __source_file__) every time.
+
+Loaders read only the columns they ask for, so pulling the serve columns of
+the Shots sheet no longer means parsing every sheet of combined.xlsx.
+
+pyarrow is optional. Without it nothing is written and load_sheet() falls
+back to reading combined.xlsx, exactly like the old code did.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from schema import apply_schema
+
+try:
+    import pyarrow  # noqa: F401  (needed by pandas' parquet engine)
+    import pyarrow.parquet  # noqa: F401
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+BASE_PATH = os.path.join(script_dir, "..", "data", "mens")
+SHEETS = ["Settings", "Shots", "Points", "Games", "Sets", "Stats"]
+STORE_DIR = "store"
+MANIFEST = "manifest.json"
+SOURCE_COLUMN = "__source_file__"
+INDEX_DIR = "PointIndex"
+POINT_KEYS = ["Point", "Game", "Set"]
+
+
+def store_path(player_folder, sheet=None):
+    path = os.path.join(player_folder, STORE_DIR)
+    return os.path.join(path, sheet) if sheet else path
+
+
+def _part_path(player_folder, sheet, source_file):
+    return os.path.join(store_path(player_folder, sheet), source_file + ".parquet")
+
+
+def _arrow_safe(df):
+    """Object columns holding mixed types (e.g. True and 'No') become strings so Parquet can type them"""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            values = df[col].dropna()
+            if values.map(type).nunique() > 1:
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def write_match(player_folder, source_file, sheets):
+    """
+    Store the parsed sheets of one match workbook ({sheet: DataFrame}).
+    Sheets missing from this workbook get any older part removed.
+    """
+    if not HAVE_ARROW:
+        return
+    for sheet in SHEETS:
+        path = _part_path(player_folder, sheet, source_file)
+        df = sheets.get(sheet)
+        if df is None or df.empty:
+            if os.path.exists(path):
+                os.remove(path)
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        _arrow_safe(df).to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+    write_point_index(player_folder, source_file)
+
+
+def _concat_tables(tables):
+    """Concatenate per-batch Arrow tables, widening types that differ between batches"""
+    import pyarrow as pa
+
+    try:
+        return pa.concat_tables(tables, promote_options="permissive")
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # e.g. a column that is numeric in one batch and text in another
+        frames = [t.to_pandas() for t in tables]
+        return pa.Table.from_pandas(_arrow_safe(pd.concat(frames, ignore_index=True)), preserve_index=False)
+
+
+def write_sheet_batches(player_folder, source_file, sheet, batches):
+    """
+    Store one sheet of a match from an iterator of DataFrame batches (see
+    xlsx_stream.py). Each batch is converted to Arrow as it arrives, so only the
+    compact columnar copy of the sheet is ever held. Returns the row count.
+    """
+    import pyarrow as pa
+
+    path = _part_path(player_folder, sheet, source_file)
+    tables = [
+        pa.Table.from_pandas(_arrow_safe(batch.assign(**{SOURCE_COLUMN: source_file})), preserve_index=False)
+        for batch in batches
+    ]
+    rows = sum(t.num_rows for t in tables)
+    if not rows:
+        if os.path.exists(path):
+            os.remove(path)
+        return 0
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    pa.parquet.write_table(_concat_tables(tables), tmp)
+    os.replace(tmp, path)
+    return rows
+
+
+def iter_sheet_batches(player, sheet, columns=None, batch_size=65536, base_path=BASE_PATH, typed=True):
+    """Stored sheet as DataFrame batches, one source file after another, for bounded-memory analytics"""
+    import pyarrow.parquet as pq
+
+    folder = store_path(os.path.join(base_path, player), sheet)
+    if not os.path.isdir(folder):
+        return
+    for part in sorted(f for f in os.listdir(folder) if f.endswith(".parquet")):
+        pf = pq.ParquetFile(os.path.join(folder, part))
+        present = [c for c in columns if c in pf.schema_arrow.names] if columns is not None else None
+        for batch in pf.iter_batches(batch_size=batch_size, columns=present):
+            df = batch.to_pandas()
+            if columns is not None:
+                df = df.reindex(columns=columns)
+            yield apply_schema(df, sheet) if typed else df
+
+
+def remove_match(player_folder, source_file):
+    """Drop every stored sheet of a workbook that no longer exists"""
+    for sheet in SHEETS + [INDEX_DIR]:
+        path = _part_path(player_folder, sheet, source_file)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def stored_sources(player_folder):
+    """Source file names that have at least one stored sheet"""
+    sources = set()
+    for sheet in SHEETS:
+        folder = store_path(player_folder, sheet)
+        if os.path.isdir(folder):
+            sources.update(f[: -len(".parquet")] for f in os.listdir(folder) if f.endswith(".parquet"))
+    return sources
+
+
+# ── manifest ────────────────────────────────────────────────────────────────
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(player_folder):
+    """{source_file: {"size", "mtime", "sha256"}} for the stored workbooks"""
+    try:
+        with open(os.path.join(store_path(player_folder), MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(player_folder, manifest):
+    path = os.path.join(store_path(player_folder), MANIFEST)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def is_unchanged(path, entry):
+    """
+    Whether a workbook matches its manifest entry. size + mtime is the fast
+    path; the hash is only computed when those differ (e.g. a re-copied file),
+    and the entry's stat fields are refreshed when the content turns out equal.
+    """
+    if not entry:
+        return False
+    stat = os.stat(path)
+    if stat.st_size == entry["size"] and stat.st_mtime == entry["mtime"]:
+        return True
+    if stat.st_size == entry["size"] and file_hash(path) == entry["sha256"]:
+        entry["mtime"] = stat.st_mtime
+        return True
+    return False
+
+
+def manifest_entry(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": file_hash(path)}
+
+
+# ── shot -> point index ─────────────────────────────────────────────────────
+def build_point_index(shots, points, by=(SOURCE_COLUMN,)):
+    """
+    Row position in `points` of each shot's point, matched on Point/Game/Set plus
+    the `by` columns; -1 where the match has no such point.
+    """
+    keys = list(by) + POINT_KEYS
+    point_keys = pd.MultiIndex.from_frame(points[keys].astype(object))
+    first = ~point_keys.duplicated()
+    rows = np.flatnonzero(first)
+    pos = point_keys[first].get_indexer(pd.MultiIndex.from_frame(shots[keys].astype(object)))
+    return np.where(pos >= 0, rows[pos], -1)
+
+
+def write_point_index(player_folder, source_file):
+    """Index one stored match's Shots against its Points (both must already be written)"""
+    shots_path = _part_path(player_folder, "Shots", source_file)
+    points_path = _part_path(player_folder, "Points", source_file)
+    path = _part_path(player_folder, INDEX_DIR, source_file)
+    if not os.path.exists(shots_path):
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    shots = pd.read_parquet(shots_path, columns=POINT_KEYS)
+    if os.path.exists(points_path):
+        rows = build_point_index(shots, pd.read_parquet(points_path, columns=POINT_KEYS), by=())
+    else:
+        rows = np.full(len(shots), -1)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    pd.DataFrame({"point_row": rows.astype("int32")}).to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def load_point_index(player, base_path=BASE_PATH):
+    """
+    For every row of load_sheet(player, "Shots"), the row of its point in
+    load_sheet(player, "Points"), or -1. Matches stored before the index existed
+    are indexed on first use.
+    """
+    import pyarrow.parquet as pq
+
+    player_folder = os.path.join(base_path, player)
+    shots_dir = store_path(player_folder, "Shots")
+    points_dir = store_path(player_folder, "Points")
+    shot_parts = sorted(f for f in os.listdir(shots_dir) if f.endswith(".parquet")) if os.path.isdir(shots_dir) else []
+    point_parts = sorted(f for f in os.listdir(points_dir) if f.endswith(".parquet")) if os.path.isdir(points_dir) else []
+
+    # Points rows before each match in the concatenated sheet
+    offsets, total = {}, 0
+    for part in point_parts:
+        offsets[part] = total
+        total += pq.ParquetFile(os.path.join(points_dir, part)).metadata.num_rows
+
+    chunks = []
+    for part in shot_parts:
+        source = part[: -len(".parquet")]
+        path = _part_path(player_folder, INDEX_DIR, source)
+        if not os.path.exists(path):
+            write_point_index(player_folder, source)
+        rows = pd.read_parquet(path)["point_row"].to_numpy(dtype="int64")
+        chunks.append(np.where(rows >= 0, rows + offsets.get(part, 0), -1))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype="int64")
+
+
+def has_store(player, base_path=BASE_PATH):
+    return HAVE_ARROW and os.path.isdir(store_path(os.path.join(base_path, player)))
+
+
+def load_sheet(player, sheet, columns=None, base_path=BASE_PATH, typed=True):
+    """
+    One sheet for a player across all matches, reading only `columns`.
+    Matches are concatenated in source file name order. With typed (the
+    default) columns get their compact schema.py dtypes.
+    """
+    player_folder = os.path.join(base_path, player)
+    if not has_store(player, base_path):
+        df = pd.read_excel(os.path.join(player_folder, "combined.xlsx"), sheet_name=sheet, usecols=columns)
+        return apply_schema(df, sheet) if typed else df
+
+    import pyarrow.parquet as pq
+
+    folder = store_path(player_folder, sheet)
+    parts = sorted(f for f in os.listdir(folder) if f.endswith(".parquet")) if os.path.isdir(folder) else []
+    frames = []
+    for part in parts:
+        path = os.path.join(folder, part)
+        if columns is not None:
+            present = set(pq.read_schema(path).names)
+            frames.append(pd.read_parquet(path, columns=[c for c in columns if c in present]))
+        else:
+            frames.append(pd.read_parquet(path))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    df = pd.concat(frames, ignore_index=True)
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    return apply_schema(df, sheet) if typed else df
+
+
+def load_sheets(player, sheets=SHEETS, base_path=BASE_PATH, typed=True):
+    """{sheet: DataFrame} for a player, like pd.read_excel(combined.xlsx, sheet_name=None)"""
+    return {sheet: load_sheet(player, sheet, base_path=base_path, typed=typed) for sheet in sheets}
@@ -0,0 +1,100 @@
+"""
+Lazy, memoized access to one player's SwingVision data.
+
+    data = get_player_data("Rudy Quan")
+    data.points                                  # loaded on first access, then reused
+    data.sheet("Shots", columns=["Type", "Result"])
+    data.shot_points(["Point Winner", "Match Server"])  # point attributes per shot, no merge
+
+Sheets come from the columnar match store (match_store.py). Without a store
+the player's combined.xlsx is opened once and each sheet is parsed the first
+time it is asked for. Either way sheets get the compact dtypes from
+schema.py. get_player_data() is cached, so a report run that touches the
+same player from several places loads it exactly once.
+"""
+
+from functools import lru_cache
+import os
+
+import numpy as np
+import pandas as pd
+
+import match_store
+from schema import apply_schema
+
+
+class PlayerMatchData:
+    def __init__(self, player, base_path=match_store.BASE_PATH):
+        self.player = player
+        self.base_path = base_path
+        self._sheets = {}
+        self._workbook = None
+        self._point_index = None
+
+    def _read(self, name, columns):
+        if match_store.has_store(self.player, self.base_path):
+            return match_store.load_sheet(self.player, name, columns, base_path=self.base_path)
+        if self._workbook is None:
+            self._workbook = pd.ExcelFile(os.path.join(self.base_path, self.player, "combined.xlsx"))
+        return apply_schema(self._workbook.parse(name, usecols=columns), name)
+
+    def sheet(self, name, columns=None):
+        """A sheet across all the player's matches; with `columns`, only those columns"""
+        if name in self._sheets:
+            df = self._sheets[name]
+            return df if columns is None else df.reindex(columns=columns)
+        if columns is not None:
+            return self._read(name, columns)
+        self._sheets[name] = self._read(name, None)
+        return self._sheets[name]
+
+    def sheets(self):
+        """{sheet: DataFrame} for every sheet, like pd.read_excel(combined.xlsx, sheet_name=None)"""
+        return {name: self.sheet(name) for name in match_store.SHEETS}
+
+    @property
+    def point_index(self):
+        """Row in `points` of every shot's point (-1 if none); persisted in the store, built once otherwise"""
+        if self._point_index is None:
+            if match_store.has_store(self.player, self.base_path):
+                self._point_index = match_store.load_point_index(self.player, self.base_path)
+            else:
+                self._point_index = match_store.build_point_index(self.shots, self.points)
+        return self._point_index
+
+    def shot_points(self, columns):
+        """Points columns aligned row-for-row with `shots` (NaN for shots without a point)"""
+        rows = self.point_index
+        has_point = rows >= 0
+        attrs = self.points[columns].iloc[np.where(has_point, rows, 0)].reset_index(drop=True)
+        return attrs.where(pd.Series(has_point), axis=0) if not has_point.all() else attrs
+
+    @property
+    def settings(self):
+        return self.sheet("Settings")
+
+    @property
+    def shots(self):
+        return self.sheet("Shots")
+
+    @property
+    def points(self):
+        return self.sheet("Points")
+
+    @property
+    def games(self):
+        return self.sheet("Games")
+
+    @property
+    def sets(self):
+        return self.sheet("Sets")
+
+    @property
+    def stats(self):
+        return self.sheet("Stats")
+
+
+@lru_cache(maxsize=None)
+def get_player_data(player, base_path=match_store.BASE_PATH):
+    """Process-wide PlayerMatchData for a player"""
+    return PlayerMatchData(player, base_path)
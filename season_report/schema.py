@@ -0,0 +1,187 @@
+"""
+Compact dtypes for SwingVision sheets.
+
+Every loader (match store, combined.xlsx fallback, streamed batches) runs
+its frames through apply_schema(), so each page works with the same types:
+
+    closed vocabularies (Type, Result, Match Server, ...)  -> categorical, validated
+    names and labels (Player, Stat Name, __source_file__)  -> categorical
+    point/game/set numbers and scores                      -> int8 / int16
+    court coordinates and speeds                           -> float32
+    true/false flags                                       -> bool
+
+A value outside a closed vocabulary, a fractional or out-of-range number in an
+int column, or a non-boolean flag raises SchemaError naming the sheet and
+column. New SwingVision values should be added to the lists below.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def one_of(*values):
+    """Categorical restricted to (and validated against) these values"""
+    return pd.CategoricalDtype(list(values))
+
+
+CATEGORY = "category"
+
+PLAYER_SIDE = one_of("host", "guest")
+WINNER = one_of("host", "guest", "draw")
+DEPTH = one_of("deep", "short", "out")
+ZONE = one_of("ad", "ad_alley", "ad_out", "center_line", "deuce", "deuce_alley", "deuce_out")
+SIDE = one_of("near", "far", "net")
+GAME_SCORE = one_of("0", "15", "30", "40", "AD")
+
+SHEET_SCHEMAS = {
+    "Settings": {
+        "Host Team": CATEGORY,
+        "Guest Team": CATEGORY,
+        "Points": "int16",
+        "Games": "int16",
+        "Sets": "int8",
+        "Games per Set": "int8",
+        "Sets per Match": "int8",
+        "Ad Scoring": "bool",
+        "Match Tiebreak": "bool",
+    },
+    "Shots": {
+        "Player": CATEGORY,
+        "Shot": "int16",
+        "Type": one_of("serve", "first_serve", "second_serve", "return", "first_return", "second_return",
+                       "serve_plus_one", "return_plus_one", "in_play", "none"),
+        "Stroke": one_of("Forehand", "Backhand", "Serve", "Volley", "Overhead", "Feed"),
+        "Spin": one_of("Topspin", "Slice", "Flat", "Kick"),
+        "Speed (MPH)": "float32",
+        "Point": "int16",
+        "Game": "int8",
+        "Set": "int8",
+        "Bounce Depth": DEPTH,
+        "Bounce Zone": ZONE,
+        "Bounce Side": SIDE,
+        "Bounce (x)": "float32",
+        "Bounce (y)": "float32",
+        "Hit Depth": DEPTH,
+        "Hit Zone": ZONE,
+        "Hit Side": SIDE,
+        "Hit (x)": "float32",
+        "Hit (y)": "float32",
+        "Hit (z)": "float32",
+        "Direction": one_of("cross court", "down the line", "down the T", "inside in", "inside out",
+                            "out wide", "---"),
+        "Result": one_of("In", "Out", "Net"),
+        "Favorited": "bool",
+    },
+    "Points": {
+        "Point": "int16",
+        "Game": "int8",
+        "Set": "int8",
+        "Serve State": one_of("first", "second"),
+        "Match Server": PLAYER_SIDE,
+        "Host Game Score": GAME_SCORE,
+        "Guest Game Score": GAME_SCORE,
+        "Point Winner": PLAYER_SIDE,
+        "Detail": one_of("Ace", "Double Fault", "Service Winner", "Forehand Winner", "Backhand Winner",
+                         "Forehand Unforced Error", "Backhand Unforced Error"),
+        "Break Point": "bool",
+        "Set Point": "bool",
+        "Favorited": "bool",
+    },
+    "Games": {
+        "Game": "int8",
+        "Set": "int8",
+        "Server": PLAYER_SIDE,
+        "Host Set Score": "int8",
+        "Guest Set Score": "int8",
+        "Game Winner": WINNER,
+    },
+    "Sets": {
+        "Set": "int8",
+        "Host Score": "int8",
+        "Guest Score": "int8",
+        "Host Tiebreak Score": "int8",
+        "Guest Tiebreak Score": "int8",
+        "Set Winner": WINNER,
+        "Super Tiebreak": "bool",
+    },
+    "Stats": {
+        "Stat Name": CATEGORY,
+        # per-set values include distances (MI), so not integer counters; kept float64
+        # because reports print averages of them and float32 shows as 0.6000000238
+        **{f"{side} Set {n}": "float64" for n in range(1, 6) for side in ("Host", "Guest")},
+    },
+}
+
+# Columns added by getdata.py to every sheet
+COMMON_SCHEMA = {"__source_file__": CATEGORY}
+
+_BOOLS = {True: True, False: False, "true": True, "false": False, "True": True, "False": False}
+
+
+def _fail(sheet, col, message):
+    raise SchemaError(f"{sheet}.{col}: {message}")
+
+
+def _to_int(s, dtype, sheet, col):
+    values = pd.to_numeric(s, errors="coerce")
+    if values.notna().sum() != s.notna().sum():
+        _fail(sheet, col, f"non-numeric values {sorted(map(str, s[values.isna() & s.notna()].unique()))[:5]}")
+    present = values.dropna()
+    if not (present == np.floor(present)).all():
+        _fail(sheet, col, "fractional values in an integer column")
+    info = np.iinfo(dtype)
+    if len(present) and (present.min() < info.min or present.max() > info.max):
+        _fail(sheet, col, f"values outside {dtype} range [{present.min()}, {present.max()}]")
+    # nullable Int8/Int16 only where there are gaps
+    return values.astype(dtype.capitalize() if values.isna().any() else dtype)
+
+
+def _to_float(s, dtype, sheet, col):
+    try:
+        return pd.to_numeric(s).astype(dtype)
+    except (ValueError, TypeError):
+        _fail(sheet, col, "non-numeric values")
+
+
+def _to_bool(s, sheet, col):
+    mapped = s.map(_BOOLS)
+    bad = s.notna() & mapped.isna()
+    if bad.any():
+        _fail(sheet, col, f"non-boolean values {sorted(map(str, s[bad].unique()))[:5]}")
+    return mapped.astype("boolean" if mapped.isna().any() else bool)
+
+
+def _to_category(s, dtype, sheet, col):
+    if isinstance(dtype, str):  # open "category"
+        return s.astype(CATEGORY)
+    # ints and strings of the same value (0 vs "0") must land on one category
+    text = s.where(s.isna(), s.astype(str))
+    unexpected = set(text.dropna().unique()) - set(dtype.categories)
+    if unexpected:
+        _fail(sheet, col, f"unexpected values {sorted(unexpected)}")
+    return text.astype(dtype)
+
+
+def convert(s, dtype, sheet="", col=""):
+    """One column to its schema dtype, raising SchemaError on values that don't fit"""
+    if isinstance(dtype, pd.CategoricalDtype) or dtype == CATEGORY:
+        return _to_category(s, dtype, sheet, col)
+    if dtype == "bool":
+        return _to_bool(s, sheet, col)
+    if dtype.startswith("int"):
+        return _to_int(s, dtype, sheet, col)
+    return _to_float(s, dtype, sheet, col)
+
+
+def apply_schema(df, sheet):
+    """Copy of df with every column known for this sheet converted; other columns are left alone"""
+    schema = {**SHEET_SCHEMAS.get(sheet, {}), **COMMON_SCHEMA}
+    df = df.copy()
+    for col, dtype in schema.items():
+        if col in df.columns:
+            df[col] = convert(df[col], dtype, sheet, col)
+    return df
@@ -1,50 +1,34 @@
+import os
+import sys
 import pandas as pd
 
-file_path = '/Users/joshuajpark/Desktop/tc/consulting-spring2025/data/mens/mens_results.csv'
-matches = pd.read_csv(file_path).drop_duplicates()
-matches['Date'] = pd.to_datetime(matches['Date'])
+script_dir = os.path.dirname(os.path.abspath(__file__))
 
-def count_sets_won(score_str):
-    if not isinstance(score_str, str):
-        return 0, 0
-    p1_sets = p2_sets = 0
-    for s in score_str.split(','):
-        s = s.strip()
-        parts = s.split('-')
-        if len(parts) < 2:
-            continue
-        try:
-            p1 = int(parts[0].split('(')[0])
-            p2 = int(parts[1].split('(')[0])
-        except:
-            continue
-        if p1 > p2:
-            p1_sets += 1
-        else:
-            p2_sets += 1
-    return p1_sets, p2_sets
+# match_index and scores are shared with the dashboard backend. They import normally
+# when dashboard/backend is on PYTHONPATH; otherwise the copy in this checkout is used.
+try:
+    from match_index import load_index
+    from scores import winners
+except ImportError:
+    sys.path.append(os.path.join(script_dir, '..', '..', '..', 'dashboard', 'backend'))
+    from match_index import load_index
+    from scores import winners
 
-def get_winner(row):
-    p1_sets, p2_sets = count_sets_won(row['Score'])
-    if p1_sets > p2_sets:
-        return row['Player1']
-    elif p2_sets > p1_sets:
-        return row['Player2']
-    else:
-        return None
+file_path = os.path.join(script_dir, '..', '..', '..', 'data', 'mens', 'mens_results.csv')
+index = load_index(file_path, drop_duplicates=True)
 
+# index.results is shared with every other load_index() caller, so Winner goes on a copy
+matches = index.results
 if 'Winner' not in matches.columns:
-    matches['Winner'] = matches.apply(get_winner, axis=1)
+    matches = matches.assign(Winner=winners(matches))
 
 def get_player_record_table(player_name):
     season_start = pd.Timestamp('2024-09-19')
     conf_start = pd.Timestamp('2025-03-07')
     conf_end = pd.Timestamp('2025-04-20')
     
-    player_matches = matches[
-        ((matches['Player1'] == player_name) | (matches['Player2'] == player_name)) &
-        (matches['Date'] >= season_start)
-    ]
+    player_matches = matches.iloc[index.rows(player_name)]
+    player_matches = player_matches[player_matches['Date'] >= season_start]
 
     player_conf_matches = player_matches[
         (player_matches['Date'] >= conf_start) & (player_matches['Date'] <= conf_end)
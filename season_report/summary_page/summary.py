@@ -1,3 +1,5 @@
+import os
+import sys
 import pandas as pd
 import re
 import json
@@ -20,27 +22,61 @@ parser.add_argument("player", help='''Use initials
     GB -> Gian''')
 args = parser.parse_args()
 
+# season_report modules: a normal import when season_report is on PYTHONPATH,
+# otherwise the folder above this one
+try:
+    from player_data import get_player_data
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from player_data import get_player_data
+# shared with the dashboard backend: a normal import when dashboard/backend is on
+# PYTHONPATH, otherwise the copy in this checkout
+try:
+    from match_index import load_index, COLLEGE_EVENTS
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'dashboard', 'backend'))
+    from match_index import load_index, COLLEGE_EVENTS
+
 # Non-Player Specific Data
-mens_results = pd.read_csv('../../data/mens/mens_results.csv')[:253]
-mens_results['Date'] = pd.to_datetime(mens_results['Date'])
+SEASON = 2024  # 2024-25
+mens_results = load_index('../../data/mens/mens_results.csv')
 
 # Class to run functions
 class gen:
     def __init__(self, player):
         self.player = player
-        self.combined_data_shots = pd.read_excel(f'../../data/mens/{player}/combined.xlsx', sheet_name='Shots')
-        self.combined_data_points = pd.read_excel(f'../../data/mens/{player}/combined.xlsx', sheet_name='Points')
-        self.combined_data_games = pd.read_excel(f'../../data/mens/{player}/combined.xlsx', sheet_name='Games')
-        self.combined_data_sets = pd.read_excel(f'../../data/mens/{player}/combined.xlsx', sheet_name='Sets')
-        self.combined_data_stats = pd.read_excel(f'../../data/mens/{player}/combined.xlsx', sheet_name='Stats')
-        self.combined_data_settings = pd.read_excel(f'../../data/mens/{player}/combined.xlsx', sheet_name='Settings')
+        self.data = get_player_data(player)
         
         self.results = None
         self.uclaresults = None
     
+    # Sheets are read from the player's data on first access
+    @property
+    def combined_data_shots(self):
+        return self.data.shots
+
+    @property
+    def combined_data_points(self):
+        return self.data.points
+
+    @property
+    def combined_data_games(self):
+        return self.data.games
+
+    @property
+    def combined_data_sets(self):
+        return self.data.sets
+
+    @property
+    def combined_data_stats(self):
+        return self.data.stats
+
+    @property
+    def combined_data_settings(self):
+        return self.data.settings
+
     def getmatches(self):
-        data = mens_results[(mens_results['Player1'] == self.player) | (mens_results['Player2'] == self.player)]
-        data = data[data['Event Name'].str.startswith(('Dual Match', '2024 ITA', '2024-25 NCAA Division'))]
+        data = mens_results.matches(self.player, events=COLLEGE_EVENTS, season=SEASON)
         self.results = data.reset_index()
 
         ucla = pd.read_csv('../../data/mens/matches_2025.csv')
@@ -0,0 +1,99 @@
+import os
+
+import pandas as pd
+import pytest
+
+import getdata
+import match_store
+from workbooks import export_sheets, write_export
+
+pytest.importorskip("pyarrow")
+
+PLAYER = "Rudy Quan"
+
+
+@pytest.fixture
+def base(tmp_path, monkeypatch):
+    """data/mens stand-in with one player and two exports"""
+    folder = tmp_path / PLAYER
+    folder.mkdir()
+    write_export(folder / "a.xlsx", export_sheets(points=4))
+    write_export(folder / "b.xlsx", export_sheets(points=2, opponent="Cal"))
+    monkeypatch.setattr(getdata, "base_path", str(tmp_path))
+    return tmp_path
+
+
+def parsed(records):
+    return sorted(r["file"] for r in records if r["status"] == "ok")
+
+
+def stored_points(base):
+    return match_store.load_sheet(PLAYER, "Points", base_path=str(base))
+
+
+def test_rerun_skips_unchanged_workbooks(base):
+    assert parsed(getdata.create_combined(workers=1)) == ["a.xlsx", "b.xlsx"]
+    assert len(stored_points(base)) == 6
+
+    assert getdata.create_combined(workers=1) == []
+    # a re-copied file (new mtime, same bytes) is recognised by its hash
+    os.utime(base / PLAYER / "a.xlsx", (1, 1))
+    assert getdata.create_combined(workers=1) == []
+    assert len(stored_points(base)) == 6
+
+
+def test_changed_workbook_is_reparsed(base):
+    getdata.create_combined(workers=1)
+    write_export(base / PLAYER / "b.xlsx", export_sheets(points=5, opponent="Cal"))
+
+    assert parsed(getdata.create_combined(workers=1)) == ["b.xlsx"]
+    points = stored_points(base)
+    assert points.groupby("__source_file__", observed=True).size().to_dict() == {"a.xlsx": 4, "b.xlsx": 5}
+
+
+def test_deleted_workbook_is_removed_from_the_store(base):
+    getdata.create_combined(workers=1)
+    os.remove(base / PLAYER / "a.xlsx")
+
+    assert getdata.create_combined(workers=1) == []
+    folder = str(base / PLAYER)
+    assert match_store.stored_sources(folder) == {"b.xlsx"}
+    assert list(match_store.load_manifest(folder)) == ["b.xlsx"]
+    assert set(stored_points(base)["__source_file__"]) == {"b.xlsx"}
+
+
+def test_full_reparses_everything(base):
+    getdata.create_combined(workers=1)
+    assert parsed(getdata.create_combined(workers=1, full=True)) == ["a.xlsx", "b.xlsx"]
+
+
+def test_combined_xlsx_is_only_rewritten_when_something_changed(base):
+    getdata.create_combined(write_xlsx=True, workers=1)
+    output = base / PLAYER / "combined.xlsx"
+    written = os.stat(output).st_mtime_ns
+
+    getdata.create_combined(write_xlsx=True, workers=1)
+    assert os.stat(output).st_mtime_ns == written
+
+
+def test_process_pool_matches_serial(base):
+    (base / PLAYER / "broken.xlsx").write_bytes(b"not a workbook")
+    other = base / "Kaylan Bigun"
+    other.mkdir()
+    write_export(other / "c.xlsx", export_sheets(points=3, opponent="Stanford"))
+
+    serial = getdata.create_combined(workers=1)
+    sheets = {p: match_store.load_sheets(p, base_path=str(base)) for p in (PLAYER, "Kaylan Bigun")}
+    pooled = getdata.create_combined(workers=2, full=True)
+
+    def strip(records):
+        return [{k: v for k, v in r.items() if k not in ("seconds", "entry")} for r in records]
+
+    # records come back in job order whichever worker finishes first
+    assert [(r["player"], r["file"]) for r in pooled] == [
+        ("Kaylan Bigun", "c.xlsx"), (PLAYER, "a.xlsx"), (PLAYER, "b.xlsx"), (PLAYER, "broken.xlsx")]
+    assert strip(pooled) == strip(serial)
+    assert pooled[-1]["status"] == "error"
+    for player, expected in sheets.items():
+        for sheet, df in match_store.load_sheets(player, base_path=str(base)).items():
+            pd.testing.assert_frame_equal(df, expected[sheet])
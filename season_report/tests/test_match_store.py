@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import match_store
+from schema import apply_schema
+
+pytest.importorskip("pyarrow")
+
+PLAYER = "Rudy Quan"
+
+
+def match_sheets(source, points=3):
+    """Sheets of one parsed workbook, the way getdata.py hands them to write_match"""
+    sheets = {
+        "Settings": pd.DataFrame({"Host Team": ["UCLA"], "Guest Team": ["USC"], "Ad Scoring": [True]}),
+        "Points": pd.DataFrame({
+            "Point": np.arange(1, points + 1),
+            "Game": [1] * points,
+            "Set": [1] * points,
+            "Match Server": ["host"] * points,
+            "Point Winner": ["host", "guest", "host"][:points],
+            "Favorited": [False, True, "false"][:points],
+        }),
+        "Shots": pd.DataFrame({
+            "Player": ["Rudy Quan", "Opponent", "Rudy Quan", "Rudy Quan"],
+            "Type": ["first_serve", "return", "second_serve", "first_serve"],
+            "Speed (MPH)": [110.5, 60.0, np.nan, 101.25],
+            "Point": [1, 1, 2, 9],
+            "Game": [1, 1, 1, 1],
+            "Set": [1, 1, 1, 1],
+        }),
+    }
+    return {name: df.assign(__source_file__=source) for name, df in sheets.items()}
+
+
+@pytest.fixture
+def store(tmp_path):
+    folder = tmp_path / PLAYER
+    folder.mkdir()
+    first, second = match_sheets("a.xlsx"), match_sheets("b.xlsx", points=2)
+    match_store.write_match(str(folder), "a.xlsx", first)
+    match_store.write_match(str(folder), "b.xlsx", second)
+    return tmp_path, first, second
+
+
+def expected(sheet, *matches):
+    return apply_schema(pd.concat([m[sheet] for m in matches], ignore_index=True), sheet)
+
+
+def test_round_trip(store):
+    base, first, second = store
+    assert match_store.has_store(PLAYER, base_path=str(base))
+    for sheet in ("Settings", "Points", "Shots"):
+        loaded = match_store.load_sheet(PLAYER, sheet, base_path=str(base))
+        pd.testing.assert_frame_equal(loaded, expected(sheet, first, second))
+    # sheets the workbooks didn't have come back empty
+    assert match_store.load_sheet(PLAYER, "Stats", base_path=str(base)).empty
+
+
+def test_load_columns(store):
+    base, first, second = store
+    loaded = match_store.load_sheet(PLAYER, "Shots", columns=["Speed (MPH)", "Hit (x)"], base_path=str(base))
+    assert list(loaded.columns) == ["Speed (MPH)", "Hit (x)"]
+    assert loaded["Speed (MPH)"].dtype == "float32"
+    assert loaded["Hit (x)"].isna().all()
+
+
+def test_iter_sheet_batches(store):
+    base, first, second = store
+    batches = list(match_store.iter_sheet_batches(PLAYER, "Points", batch_size=2, base_path=str(base)))
+    assert [len(b) for b in batches] == [2, 1, 2]
+    assert all(b["Point"].dtype == "int16" for b in batches)
+    # each batch has its own __source_file__ categories, so compare those as text
+    as_text = {"__source_file__": str}
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True).astype(as_text),
+                                  expected("Points", first, second).astype(as_text))
+
+
+def test_write_sheet_batches_with_mixed_batches(tmp_path):
+    folder = tmp_path / PLAYER
+    batches = [pd.DataFrame({"Point": [1, 2], "Note": [1, 2]}), pd.DataFrame({"Point": [3], "Note": ["let"]})]
+    assert match_store.write_sheet_batches(str(folder), "a.xlsx", "Points", iter(batches)) == 3
+    loaded = match_store.load_sheet(PLAYER, "Points", base_path=str(tmp_path))
+    assert loaded["Point"].tolist() == [1, 2, 3]
+    assert loaded["Note"].tolist() == ["1", "2", "let"]
+    assert (loaded["__source_file__"] == "a.xlsx").all()
+
+    assert match_store.write_sheet_batches(str(folder), "a.xlsx", "Points", iter([])) == 0
+    assert not os.path.exists(match_store._part_path(str(folder), "Points", "a.xlsx"))
+
+
+def test_point_index_matches_merge(store):
+    base, _, _ = store
+    shots = match_store.load_sheet(PLAYER, "Shots", base_path=str(base))
+    points = match_store.load_sheet(PLAYER, "Points", base_path=str(base))
+    rows = match_store.load_point_index(PLAYER, base_path=str(base))
+
+    keys = ["__source_file__", "Point", "Game", "Set"]
+    merged = shots[keys].astype(object).merge(
+        points[keys].astype(object).reset_index(names="point_row"), on=keys, how="left")
+    assert rows.tolist() == merged["point_row"].fillna(-1).astype(int).tolist()
+    assert rows.tolist() == match_store.build_point_index(shots, points).tolist()
+
+
+def test_remove_match(store):
+    base, first, _ = store
+    folder = str(base / PLAYER)
+    assert match_store.stored_sources(folder) == {"a.xlsx", "b.xlsx"}
+    match_store.remove_match(folder, "b.xlsx")
+    assert match_store.stored_sources(folder) == {"a.xlsx"}
+    pd.testing.assert_frame_equal(match_store.load_sheet(PLAYER, "Points", base_path=str(base)), expected("Points", first))
+
+
+def test_manifest(tmp_path):
+    folder = tmp_path / PLAYER
+    workbook = tmp_path / "a.xlsx"
+    workbook.write_bytes(b"workbook")
+    manifest = {"a.xlsx": match_store.manifest_entry(str(workbook))}
+    match_store.save_manifest(str(folder), manifest)
+    loaded = match_store.load_manifest(str(folder))
+    assert loaded == manifest
+    assert match_store.is_unchanged(str(workbook), loaded["a.xlsx"])
+
+    # same bytes with a new mtime (a re-copied file) still counts as unchanged
+    os.utime(workbook, (1, 1))
+    assert match_store.is_unchanged(str(workbook), loaded["a.xlsx"])
+    assert loaded["a.xlsx"]["mtime"] == 1
+
+    workbook.write_bytes(b"edited!!")
+    assert not match_store.is_unchanged(str(workbook), loaded["a.xlsx"])
+    assert not match_store.is_unchanged(str(workbook), None)
@@ -0,0 +1,110 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import match_store
+import player_data
+from player_data import PlayerMatchData, get_player_data
+from schema import apply_schema
+from workbooks import export_sheets, write_export
+
+PLAYER = "Rudy Quan"
+EXPORTS = {"a.xlsx": export_sheets(points=4), "b.xlsx": export_sheets(points=3, opponent="Cal")}
+
+
+def expected(sheet):
+    return apply_schema(pd.concat([sheets[sheet].assign(__source_file__=source)
+                                   for source, sheets in EXPORTS.items()], ignore_index=True), sheet)
+
+
+@pytest.fixture(params=["store", "xlsx"])
+def base(request, tmp_path):
+    """A player with both exports, in the match store or only in combined.xlsx"""
+    folder = tmp_path / PLAYER
+    folder.mkdir()
+    if request.param == "store":
+        pytest.importorskip("pyarrow")
+        for source, sheets in EXPORTS.items():
+            match_store.write_match(str(folder), source, {name: df.assign(__source_file__=source)
+                                                          for name, df in sheets.items()})
+    else:
+        write_export(folder / "combined.xlsx", {sheet: expected(sheet) for sheet in ("Settings", "Points", "Shots")})
+    return str(tmp_path)
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Names of the sheets read from disk, one entry per read"""
+    calls = []
+    load_sheet, excel_file = match_store.load_sheet, pd.ExcelFile
+
+    def counting_load_sheet(player, sheet, *args, **kwargs):
+        calls.append(sheet)
+        return load_sheet(player, sheet, *args, **kwargs)
+
+    def counting_excel_file(*args, **kwargs):
+        calls.append("combined.xlsx")
+        return excel_file(*args, **kwargs)
+
+    monkeypatch.setattr(match_store, "load_sheet", counting_load_sheet)
+    monkeypatch.setattr(player_data.pd, "ExcelFile", counting_excel_file)
+    return calls
+
+
+def test_sheets_match_the_exports(base):
+    data = PlayerMatchData(PLAYER, base)
+    for sheet in ("Points", "Shots"):
+        pd.testing.assert_frame_equal(data.sheet(sheet), expected(sheet))
+
+
+def test_each_sheet_is_loaded_once(base, reads):
+    data = PlayerMatchData(PLAYER, base)
+    points = data.points
+    assert data.points is points
+    assert data.sheet("Points", columns=["Point", "Point Winner"]).columns.tolist() == ["Point", "Point Winner"]
+    data.shots
+    data.shots
+
+    if match_store.has_store(PLAYER, base):
+        assert reads == ["Points", "Shots"]
+    else:
+        assert reads == ["combined.xlsx"]
+
+
+def test_column_subset_is_not_cached_as_the_whole_sheet(base):
+    data = PlayerMatchData(PLAYER, base)
+    assert data.sheet("Shots", columns=["Type"]).columns.tolist() == ["Type"]
+    assert "Speed (MPH)" in data.shots.columns
+
+
+def test_get_player_data_is_shared(base):
+    assert get_player_data(PLAYER, base) is get_player_data(PLAYER, base)
+    assert get_player_data(PLAYER, base) is not get_player_data("Kaylan Bigun", base)
+
+
+def test_shot_points_match_a_merge(base):
+    data = PlayerMatchData(PLAYER, base)
+    keys = ["__source_file__", "Point", "Game", "Set"]
+    merged = data.shots[keys].astype(object).merge(
+        data.points[keys + ["Point Winner", "Match Server"]].astype(object), on=keys, how="left")
+
+    attrs = data.shot_points(["Point Winner", "Match Server"])
+    assert len(attrs) == len(data.shots)
+    pd.testing.assert_frame_equal(attrs.astype(object), merged[["Point Winner", "Match Server"]])
+    # the last shot of every export has no point
+    assert (data.point_index == -1).sum() == len(EXPORTS)
+
+
+def test_missing_point_index_is_built_on_first_use(base):
+    if not match_store.has_store(PLAYER, base):
+        pytest.skip("only the store persists the index")
+    folder = os.path.join(base, PLAYER)
+    shutil.rmtree(match_store.store_path(folder, match_store.INDEX_DIR))
+
+    rows = PlayerMatchData(PLAYER, base).point_index
+    assert rows.tolist() == match_store.build_point_index(
+        match_store.load_sheet(PLAYER, "Shots", base_path=base),
+        match_store.load_sheet(PLAYER, "Points", base_path=base)).tolist()
+    assert os.path.exists(match_store._part_path(folder, match_store.INDEX_DIR, "b.xlsx"))
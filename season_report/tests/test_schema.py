@@ -0,0 +1,57 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from schema import GAME_SCORE, SchemaError, apply_schema
+
+
+def test_points_dtypes():
+    points = pd.DataFrame({
+        "Point": [1, 2, 3],
+        "Game": [1.0, 1.0, 2.0],
+        "Match Server": ["host", "host", "guest"],
+        "Host Game Score": [0, "15", "AD"],
+        "Break Point": ["false", "True", False],
+        "Duration": [3.5, 4.0, 5.25],
+        "__source_file__": ["a.xlsx"] * 3,
+    })
+    typed = apply_schema(points, "Points")
+    assert typed["Point"].dtype == "int16"
+    assert typed["Game"].dtype == "int8"
+    assert typed["Match Server"].tolist() == ["host", "host", "guest"]
+    assert typed["Host Game Score"].dtype == GAME_SCORE
+    assert typed["Host Game Score"].tolist() == ["0", "15", "AD"]
+    assert typed["Break Point"].tolist() == [False, True, False]
+    assert typed["Break Point"].dtype == bool
+    assert typed["__source_file__"].dtype == "category"
+    # columns the schema doesn't know are left alone, and the input isn't modified
+    assert typed["Duration"].dtype == "float64"
+    assert points["Point"].dtype == "int64"
+
+
+def test_gaps_use_nullable_types():
+    typed = apply_schema(pd.DataFrame({"Set": [1, None], "Super Tiebreak": [True, None]}), "Sets")
+    assert typed["Set"].dtype == "Int8"
+    assert typed["Super Tiebreak"].dtype == "boolean"
+
+
+def test_shots_floats():
+    typed = apply_schema(pd.DataFrame({"Speed (MPH)": ["101.5", 88], "Host Set 1": [0.6, np.nan]}), "Shots")
+    assert typed["Speed (MPH)"].dtype == "float32"
+    assert typed["Host Set 1"].dtype == "float64"
+    assert typed["Host Set 1"][0] == 0.6
+
+
+@pytest.mark.parametrize("sheet, df, message", [
+    ("Shots", pd.DataFrame({"Stroke": ["Forehand", "Tweener"]}), "Shots.Stroke: unexpected values ['Tweener']"),
+    ("Points", pd.DataFrame({"Point": [1, 2.5]}), "Points.Point: fractional"),
+    ("Points", pd.DataFrame({"Point": [1, "x"]}), "Points.Point: non-numeric"),
+    ("Points", pd.DataFrame({"Set": [1, 300]}), "Points.Set: values outside int8"),
+    ("Points", pd.DataFrame({"Favorited": [True, "No"]}), "Points.Favorited: non-boolean"),
+    ("Shots", pd.DataFrame({"Speed (MPH)": [90, "fast"]}), "Shots.Speed (MPH): non-numeric"),
+])
+def test_bad_values_raise(sheet, df, message):
+    with pytest.raises(SchemaError, match=re.escape(message)):
+        apply_schema(df, sheet)
@@ -0,0 +1,66 @@
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+import xlsx_stream
+from workbooks import export_sheets, write_export
+
+MENS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "mens")
+
+
+def messy_export(path):
+    """A sheet with the things read_excel has opinions about: gaps, text flags, blank rows, unnamed columns"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Points"
+    ws.append(["Point", "Speed", None, "Favorited", "Detail", "Score"])
+    ws.append([1, 101.5, "x", "false", "ace", "0"])
+    ws.append([2, None, None, "true", None, "15"])
+    ws.append([])
+    ws.append([3.0, 99, None, "false", "net", "30"])
+    ws.append([4, 88.25, None, None, "", "40"])
+    ws.append([])
+    wb.save(path)
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_batches_match_read_excel(tmp_path, batch_size):
+    path = str(tmp_path / "messy.xlsx")
+    messy_export(path)
+    batches = list(xlsx_stream.iter_sheet_batches(path, "Points", batch_size=batch_size))
+
+    assert all(len(b) <= batch_size for b in batches)
+    expected = pd.read_excel(path, sheet_name="Points")
+    expected = expected.loc[:, ~expected.columns.str.startswith("Unnamed")]
+    pd.testing.assert_frame_equal(pd.concat(batches, ignore_index=True), expected, check_dtype=batch_size > 2)
+
+
+def test_export_sheets_match_read_excel(tmp_path):
+    path = str(tmp_path / "a.xlsx")
+    write_export(path, export_sheets(points=7))
+    for sheet, expected in pd.read_excel(path, sheet_name=None).items():
+        pd.testing.assert_frame_equal(xlsx_stream.read_sheet(path, sheet), expected)
+
+
+def test_columns_and_missing_sheet(tmp_path):
+    path = str(tmp_path / "a.xlsx")
+    write_export(path, export_sheets(points=3))
+    shots = xlsx_stream.read_sheet(path, "Shots", columns=["Type", "Point", "Nope"])
+    assert shots.columns.tolist() == ["Type", "Point"]
+    assert list(xlsx_stream.iter_sheet_batches(path, "Stats")) == []
+    assert xlsx_stream.read_sheet(path, "Stats", columns=["Stat Name"]).columns.tolist() == ["Stat Name"]
+
+
+@pytest.mark.parametrize("sheet", ["Points", "Shots"])
+def test_real_export_matches_read_excel(sheet):
+    exports = sorted(p for p in glob.glob(os.path.join(MENS, "*", "*.xlsx")) if not p.endswith("combined.xlsx"))
+    if not exports:
+        pytest.skip("no SwingVision exports in data/mens")
+    expected = pd.read_excel(exports[0], sheet_name=sheet)
+    streamed = xlsx_stream.read_sheet(exports[0], sheet)
+    pd.testing.assert_frame_equal(streamed, expected)
+    assert np.array_equal(streamed.dtypes.to_numpy(), expected.dtypes.to_numpy())
@@ -0,0 +1,34 @@
+"""Small SwingVision-style exports for the getdata / xlsx_stream tests"""
+
+import numpy as np
+import pandas as pd
+
+
+def export_sheets(points=4, opponent="USC"):
+    """Sheets of one export: a few points, two shots per point (one with no point)"""
+    shots = 2 * points
+    return {
+        "Settings": pd.DataFrame({"Host Team": ["UCLA"], "Guest Team": [opponent], "Ad Scoring": [True]}),
+        "Points": pd.DataFrame({
+            "Point": np.arange(1, points + 1),
+            "Game": [1] * points,
+            "Set": [1] * points,
+            "Match Server": ["host", "guest"] * (points // 2) + ["host"] * (points % 2),
+            "Point Winner": ["host"] * points,
+            "Favorited": [False] * points,
+        }),
+        "Shots": pd.DataFrame({
+            "Player": ["Rudy Quan", opponent] * points,
+            "Type": ["first_serve", "return"] * points,
+            "Speed (MPH)": np.linspace(60, 120, shots).round(2),
+            "Point": list(np.repeat(np.arange(1, points + 1), 2)[:-1]) + [points + 5],
+            "Game": [1] * shots,
+            "Set": [1] * shots,
+        }),
+    }
+
+
+def write_export(path, sheets):
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet, df in sheets.items():
+            df.to_excel(writer, sheet_name=sheet, index=False)
@@ -0,0 +1,91 @@
+"""
+Streaming reader for SwingVision workbooks.
+
+pd.read_excel(sheet_name=None) materializes every sheet of a workbook as a
+DataFrame at once; Shots (one row per stroke) dominates that. This reads a
+sheet through openpyxl's read-only mode and yields DataFrames of at most
+batch_size rows, optionally keeping only some columns, so memory stays
+bounded by the batch size instead of the match length:
+
+    for batch in iter_sheet_batches(path, "Shots", columns=["Type", "Bounce (x)"]):
+        ...
+
+Cell values go through the same conversion pd.read_excel uses, so batches
+are typed like a pandas-read sheet: whole numbers int64, numbers with gaps
+float64, "true"/"false" bool, text strings.
+"""
+
+from contextlib import contextmanager
+
+import pandas as pd
+from openpyxl import load_workbook
+from pandas.io.parsers import TextParser
+
+BATCH_SIZE = 2000
+
+
+@contextmanager
+def open_workbook(path):
+    """Read-only openpyxl workbook that is closed (file handle released) afterwards"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield wb
+    finally:
+        wb.close()
+
+
+def _cell(value):
+    # pandas' openpyxl reader stores whole-number floats (28.0) as ints
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _frame(rows, names):
+    # Same value conversion pd.read_excel applies: "0" -> 0, "false" -> False, "" -> NaN
+    return TextParser(rows, names=names, header=None).read()
+
+
+def iter_batches(ws, columns=None, batch_size=BATCH_SIZE):
+    """
+    DataFrames of up to batch_size rows from a read-only worksheet. The first
+    row is the header and unnamed columns are skipped. Like pd.read_excel,
+    blank rows are kept unless they trail the data.
+    With `columns`, only those columns (that exist in the sheet) are kept.
+    """
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    keep = [i for i, name in enumerate(header)
+            if name is not None and (columns is None or name in columns)]
+    names = [str(header[i]) for i in keep]
+
+    batch, blank = [], 0
+    for row in rows:
+        if all(v is None for v in row):
+            blank += 1
+            continue
+        # blank rows only count once data follows them
+        pending = [[None] * len(keep)] * blank + [[_cell(row[i]) if i < len(row) else None for i in keep]]
+        blank = 0
+        for values in pending:
+            batch.append(values)
+            if len(batch) >= batch_size:
+                yield _frame(batch, names)
+                batch = []
+    if batch:
+        yield _frame(batch, names)
+
+
+def iter_sheet_batches(path, sheet, columns=None, batch_size=BATCH_SIZE):
+    """iter_batches() for one sheet of a workbook on disk (nothing if the sheet is missing)"""
+    with open_workbook(path) as wb:
+        if sheet in wb.sheetnames:
+            yield from iter_batches(wb[sheet], columns, batch_size)
+
+
+def read_sheet(path, sheet, columns=None):
+    """Whole sheet via the streaming reader (an empty frame if missing or blank)"""
+    batches = list(iter_sheet_batches(path, sheet, columns))
+    return pd.concat(batches, ignore_index=True) if batches else pd.DataFrame(columns=columns)